@@ -0,0 +1,59 @@
+import argparse
+import time
+from typing import Dict
+
+from habit_storage.columnar import NUMERIC_COLUMNS, ColumnarSnapshot
+from habit_storage.json_storage import HabitJsonStorage
+
+
+def benchmark(json_filename: str, snapshot_filename: str, repeat: int = 5) -> Dict:
+    """
+    Compare cold-start load times of the JSON file and its columnar export.
+
+    Every run uses a fresh storage/snapshot object, so no parse cache is hit.
+
+    Args:
+        json_filename (str): JSON snapshot to read
+        snapshot_filename (str): Columnar snapshot path (written first)
+        repeat (int): Runs per measurement; the best time is kept
+
+    Returns:
+        Dict: Habit count and best times in seconds
+    """
+
+    def best(load) -> float:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            load()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    def load_columns() -> None:
+        with ColumnarSnapshot(snapshot_filename) as snapshot:
+            for name, _ in NUMERIC_COLUMNS:
+                snapshot.column(name).release()
+
+    count = HabitJsonStorage(json_filename).export_columnar(snapshot_filename)
+    return {
+        "habits": count,
+        "json_load": best(lambda: HabitJsonStorage(json_filename).load()),
+        "columnar_load": best(
+            lambda: HabitJsonStorage(json_filename).load_columnar(snapshot_filename)
+        ),
+        "columnar_columns": best(load_columns),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare load times of a JSON habit file and its columnar export"
+    )
+    parser.add_argument("source", nargs="?", default="habits.json")
+    parser.add_argument("target", nargs="?", default="habits.col")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    for name, value in benchmark(args.source, args.target, args.repeat).items():
+        print(
+            f"{name}: {value:.6f}" if isinstance(value, float) else f"{name}: {value}"
+        )
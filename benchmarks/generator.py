@@ -0,0 +1,156 @@
+import random
+from bisect import bisect_right
+from datetime import date, timedelta
+from typing import Dict, Iterator, List
+
+from habit_service.milestones import (
+    DEFAULT_MILESTONES,
+    MilestoneEngine,
+    MilestoneLadder,
+)
+from models.history import CompletionHistory
+from schemas.habit_schema import CategoryHabit, GoalDaysHabit, GoalWeeklyHabit
+
+CATEGORIES = [category.value for category in CategoryHabit]
+WORDS = (
+    "morning evening daily read write run walk swim stretch meditate code "
+    "practice study save budget cook clean journal plan review learn"
+).split()
+
+
+def _reached(ladder: MilestoneLadder, streak: int) -> int:
+    """Return how many thresholds of a ladder a streak has reached."""
+    return bisect_right(ladder.thresholds, streak)
+
+
+def _daily_runs(rng: random.Random, today: date, age: int) -> tuple[List[int], int]:
+    """
+    Draw the completion runs of a daily habit, oldest first.
+
+    Returns:
+        tuple[List[int], int]: Flat (start ordinal, length) pairs and the
+            current streak (0 if the last run has ended)
+    """
+    end = today.toordinal() - (0 if rng.random() < 0.6 else rng.randint(1, 5))
+    first = today.toordinal() - age
+    runs = []
+    while end >= first and len(runs) < 64:
+        length = min(int(rng.expovariate(1 / 12)) + 1, end - first + 1)
+        runs.append((end - length + 1, length))
+        end -= length + rng.randint(2, 20)
+    runs.reverse()
+    streak = 0
+    if runs and runs[-1][0] + runs[-1][1] - 1 >= today.toordinal() - 1:
+        streak = runs[-1][1]
+    return [value for run in runs for value in run], streak
+
+
+def _weekly_runs(rng: random.Random, today: date, age: int) -> tuple[List[int], int]:
+    """
+    Draw the completion days of a weekly habit, one per week, oldest first.
+
+    Returns:
+        tuple[List[int], int]: Flat (ordinal, 1) pairs and the current streak
+            in weeks (0 if the last completion is more than a week old)
+    """
+    day = today.toordinal() - rng.randint(0, 10)
+    first = today.toordinal() - age
+    streak_weeks = int(rng.expovariate(1 / 6)) + 1 if rng.random() < 0.8 else 0
+    days = []
+    while day >= first and len(days) < streak_weeks:
+        days.append(day)
+        day -= 7
+    days.reverse()
+    streak = len(days) if days and days[-1] >= today.toordinal() - 7 else 0
+    return [value for day in days for value in (day, 1)], streak
+
+
+def iter_habits(
+    count: int,
+    seed: int = 0,
+    today: date | None = None,
+    milestones: MilestoneEngine = DEFAULT_MILESTONES,
+) -> Iterator[Dict]:
+    """
+    Generate synthetic habit records in the storage format.
+
+    The population is deterministic for a given (count, seed, today): about
+    70% daily and 30% weekly habits up to two years old, with exponentially
+    distributed streaks, gaps between streaks, and goals, achievements and
+    completion histories consistent with those streaks.
+
+    Args:
+        count (int): Number of habits
+        seed (int): Random seed
+        today (date | None): Reference date, defaults to today
+        milestones (MilestoneEngine): Ladders used to derive goals and achievements
+
+    Yields:
+        Dict: Habit dictionaries as produced by BaseHabit.to_dict
+    """
+    today = today or date.today()
+    rng = random.Random(seed)
+    for habit_id in range(1, count + 1):
+        age = rng.randint(0, 730)
+        weekly = rng.random() < 0.3
+        runs, streak = (
+            _weekly_runs(rng, today, age) if weekly else _daily_runs(rng, today, age)
+        )
+        history = CompletionHistory.from_list(runs)
+        longest = history.longest_streak() if not weekly else streak
+        last = history.last()
+        record = {
+            "habit_id": habit_id,
+            "created_at": (today - timedelta(days=age)).isoformat(),
+            "habit_name": " ".join(rng.sample(WORDS, rng.randint(1, 3))),
+            "habit_description": " ".join(rng.choices(WORDS, k=rng.randint(3, 12))),
+            "category": rng.choice(CATEGORIES),
+            "type_habit": "weekly" if weekly else "daily",
+            "completed": last == today,
+            "last_completed": last.isoformat() if last else None,
+            "history": history,
+        }
+        if weekly:
+            goals = milestones.weekly_goals
+            reached = _reached(goals, streak)
+            record["weekly_streak"] = streak
+            record["current_goal_weeks"] = (
+                goals.rewards[reached - 1]
+                if reached
+                else GoalWeeklyHabit.ONE_WEEK.value
+            )
+            record["deadline"] = (
+                (last or today - timedelta(days=age)) + timedelta(weeks=1)
+            ).isoformat()
+            achievements = milestones.weekly_achievements
+        else:
+            goals = milestones.daily_goals
+            reached = _reached(goals, streak)
+            record["streak"] = streak
+            record["current_goal_days"] = (
+                goals.rewards[reached - 1] if reached else GoalDaysHabit.ONE_DAY.value
+            )
+            achievements = milestones.daily_achievements
+        record["achievement"] = achievements.rewards[: _reached(achievements, longest)]
+        yield record
+
+
+def generate_habits(
+    count: int,
+    seed: int = 0,
+    today: date | None = None,
+    milestones: MilestoneEngine = DEFAULT_MILESTONES,
+) -> List[Dict]:
+    """
+    Return a synthetic habit population, see iter_habits.
+
+    Args:
+        count (int): Number of habits
+        seed (int): Random seed
+        today (date | None): Reference date, defaults to today
+        milestones (MilestoneEngine): Ladders used to derive goals and achievements
+
+    Returns:
+        List[Dict]: Habit dictionaries
+    """
+    return list(iter_habits(count, seed, today, milestones))
@@ -0,0 +1,167 @@
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from habit_api.load_test import percentile
+
+MENU = Path(__file__).resolve().parent.parent / "menu.py"
+PROMPT = b"Enter your choice: "
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """
+    Parse the report written by ``python -X importtime``.
+
+    Args:
+        stderr (str): Standard error of the measured process
+
+    Returns:
+        List[Dict]: One entry per imported module in import order, with
+            self and cumulative microseconds and the nesting depth (0 for
+            modules imported by the program itself)
+    """
+    imports = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            imports.append(
+                {
+                    "module": match.group(4),
+                    "self_us": int(match.group(1)),
+                    "cumulative_us": int(match.group(2)),
+                    "depth": (len(match.group(3)) - 1) // 2,
+                }
+            )
+    return imports
+
+
+def _run_menu(args: List[str], prompt: bytes | None) -> tuple[float, str]:
+    """
+    Start menu.py under -X importtime and time it.
+
+    With a prompt, the time until the prompt appears on stdout is measured
+    and the menu is then told to exit; without one, the time until the
+    process exits.
+
+    Returns:
+        tuple[float, str]: Seconds and the importtime report
+    """
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-X", "importtime", str(MENU), *args],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=MENU.parent,
+    )
+    elapsed = None
+    if prompt is not None:
+        # input() flushes the prompt before blocking, so it arrives unbuffered.
+        output = b""
+        while prompt not in output:
+            chunk = os.read(process.stdout.fileno(), 65536)
+            if not chunk:
+                break
+            output += chunk
+        elapsed = time.perf_counter() - started
+    _, stderr = process.communicate(b"8\n")
+    if elapsed is None:
+        elapsed = time.perf_counter() - started
+    if process.returncode:
+        raise RuntimeError(
+            f"menu.py {' '.join(args)} exited with {process.returncode}:\n"
+            + stderr.decode(errors="replace")[-2000:]
+        )
+    return elapsed, stderr.decode(errors="replace")
+
+
+def measure_startup(
+    storage_args: List[str],
+    runs: int = 5,
+    top: int = 10,
+    only: List[str] | None = None,
+) -> List[Dict]:
+    """
+    Measure how long menu.py takes until it is useful.
+
+    "startup.first_prompt" is the time until the interactive menu asks for
+    input; "startup.show" is a complete read-only ``show`` command. Both
+    include interpreter start, imports and loading the habit file, measured
+    under ``-X importtime``, which adds a little overhead of its own.
+
+    Args:
+        storage_args (List[str]): menu.py options selecting the habit file
+        runs (int): Process starts per scenario
+        top (int): Number of slowest top-level imports to report
+        only (List[str] | None): Run only scenarios whose name starts with one of these
+
+    Returns:
+        List[Dict]: Results shaped like run_benchmark results, plus
+            "import_ms" (total import time of the median run) and
+            "top_imports" (its slowest top-level imports, cumulative ms)
+    """
+    scenarios = (
+        ("startup.first_prompt", storage_args, PROMPT),
+        ("startup.show", storage_args + ["show", "--limit", "20"], None),
+    )
+    results = []
+    for name, args, prompt in scenarios:
+        if only and not name.startswith(tuple(only)):
+            continue
+        samples = sorted(_run_menu(args, prompt) for _ in range(runs))
+        latencies = [seconds for seconds, _ in samples]
+        top_level = [
+            item
+            for item in parse_importtime(samples[len(samples) // 2][1])
+            if item["depth"] == 0
+        ]
+        top_level.sort(key=lambda item: item["cumulative_us"], reverse=True)
+        total = sum(latencies)
+        results.append(
+            {
+                "name": name,
+                "operations": runs,
+                "seconds": total,
+                "ops_per_second": runs / total if total else 0.0,
+                "p50_ms": percentile(latencies, 0.50) * 1000,
+                "p90_ms": percentile(latencies, 0.90) * 1000,
+                "p99_ms": percentile(latencies, 0.99) * 1000,
+                "max_ms": latencies[-1] * 1000,
+                "peak_memory_bytes": None,
+                "import_ms": sum(item["cumulative_us"] for item in top_level) / 1000,
+                "top_imports": {
+                    item["module"]: item["cumulative_us"] / 1000
+                    for item in top_level[:top]
+                },
+            }
+        )
+    return results
+
+
+def check_budget(results: List[Dict], budget_ms: float) -> List[Dict]:
+    """
+    Return the startup results whose median time exceeds a budget.
+
+    Args:
+        results (List[Dict]): Benchmark results; only "startup.*" ones are checked
+        budget_ms (float): Allowed median milliseconds
+
+    Returns:
+        List[Dict]: One entry per startup result over budget
+    """
+    return [
+        {
+            "name": item["name"],
+            "size": item.get("size"),
+            "budget_ms": budget_ms,
+            "p50_ms": item["p50_ms"],
+            "top_imports": item.get("top_imports", {}),
+        }
+        for item in results
+        if item["name"].startswith("startup.") and item["p50_ms"] > budget_ms
+    ]
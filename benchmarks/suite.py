@@ -0,0 +1,407 @@
+import argparse
+import gc
+import json
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from benchmarks.generator import iter_habits
+from benchmarks.startup import check_budget, measure_startup
+from habit_api.load_test import percentile
+from habit_service.service import HabitService
+from habit_storage.json_storage import HabitJsonStorage
+from habit_storage.sqlite_storage import HabitSqliteStorage
+from schemas.habit_schema import CategoryHabit, DailyHabitSchema, TypeHabit
+
+BACKENDS = ("json", "journal", "sqlite")
+STARTUP_BUDGET_MS = 250.0
+
+
+@dataclass
+class Benchmark:
+    """
+    One timed operation.
+
+    ``setup`` runs untimed and returns the state passed to every ``op`` call;
+    ``op`` receives the state and the operation number.
+    """
+
+    name: str
+    setup: Callable[[], object]
+    op: Callable[[object, int], object]
+    scan: bool = False
+
+
+def _open_storage(backend: str, filename: str) -> HabitJsonStorage | HabitSqliteStorage:
+    """Open a storage backend on a dataset file."""
+    if backend == "sqlite":
+        return HabitSqliteStorage(filename)
+    return HabitJsonStorage(filename, journal=backend == "journal")
+
+
+class Dataset:
+    """
+    A generated habit population written once per size and backend, with
+    a fresh working copy for every benchmark so mutations do not leak.
+    """
+
+    def __init__(self, directory: Path, size: int, seed: int, backend: str) -> None:
+        self.directory = directory
+        self.size = size
+        self.backend = backend
+        suffix = ".db" if backend == "sqlite" else ".json"
+        self.master = directory / f"habits-{size}-{seed}{suffix}"
+        if not self.master.exists():
+            _open_storage(backend, str(self.master)).save(list(iter_habits(size, seed)))
+        self.ids = random.Random(seed).choices(range(1, size + 1), k=10000)
+
+    def copy(self) -> str:
+        """Return the path of a fresh working copy of the dataset."""
+        target = self.directory / f"work{self.master.suffix}"
+        for path in self.directory.glob("work*"):
+            path.unlink()
+        shutil.copyfile(self.master, target)
+        return str(target)
+
+    def service(self) -> HabitService:
+        """Return a HabitService loaded from a fresh working copy."""
+        return HabitService(_open_storage(self.backend, self.copy()))
+
+    def menu_args(self) -> List[str]:
+        """Return the menu.py options that open a fresh working copy."""
+        args = ["--storage", self.copy()]
+        if self.backend == "journal":
+            args.append("--journal")
+        return args
+
+
+def benchmarks(dataset: Dataset) -> List[Benchmark]:
+    """
+    Return the standard benchmarks over a dataset.
+
+    Args:
+        dataset (Dataset): Habit population to run against
+
+    Returns:
+        List[Benchmark]: Storage and service benchmarks
+    """
+    ids = dataset.ids
+    schema = DailyHabitSchema(
+        habit_name="benchmark habit",
+        habit_description="created by the benchmark suite",
+        category=CategoryHabit.OTHER,
+    )
+    return [
+        Benchmark(
+            "storage.load",
+            lambda: dataset.copy(),
+            lambda filename, n: _open_storage(dataset.backend, filename).load(),
+            scan=True,
+        ),
+        Benchmark(
+            "storage.save",
+            lambda: (
+                _open_storage(dataset.backend, dataset.copy()),
+                _open_storage(dataset.backend, str(dataset.master)).load(),
+            ),
+            lambda state, n: state[0].save(state[1]),
+            scan=True,
+        ),
+        Benchmark(
+            "service.create",
+            dataset.service,
+            lambda service, n: service.create_habit(TypeHabit.DAILY, schema),
+        ),
+        Benchmark(
+            "service.complete",
+            dataset.service,
+            lambda service, n: service.complete_habit(ids[n % len(ids)]),
+        ),
+        Benchmark(
+            "service.show",
+            dataset.service,
+            lambda service, n: service.show_habit(ids[n % len(ids)]),
+        ),
+        Benchmark(
+            "service.show_all_page",
+            dataset.service,
+            lambda service, n: service.show_all_habits(
+                offset=n * 20 % dataset.size, limit=20
+            ),
+        ),
+        Benchmark(
+            "service.show_all",
+            dataset.service,
+            lambda service, n: service.show_all_habits(),
+            scan=True,
+        ),
+        Benchmark(
+            "service.achievement",
+            dataset.service,
+            lambda service, n: service.show_achievement(ids[n % len(ids)]),
+        ),
+        Benchmark(
+            "service.all_achievements",
+            dataset.service,
+            lambda service, n: service.show_all_achievements(),
+            scan=True,
+        ),
+    ]
+
+
+def run_benchmark(
+    benchmark: Benchmark, operations: int, measure_memory: bool = True
+) -> Dict:
+    """
+    Time a benchmark and measure its peak traced memory.
+
+    Timing and memory are measured in separate runs because tracemalloc
+    slows allocation-heavy code down several times.
+
+    Args:
+        benchmark (Benchmark): Benchmark to run
+        operations (int): Number of timed op calls
+        measure_memory (bool): Also run setup and one op under tracemalloc
+
+    Returns:
+        Dict: Operations, total seconds, throughput, latency percentiles in
+            milliseconds and peak memory in bytes (None if not measured)
+    """
+    state = benchmark.setup()
+    gc.collect()
+    latencies = []
+    clock = time.perf_counter
+    for n in range(operations):
+        started = clock()
+        benchmark.op(state, n)
+        latencies.append(clock() - started)
+    del state
+
+    peak = None
+    if measure_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            state = benchmark.setup()
+            benchmark.op(state, 0)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        del state
+
+    total = sum(latencies)
+    latencies.sort()
+    return {
+        "name": benchmark.name,
+        "operations": operations,
+        "seconds": total,
+        "ops_per_second": operations / total if total else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p90_ms": percentile(latencies, 0.90) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+        "peak_memory_bytes": peak,
+    }
+
+
+def compare(results: List[Dict], baseline: List[Dict], threshold: float) -> List[Dict]:
+    """
+    Flag results that got worse than a baseline run by more than threshold.
+
+    Throughput regresses when it drops, p99 latency and peak memory when
+    they grow. Results without a baseline entry of the same name and size
+    are skipped.
+
+    Args:
+        results (List[Dict]): Current results
+        baseline (List[Dict]): Results of the baseline run
+        threshold (float): Tolerated relative change, e.g. 0.2 for 20%
+
+    Returns:
+        List[Dict]: One entry per regressed metric
+    """
+    previous = {(item["name"], item["size"]): item for item in baseline}
+    regressions = []
+    for item in results:
+        base = previous.get((item["name"], item["size"]))
+        if base is None:
+            continue
+        for metric, higher_is_better in (
+            ("ops_per_second", True),
+            ("p99_ms", False),
+            ("peak_memory_bytes", False),
+        ):
+            old, new = base.get(metric), item.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > threshold:
+                regressions.append(
+                    {
+                        "name": item["name"],
+                        "size": item["size"],
+                        "metric": metric,
+                        "baseline": old,
+                        "current": new,
+                        "change": change,
+                    }
+                )
+    return regressions
+
+
+def _git_commit() -> str | None:
+    """Return the current git commit, if the suite runs inside a checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(
+    sizes: List[int],
+    operations: int = 200,
+    scans: int = 3,
+    seed: int = 0,
+    backend: str = "journal",
+    only: List[str] | None = None,
+    measure_memory: bool = True,
+    data_dir: str | None = None,
+    startup_runs: int = 5,
+) -> Dict:
+    """
+    Run every benchmark for every dataset size.
+
+    Args:
+        sizes (List[int]): Habit counts, e.g. [1000, 100000, 1000000]
+        operations (int): Op calls for per-habit benchmarks
+        scans (int): Op calls for full-scan benchmarks
+        seed (int): Dataset seed
+        backend (str): "json", "journal" (JSON with mutation log) or "sqlite"
+        only (List[str] | None): Run only benchmarks whose name starts with one of these
+        measure_memory (bool): Measure peak memory with tracemalloc
+        data_dir (str | None): Directory to keep generated datasets in between
+            runs; a temporary directory is used by default
+        startup_runs (int): menu.py starts per startup benchmark, measured
+            against the smallest dataset; 0 skips them
+
+    Returns:
+        Dict: {"meta": run metadata, "results": list of result dicts}
+    """
+    meta = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "seed": seed,
+        "backend": backend,
+    }
+    results = []
+    with tempfile.TemporaryDirectory(prefix="habit-bench-") as tmp:
+        directory = Path(data_dir or tmp)
+        directory.mkdir(parents=True, exist_ok=True)
+        for size in sizes:
+            dataset = Dataset(directory, size, seed, backend)
+            for benchmark in benchmarks(dataset):
+                if only and not benchmark.name.startswith(tuple(only)):
+                    continue
+                result = run_benchmark(
+                    benchmark, scans if benchmark.scan else operations, measure_memory
+                )
+                result["size"] = size
+                results.append(result)
+                print(_format_result(result), file=sys.stderr)
+            if startup_runs and size == min(sizes):
+                for result in measure_startup(
+                    dataset.menu_args(), startup_runs, only=only
+                ):
+                    result["size"] = size
+                    results.append(result)
+                    print(_format_result(result), file=sys.stderr)
+    return {"meta": meta, "results": results}
+
+
+def _format_result(result: Dict) -> str:
+    """Render one result as a human-readable line."""
+    memory = result["peak_memory_bytes"]
+    return (
+        f"{result['name']:<26} {result['size']:>9} habits | "
+        f"{result['ops_per_second']:>10.1f} ops/s | "
+        f"p50 {result['p50_ms']:>9.3f} ms | p99 {result['p99_ms']:>9.3f} ms | "
+        f"peak {'-' if memory is None else f'{memory / 2**20:.1f} MiB'}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Habit tracker benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--operations", type=int, default=200)
+    parser.add_argument("--scans", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--backend", choices=BACKENDS, default="journal")
+    parser.add_argument("--only", nargs="+", help="benchmark name prefixes to run")
+    parser.add_argument("--no-memory", action="store_true")
+    parser.add_argument("--data-dir", help="keep generated datasets here")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument(
+        "--startup-runs", type=int, default=5, help="0 skips the startup benchmarks"
+    )
+    parser.add_argument(
+        "--startup-budget",
+        type=float,
+        default=STARTUP_BUDGET_MS,
+        help="median milliseconds allowed for each startup benchmark",
+    )
+    args = parser.parse_args()
+
+    report = run_suite(
+        args.sizes,
+        args.operations,
+        args.scans,
+        args.seed,
+        args.backend,
+        args.only,
+        not args.no_memory,
+        args.data_dir,
+        args.startup_runs,
+    )
+    report["budget_violations"] = check_budget(report["results"], args.startup_budget)
+    for item in report["budget_violations"]:
+        print(
+            f"OVER BUDGET {item['name']} ({item['size']} habits): "
+            f"{item['p50_ms']:.1f} ms > {item['budget_ms']:.1f} ms; slowest imports: "
+            + ", ".join(
+                f"{name} {ms:.1f} ms" for name, ms in item["top_imports"].items()
+            ),
+            file=sys.stderr,
+        )
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        report["regressions"] = compare(report["results"], baseline, args.threshold)
+        for item in report["regressions"]:
+            print(
+                f"REGRESSION {item['name']} ({item['size']} habits) {item['metric']}: "
+                f"{item['baseline']:.6g} -> {item['current']:.6g} "
+                f"({item['change']:+.1%})",
+                file=sys.stderr,
+            )
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4)
+    sys.exit(1 if report.get("regressions") or report["budget_violations"] else 0)
@@ -0,0 +1,246 @@
+import argparse
+import http.client
+import json
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+SCENARIOS = ("show", "list", "complete", "batch-complete", "create")
+# Seconds a client connection waits to connect or for a response.
+TIMEOUT = 30.0
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """
+    Return the nearest-rank percentile of already sorted values.
+
+    Args:
+        sorted_values (List[float]): Values in ascending order
+        fraction (float): Percentile as a fraction, e.g. 0.99
+
+    Returns:
+        float: The percentile, 0.0 for no values
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def _request(
+    connection: http.client.HTTPConnection, method: str, path: str, body=None
+) -> Tuple[int, bytes]:
+    """Send one request on a kept-alive connection and read the whole response."""
+    data = None if body is None else json.dumps(body).encode("utf-8")
+    headers = {"Content-Type": "application/json"} if data is not None else {}
+    connection.request(method, path, body=data, headers=headers)
+    response = connection.getresponse()
+    return response.status, response.read()
+
+
+def seed_habits(host: str, port: int, count: int) -> List[int]:
+    """
+    Create habits through the batch endpoint.
+
+    Args:
+        host (str): Server host
+        port (int): Server port
+        count (int): Number of habits to create
+
+    Returns:
+        List[int]: IDs of the created habits
+    """
+    rows = [
+        {
+            "habit_name": f"load test habit {i}",
+            "habit_description": "created by the load test",
+            "category": "other",
+            "type_habit": "weekly" if i % 2 else "daily",
+        }
+        for i in range(count)
+    ]
+    connection = http.client.HTTPConnection(host, port)
+    try:
+        status, data = _request(connection, "POST", "/habits/batch", rows)
+    finally:
+        connection.close()
+    if status != 201:
+        raise RuntimeError(f"Seeding failed with HTTP {status}: {data[:200]!r}")
+    return [habit["habit_id"] for habit in json.loads(data)["habits"]]
+
+
+def _scenario(name: str, habit_ids: List[int], batch_size: int) -> Callable:
+    """Return a function mapping a request number to (method, path, body)."""
+    if name == "show":
+        return lambda n: ("GET", f"/habits/{habit_ids[n % len(habit_ids)]}", None)
+    if name == "list":
+        return lambda n: ("GET", f"/habits?offset={n % 5 * 20}&limit=20", None)
+    if name == "complete":
+        return lambda n: (
+            "POST",
+            f"/habits/{habit_ids[n % len(habit_ids)]}/complete",
+            None,
+        )
+    if name == "batch-complete":
+        return lambda n: (
+            "POST",
+            "/habits/complete",
+            {
+                "habit_ids": [
+                    habit_ids[(n * batch_size + i) % len(habit_ids)]
+                    for i in range(batch_size)
+                ]
+            },
+        )
+    if name == "create":
+        return lambda n: (
+            "POST",
+            "/habits",
+            {
+                "habit_name": f"load test habit {n}",
+                "habit_description": "created by the load test",
+                "category": "other",
+            },
+        )
+    raise ValueError(f"Unknown scenario {name!r}, expected one of {SCENARIOS}")
+
+
+def run_load(
+    host: str,
+    port: int,
+    scenario: str = "show",
+    requests: int = 10000,
+    connections: int = 8,
+    habit_ids: List[int] | None = None,
+    batch_size: int = 50,
+) -> Dict:
+    """
+    Drive the API from several threads, one kept-alive connection each.
+
+    A request that fails with a connection error counts as an error and the
+    worker reconnects for its next request.
+
+    Args:
+        host (str): Server host
+        port (int): Server port
+        scenario (str): One of SCENARIOS
+        requests (int): Total number of requests over all connections
+        connections (int): Concurrent connections (client threads)
+        habit_ids (List[int] | None): Habits to address, required by the
+            show, complete and batch-complete scenarios
+        batch_size (int): Habit IDs per batch-complete request
+
+    Returns:
+        Dict: Request count, errors (error responses and failed requests),
+            elapsed seconds, requests per second and latency percentiles
+            in milliseconds
+
+    Raises:
+        ConnectionError: If a worker cannot connect to the server
+    """
+    if scenario in ("show", "complete", "batch-complete") and not habit_ids:
+        raise ValueError(f"Scenario {scenario!r} needs habit IDs")
+    build = _scenario(scenario, habit_ids or [], batch_size)
+    latencies: List[List[float]] = [[] for _ in range(connections)]
+    errors = [0] * connections
+    connect_errors: List[OSError] = []
+    start_barrier = threading.Barrier(connections + 1)
+
+    def worker(index: int) -> None:
+        connection = http.client.HTTPConnection(host, port, timeout=TIMEOUT)
+        own = latencies[index]
+        try:
+            try:
+                connection.connect()
+            except OSError as e:
+                connect_errors.append(e)
+                start_barrier.abort()
+                return
+            start_barrier.wait()
+            for n in range(index, requests, connections):
+                method, path, body = build(n)
+                started = time.perf_counter()
+                try:
+                    status, _ = _request(connection, method, path, body)
+                except (OSError, http.client.HTTPException):
+                    errors[index] += 1
+                    connection.close()
+                    continue
+                own.append(time.perf_counter() - started)
+                if status >= 400:
+                    errors[index] += 1
+        except threading.BrokenBarrierError:
+            pass
+        finally:
+            connection.close()
+
+    threads = [
+        threading.Thread(target=worker, args=(index,), name=f"load-{index}")
+        for index in range(connections)
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        start_barrier.wait()
+    except threading.BrokenBarrierError:
+        for thread in threads:
+            thread.join()
+        raise ConnectionError(
+            f"Cannot connect to {host}:{port}: {connect_errors[0]}"
+        ) from connect_errors[0]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    merged = sorted(latency for own in latencies for latency in own)
+    return {
+        "scenario": scenario,
+        "connections": connections,
+        "requests": len(merged),
+        "errors": sum(errors),
+        "seconds": elapsed,
+        "requests_per_second": len(merged) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(merged, 0.50) * 1000,
+        "p90_ms": percentile(merged, 0.90) * 1000,
+        "p99_ms": percentile(merged, 0.99) * 1000,
+        "max_ms": (merged[-1] if merged else 0.0) * 1000,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Load-test a running habit API server on localhost"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--scenario", choices=SCENARIOS, default="show")
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument(
+        "--seed", type=int, default=1000, help="habits created before the run"
+    )
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    ids = seed_habits(args.host, args.port, args.seed) if args.seed else []
+    result = run_load(
+        args.host,
+        args.port,
+        args.scenario,
+        args.requests,
+        args.connections,
+        ids,
+        args.batch_size,
+    )
+    if args.json:
+        print(json.dumps(result))
+    else:
+        for name, value in result.items():
+            print(
+                f"{name}: {value:.3f}"
+                if isinstance(value, float)
+                else f"{name}: {value}"
+            )
@@ -0,0 +1,473 @@
+import argparse
+import json
+import re
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from datetime import date
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from itertools import islice
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from pydantic import ValidationError
+
+from habit_service.metrics import Metrics, NullMetrics, metrics_from_env
+from habit_service.service import HabitService
+from habit_storage.json_storage import HabitJsonStorage
+from habit_storage.sqlite_storage import HabitSqliteStorage
+from models.base import BaseHabit
+from models.history import CompletionHistory
+from schemas.habit_schema import HabitBatchAdapter
+
+HABIT_PATH = re.compile(r"^/habits/(\d+)(/complete|/achievements)?$")
+MAX_BODY = 16 * 1024 * 1024
+
+
+class ApiError(Exception):
+    """Error answered with an HTTP status and a JSON error body."""
+
+    def __init__(self, status: HTTPStatus, message: str, details=None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.details = details
+
+
+def _history_runs(history: CompletionHistory) -> List[List[str]]:
+    """Render a history as [first ISO date, last ISO date] runs."""
+    return [
+        [
+            date.fromordinal(start).isoformat(),
+            date.fromordinal(start + length - 1).isoformat(),
+        ]
+        for start, length in history.runs()
+    ]
+
+
+def _encode(value):
+    """JSON fallback for API responses that renders histories as date runs."""
+    if isinstance(value, CompletionHistory):
+        return _history_runs(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=_encode)
+
+
+def habit_record(habit: BaseHabit, history: bool = True) -> Dict:
+    """
+    Return the API representation of a habit.
+
+    This is the storage record with the completion history as runs of
+    consecutive days, ``[first ISO date, last ISO date]`` each, so its size
+    grows with the number of streaks rather than of completed days. Enums are
+    rendered by the response encoder, no display strings are built.
+
+    Args:
+        habit (BaseHabit): Habit to represent
+        history (bool): Include the completion history
+
+    Returns:
+        Dict: Habit fields
+    """
+    record = habit.to_dict()
+    if history:
+        record["history"] = _history_runs(habit.history)
+    else:
+        del record["history"]
+    return record
+
+
+class HabitApiServer(HTTPServer):
+    """
+    HTTP/1.1 JSON API in front of one long-lived HabitService.
+
+    Connections are served by a fixed thread pool and kept alive between
+    requests, so a client pays for the TCP handshake once. The service keeps
+    its habits in memory across requests and only reloads when the storage
+    changed underneath it. HabitService is not thread-safe, so service calls,
+    and the serialization of the habits they return, hold ``lock``.
+
+    Each open connection occupies a worker until it is closed or stays idle
+    for ``HabitRequestHandler.timeout`` seconds; size ``workers`` for the
+    expected number of concurrent clients.
+    """
+
+    allow_reuse_address = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        service: HabitService,
+        workers: int = 16,
+        metrics: Metrics | None = None,
+    ) -> None:
+        """
+        Bind the server.
+
+        Args:
+            address (Tuple[str, int]): (host, port) to listen on
+            service (HabitService): Service answering the requests
+            workers (int): Connection handler threads
+            metrics (Metrics | None): Registry exported on /metrics; it should
+                already instrument the service. Disabled by default
+        """
+        super().__init__(address, HabitRequestHandler)
+        self.service = service
+        self.metrics = metrics or NullMetrics()
+        self.lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="habit-api"
+        )
+
+    def process_request(self, request, client_address) -> None:
+        """Hand the connection to the thread pool."""
+        self._executor.submit(self._process_request_thread, request, client_address)
+
+    def _process_request_thread(self, request, client_address) -> None:
+        """Serve one connection until it is closed (pool worker)."""
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        """Stop listening and wait for open connections to finish."""
+        super().server_close()
+        self._executor.shutdown(wait=True)
+
+
+class HabitRequestHandler(BaseHTTPRequestHandler):
+    """
+    Routes of the habit API.
+
+    GET    /habits                      list habits (offset, limit, category, type_habit,
+                                        history=1 to include completion histories)
+    POST   /habits                      create one habit
+    POST   /habits/batch                create a list of habits with one write
+    GET    /habits/<id>                 show one habit
+    DELETE /habits/<id>                 delete one habit
+    POST   /habits/delete               delete {"habit_ids": [...]} with one write
+    POST   /habits/<id>/complete        complete one habit
+    POST   /habits/complete             complete {"habit_ids": [...]} with one write
+    GET    /habits/<id>/achievements    achievements of one habit
+    GET    /achievements                achievements of all habits (offset, limit)
+    GET    /metrics                     metrics in Prometheus text format
+    GET    /metrics.json                metrics as JSON
+    """
+
+    protocol_version = "HTTP/1.1"
+    server_version = "HabitAPI/1.0"
+    # Headers and body go out in separate writes; without TCP_NODELAY the
+    # body waits for the client's delayed ACK (~40 ms per request).
+    disable_nagle_algorithm = True
+    timeout = 30
+    server: HabitApiServer
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_DELETE(self) -> None:
+        self._dispatch("DELETE")
+
+    def log_message(self, format, *args) -> None:
+        """Do not log every request; errors still go through log_error."""
+
+    def log_error(self, format, *args) -> None:
+        super().log_message(format, *args)
+
+    def _dispatch(self, method: str) -> None:
+        """Route a request and write the JSON response."""
+        url = urlsplit(self.path)
+        if method == "GET" and url.path == "/metrics":
+            self._send_body(
+                HTTPStatus.OK,
+                self.server.metrics.to_prometheus().encode("utf-8"),
+                "text/plain; version=0.0.4",
+            )
+            return
+        try:
+            body = self._read_body()
+            status, payload = self._route(method, url.path, parse_qs(url.query), body)
+        except ApiError as e:
+            status = e.status
+            payload = {"error": e.message}
+            if e.details is not None:
+                payload["details"] = e.details
+        except Exception:
+            self.log_error(
+                "Error handling %s %s\n%s", method, self.path, traceback.format_exc()
+            )
+            status = HTTPStatus.INTERNAL_SERVER_ERROR
+            payload = {"error": "Internal server error"}
+        self._send(status, payload)
+
+    def _route(
+        self, method: str, path: str, query: Dict[str, List[str]], body
+    ) -> Tuple[HTTPStatus, Dict]:
+        """Call the handler of a path; raises ApiError for unknown routes."""
+        path = path.rstrip("/") or "/"
+        if path == "/habits":
+            if method == "GET":
+                return self._list_habits(query)
+            if method == "POST":
+                return self._create_habits([body], single=True)
+        elif path == "/habits/batch" and method == "POST":
+            if not isinstance(body, list):
+                raise ApiError(HTTPStatus.BAD_REQUEST, "Body must be a JSON array")
+            return self._create_habits(body, single=False)
+        elif path == "/habits/complete" and method == "POST":
+            return self._complete_habits(self._habit_ids(body))
+        elif path == "/habits/delete" and method == "POST":
+            return self._delete_habits(self._habit_ids(body))
+        elif path == "/achievements" and method == "GET":
+            return self._all_achievements(query)
+        elif path == "/metrics.json" and method == "GET":
+            return HTTPStatus.OK, self.server.metrics.snapshot()
+        else:
+            match = HABIT_PATH.match(path)
+            if match is not None:
+                habit_id, action = int(match.group(1)), match.group(2)
+                if action is None and method == "GET":
+                    return self._show_habit(habit_id)
+                if action is None and method == "DELETE":
+                    return self._delete_habit(habit_id)
+                if action == "/complete" and method == "POST":
+                    return self._complete_habit(habit_id)
+                if action == "/achievements" and method == "GET":
+                    return self._habit_achievements(habit_id)
+            else:
+                raise ApiError(HTTPStatus.NOT_FOUND, f"No route for {path}")
+        raise ApiError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed on {path}")
+
+    def _list_habits(self, query: Dict[str, List[str]]) -> Tuple[HTTPStatus, Dict]:
+        offset, limit = self._page(query)
+        category = query.get("category", [None])[0]
+        type_habit = query.get("type_habit", [None])[0]
+        history = query.get("history", ["0"])[0].lower() in ("1", "true", "yes")
+        with self.server.lock:
+            habits = [
+                habit_record(habit, history)
+                for habit in self.server.service.iter_habits(
+                    offset, limit, category, type_habit
+                )
+            ]
+            payload = {"habits": habits, "offset": offset, "count": len(habits)}
+            return HTTPStatus.OK, payload
+
+    def _show_habit(self, habit_id: int) -> Tuple[HTTPStatus, Dict]:
+        with self.server.lock:
+            habit = self.server.service.get_habit(habit_id)
+            if habit is None:
+                raise ApiError(HTTPStatus.NOT_FOUND, "Habit not found")
+            return HTTPStatus.OK, {"habit": habit_record(habit)}
+
+    def _create_habits(self, rows: List, single: bool) -> Tuple[HTTPStatus, Dict]:
+        try:
+            schemas = HabitBatchAdapter.validate_python(rows)
+        except ValidationError as e:
+            raise ApiError(
+                HTTPStatus.UNPROCESSABLE_ENTITY,
+                "Invalid habit",
+                e.errors(include_url=False, include_context=False),
+            ) from e
+        with self.server.lock:
+            habits = [habit_record(h) for h in self.server.service.add_habits(schemas)]
+        if single:
+            return HTTPStatus.CREATED, {"habit": habits[0]}
+        return HTTPStatus.CREATED, {"habits": habits}
+
+    def _complete_habit(self, habit_id: int) -> Tuple[HTTPStatus, Dict]:
+        status, payload = self._complete_habits([habit_id])
+        result = payload["results"][0]
+        if not result["found"]:
+            raise ApiError(HTTPStatus.NOT_FOUND, "Habit not found")
+        return status, result
+
+    def _complete_habits(self, habit_ids: List[int]) -> Tuple[HTTPStatus, Dict]:
+        with self.server.lock:
+            service = self.server.service
+            messages = service.complete_many(habit_ids)
+            results = []
+            for habit_id, message in messages:
+                habit = service.store.get(habit_id)
+                results.append(
+                    {
+                        "habit_id": habit_id,
+                        "found": habit is not None,
+                        "message": message,
+                        "habit": None if habit is None else habit_record(habit),
+                    }
+                )
+        return HTTPStatus.OK, {"results": results}
+
+    def _delete_habit(self, habit_id: int) -> Tuple[HTTPStatus, Dict]:
+        status, payload = self._delete_habits([habit_id])
+        result = payload["results"][0]
+        if not result["deleted"]:
+            raise ApiError(HTTPStatus.NOT_FOUND, "Habit not found")
+        return status, result
+
+    def _delete_habits(self, habit_ids: List[int]) -> Tuple[HTTPStatus, Dict]:
+        with self.server.lock:
+            removed = self.server.service.remove_habits(habit_ids)
+        results = [
+            {"habit_id": habit_id, "deleted": habit is not None}
+            for habit_id, habit in zip(habit_ids, removed)
+        ]
+        return HTTPStatus.OK, {"results": results}
+
+    def _habit_achievements(self, habit_id: int) -> Tuple[HTTPStatus, Dict]:
+        with self.server.lock:
+            habit = self.server.service.get_habit(habit_id)
+            if habit is None:
+                raise ApiError(HTTPStatus.NOT_FOUND, "Habit not found")
+            achievements = list(habit.achievement)
+        return HTTPStatus.OK, {"habit_id": habit_id, "achievements": achievements}
+
+    def _all_achievements(self, query: Dict[str, List[str]]) -> Tuple[HTTPStatus, Dict]:
+        offset, limit = self._page(query)
+        with self.server.lock:
+            achievements = (
+                {"habit_id": habit.habit_id, "achievement": element}
+                for habit in self.server.service.iter_habits()
+                for element in habit.achievement
+            )
+            stop = None if limit is None else offset + limit
+            page = list(islice(achievements, offset, stop))
+        return HTTPStatus.OK, {"achievements": page, "offset": offset}
+
+    @staticmethod
+    def _page(query: Dict[str, List[str]]) -> Tuple[int, int | None]:
+        """Parse offset/limit query parameters."""
+        try:
+            offset = int(query.get("offset", ["0"])[0])
+            limit = query.get("limit", [None])[0]
+            limit = None if limit is None else int(limit)
+        except ValueError as e:
+            raise ApiError(
+                HTTPStatus.BAD_REQUEST, "offset and limit must be integers"
+            ) from e
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ApiError(
+                HTTPStatus.BAD_REQUEST, "offset and limit must not be negative"
+            )
+        return offset, limit
+
+    @staticmethod
+    def _habit_ids(body) -> List[int]:
+        """Extract {"habit_ids": [...]} from a batch request body."""
+        habit_ids = body.get("habit_ids") if isinstance(body, dict) else None
+        if not isinstance(habit_ids, list) or not all(
+            isinstance(habit_id, int) and not isinstance(habit_id, bool)
+            for habit_id in habit_ids
+        ):
+            raise ApiError(
+                HTTPStatus.BAD_REQUEST, 'Body must be {"habit_ids": [<int>, ...]}'
+            )
+        return habit_ids
+
+    def _read_body(self):
+        """Read and parse the JSON request body, None if there is none."""
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > MAX_BODY:
+            self.close_connection = True
+            raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Body too large")
+        if not length:
+            return None
+        data = self.rfile.read(length)
+        try:
+            return json.loads(data)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {e}") from e
+
+    def _send(self, status: HTTPStatus, payload: Dict) -> None:
+        """Write a JSON response."""
+        self._send_body(
+            status, _encoder.encode(payload).encode("utf-8"), "application/json"
+        )
+
+    def _send_body(self, status: HTTPStatus, data: bytes, content_type: str) -> None:
+        """Write a response with a Content-Length, keeping the connection."""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def serve(
+    storage: HabitJsonStorage | HabitSqliteStorage,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    workers: int = 16,
+    metrics: Metrics | None = None,
+) -> None:
+    """
+    Run the API server until interrupted.
+
+    Args:
+        storage (HabitJsonStorage | HabitSqliteStorage): Storage backend
+        host (str): Interface to listen on
+        port (int): Port to listen on
+        workers (int): Connection handler threads
+        metrics (Metrics | None): Registry to instrument the service with,
+            defaults to HABIT_METRICS (see metrics_from_env)
+    """
+    metrics = metrics or metrics_from_env()
+    service = metrics.instrument_service(HabitService(storage))
+    service.rollover()
+    with HabitApiServer((host, port), service, workers, metrics) as server:
+        print(f"Serving habit API on http://{host}:{server.server_port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Habit tracker HTTP/JSON API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument(
+        "--storage",
+        default="habits.json",
+        help="habit file; a .db suffix selects SQLite storage",
+    )
+    parser.add_argument(
+        "--journal",
+        action="store_true",
+        help="append JSON mutations to a log instead of rewriting the file",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="record call metrics and export them on /metrics",
+    )
+    args = parser.parse_args()
+    storage = (
+        HabitSqliteStorage(args.storage)
+        if args.storage.endswith(".db")
+        else HabitJsonStorage(args.storage, journal=args.journal)
+    )
+    serve(
+        storage,
+        args.host,
+        args.port,
+        args.workers,
+        Metrics() if args.metrics else None,
+    )
@@ -0,0 +1,165 @@
+from datetime import date
+from typing import Dict, Iterable
+
+import numpy as np
+
+from habit_service.store import index_key
+from models.base import BaseHabit
+from models.history import RATE_WINDOWS
+
+
+class HabitAnalytics:
+    """
+    Vectorized streak and completion-rate statistics over a habit population.
+
+    All completion histories are flattened into NumPy arrays of runs
+    (start ordinal, length, owning habit). Streaks are found by splitting the
+    runs into segments with a cumulative sum over "gap too large" flags:
+    a daily habit breaks on any missed day, a weekly habit when more than
+    seven days pass between completions.
+    """
+
+    def __init__(
+        self,
+        habits: Iterable[BaseHabit],
+        today: date | None = None,
+        windows: tuple[int, ...] = RATE_WINDOWS,
+    ) -> None:
+        """
+        Load completion data and compute per-habit statistics.
+
+        Args:
+            habits (Iterable[BaseHabit]): Habit objects
+            today (date | None): Reference date, defaults to today
+            windows (tuple[int, ...]): Completion rate windows in days
+        """
+        habits = list(habits)
+        n = len(habits)
+        self.today = today or date.today()
+        self.windows = windows
+        today_ordinal = self.today.toordinal()
+
+        self.habit_ids = np.fromiter(
+            (habit.habit_id for habit in habits), dtype=np.int64, count=n
+        )
+        self.types, self.type_codes = np.unique(
+            np.array([index_key(habit.type_habit) for habit in habits], dtype=str),
+            return_inverse=True,
+        )
+        self.categories, self.category_codes = np.unique(
+            np.array([index_key(habit.category) for habit in habits], dtype=str),
+            return_inverse=True,
+        )
+        weekly = self.types[self.type_codes] == "weekly" if n else np.zeros(0, bool)
+        gap_limit = np.where(weekly, 7, 1)
+
+        packed = [habit.history.to_bytes() for habit in habits]
+        run_counts = np.fromiter(
+            (len(data) // 8 for data in packed), dtype=np.int64, count=n
+        )
+        runs = np.frombuffer(b"".join(packed), dtype="<u4").reshape(-1, 2)
+        starts = runs[:, 0].astype(np.int64)
+        lengths = runs[:, 1].astype(np.int64)
+        ends = starts + lengths - 1
+        run_habit = np.repeat(np.arange(n), run_counts)
+
+        breaks = np.ones(len(starts), dtype=bool)
+        breaks[1:] = (run_habit[1:] != run_habit[:-1]) | (
+            starts[1:] - ends[:-1] > gap_limit[run_habit[1:]]
+        )
+        segment = np.cumsum(breaks) - 1
+        segment_total = np.bincount(segment, weights=lengths).astype(np.int64)
+
+        self.longest_streak = np.zeros(n, dtype=np.int64)
+        np.maximum.at(self.longest_streak, run_habit[breaks], segment_total)
+
+        self.current_streak = np.zeros(n, dtype=np.int64)
+        has_runs = run_counts > 0
+        last_run = (np.cumsum(run_counts) - 1)[has_runs]
+        alive = today_ordinal - ends[last_run] <= gap_limit[has_runs]
+        self.current_streak[has_runs] = np.where(
+            alive, segment_total[segment[last_run]], 0
+        )
+
+        self.completion_rate: Dict[int, np.ndarray] = {}
+        for window in windows:
+            window_start = today_ordinal - window + 1
+            overlap = np.clip(
+                np.minimum(ends, today_ordinal) - np.maximum(starts, window_start) + 1,
+                0,
+                None,
+            )
+            done = np.bincount(run_habit, weights=overlap, minlength=n)
+            expected = np.where(weekly, window / 7, window)
+            self.completion_rate[window] = np.minimum(done / expected, 1.0)
+
+        self._positions = {
+            int(habit_id): i for i, habit_id in enumerate(self.habit_ids)
+        }
+
+    def __len__(self) -> int:
+        return len(self.habit_ids)
+
+    def habit_stats(self, habit_id: int) -> Dict | None:
+        """
+        Return statistics for one habit.
+
+        Args:
+            habit_id (int): ID of the habit
+
+        Returns:
+            Dict | None: Streaks and completion rates, or None if not found
+        """
+        i = self._positions.get(habit_id)
+        if i is None:
+            return None
+        return {
+            "habit_id": habit_id,
+            "current_streak": int(self.current_streak[i]),
+            "longest_streak": int(self.longest_streak[i]),
+            "completion_rate": {
+                window: float(rates[i])
+                for window, rates in self.completion_rate.items()
+            },
+        }
+
+    def group_stats(self, by: str) -> Dict[str, Dict]:
+        """
+        Aggregate statistics per category or per habit type.
+
+        Args:
+            by (str): "category" or "type_habit"
+
+        Returns:
+            Dict[str, Dict]: Habit count, mean current streak, max longest streak
+                and mean completion rates for every group
+        """
+        if by == "category":
+            names, codes = self.categories, self.category_codes
+        elif by == "type_habit":
+            names, codes = self.types, self.type_codes
+        else:
+            raise ValueError(f"Unknown grouping: {by}")
+
+        k = len(names)
+        counts = np.bincount(codes, minlength=k)
+        longest = np.zeros(k, dtype=np.int64)
+        np.maximum.at(longest, codes, self.longest_streak)
+        mean_current = np.bincount(codes, weights=self.current_streak, minlength=k)
+        mean_rates = {
+            window: np.bincount(codes, weights=rates, minlength=k)
+            / np.maximum(counts, 1)
+            for window, rates in self.completion_rate.items()
+        }
+        mean_current = mean_current / np.maximum(counts, 1)
+        return {
+            str(name): {
+                "habits": int(counts[g]),
+                "mean_current_streak": float(mean_current[g]),
+                "longest_streak": int(longest[g]),
+                "completion_rate": {
+                    window: float(rates[g]) for window, rates in mean_rates.items()
+                },
+            }
+            for g, name in enumerate(names)
+        }
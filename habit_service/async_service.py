@@ -0,0 +1,176 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Set
+
+from habit_service.service import HabitService
+from schemas.habit_schema import TypeHabit
+
+if TYPE_CHECKING:
+    from schemas.input_schema import DailyHabitSchema, WeeklyHabitSchema
+
+
+class AsyncHabitService:
+    """
+    Asyncio front end for HabitService.
+
+    Blocking service calls run in a bounded thread pool; callers beyond
+    ``max_workers`` in-flight calls wait on the event loop instead of piling
+    up in the executor queue.
+
+    Operations on the same habit are serialized in arrival order, operations
+    on different habits run in parallel. HabitService takes its commit lock
+    around store changes and writes; calls that walk every habit hold it for
+    their whole run. Completions issued in the same event loop iteration are
+    persisted together through one ``complete_many`` call.
+    """
+
+    def __init__(self, service: HabitService, max_workers: int = 4) -> None:
+        """
+        Initialize the async service.
+
+        Args:
+            service (HabitService): Synchronous service to delegate to
+            max_workers (int): Executor threads and maximum in-flight calls
+        """
+        self.service = service
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="habit-service"
+        )
+        self._slots = asyncio.Semaphore(max_workers)
+        self._habit_locks: Dict[int, tuple[asyncio.Lock, int]] = {}
+        self._pending_completions: List[tuple[int, asyncio.Future]] = []
+        self._completion_flush: asyncio.Handle | None = None
+        self._flush_tasks: Set[asyncio.Task] = set()
+
+    async def __aenter__(self) -> "AsyncHabitService":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Shut down the executor without blocking the event loop."""
+        await asyncio.to_thread(self._executor.shutdown, True)
+
+    def close(self) -> None:
+        """Shut down the executor, waiting for running calls."""
+        self._executor.shutdown(wait=True)
+
+    async def create_habit(
+        self, type_habit: TypeHabit, daily_schema: "DailyHabitSchema"
+    ) -> str:
+        """Async version of HabitService.create_habit."""
+        return await self._run(self.service.create_habit, type_habit, daily_schema)
+
+    async def create_weekly_habit(
+        self, type_habit: TypeHabit, weekly_schema: "WeeklyHabitSchema"
+    ) -> str:
+        """Async version of HabitService.create_weekly_habit."""
+        return await self._run(
+            self.service.create_weekly_habit, type_habit, weekly_schema
+        )
+
+    async def complete_habit(self, habit_id: int) -> str:
+        """
+        Complete a habit, batched with other completions of the same tick.
+
+        Args:
+            habit_id (int): ID of the habit to complete
+
+        Returns:
+            str: Result message, as from HabitService.complete_habit
+        """
+        async with self._habit_lock(habit_id):
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending_completions.append((habit_id, future))
+            if self._completion_flush is None:
+                self._completion_flush = loop.call_soon(self._flush_completions)
+            return await future
+
+    async def delete_habit(self, habit_id: int) -> str:
+        """Async version of HabitService.delete_habit."""
+        async with self._habit_lock(habit_id):
+            return await self._run(self.service.delete_habit, habit_id)
+
+    async def show_habit(self, habit_id: int) -> str:
+        """Async version of HabitService.show_habit."""
+        async with self._habit_lock(habit_id):
+            return await self._run(self.service.show_habit, habit_id)
+
+    async def show_all_habits(self, **filters) -> str:
+        """Async version of HabitService.show_all_habits."""
+        return await self._run(
+            self._call_locked, partial(self.service.show_all_habits, **filters)
+        )
+
+    async def show_achievement(self, habit_id: int) -> str | None:
+        """Async version of HabitService.show_achievement."""
+        async with self._habit_lock(habit_id):
+            return await self._run(self.service.show_achievement, habit_id)
+
+    async def show_all_achievements(
+        self, offset: int = 0, limit: int | None = None
+    ) -> str:
+        """Async version of HabitService.show_all_achievements."""
+        return await self._run(
+            self._call_locked, self.service.show_all_achievements, offset, limit
+        )
+
+    async def _run(self, func, *args):
+        """Run a blocking service call in the executor."""
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+
+    def _call_locked(self, func, *args):
+        """Call func while holding the service's commit lock (executor thread)."""
+        with self.service.commit_lock:
+            return func(*args)
+
+    @asynccontextmanager
+    async def _habit_lock(self, habit_id: int) -> AsyncIterator[None]:
+        """Serialize operations on one habit; the lock is dropped when unused."""
+        lock, users = self._habit_locks.get(habit_id, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self._habit_locks[habit_id] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._habit_locks[habit_id]
+            if users == 1:
+                del self._habit_locks[habit_id]
+            else:
+                self._habit_locks[habit_id] = (lock, users - 1)
+
+    def _flush_completions(self) -> None:
+        """Persist all completions queued in this loop iteration with one write."""
+        batch, self._pending_completions = self._pending_completions, []
+        self._completion_flush = None
+        task = asyncio.ensure_future(
+            self._run(self.service.complete_many, [habit_id for habit_id, _ in batch])
+        )
+        # The loop only keeps weak references to tasks.
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+        task.add_done_callback(partial(self._resolve_completions, batch))
+
+    @staticmethod
+    def _resolve_completions(
+        batch: List[tuple[int, asyncio.Future]], task: asyncio.Task
+    ) -> None:
+        """Hand each waiting caller its own result from a batch."""
+        if task.cancelled() or task.exception() is not None:
+            error = asyncio.CancelledError() if task.cancelled() else task.exception()
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        # Callers hold their habit's lock, so a batch never repeats an ID.
+        for (_, future), (_, message) in zip(batch, task.result()):
+            if not future.done():
+                future.set_result(message)
@@ -0,0 +1,116 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+from typing import Dict, List
+
+
+def date_ordinal(value: str | None) -> int:
+    """
+    Convert an ISO date string to a date ordinal.
+
+    Args:
+        value (str | None): ISO date or None
+
+    Returns:
+        int: Date ordinal, 0 for missing or malformed dates
+    """
+    if not value:
+        return 0
+    try:
+        return date.fromisoformat(value).toordinal()
+    except (ValueError, TypeError):
+        return 0
+
+
+class DateIndex:
+    """
+    Sorted (date ordinal, habit_id) pairs answering range queries by bisection.
+
+    The sorted list is built lazily on the first query, so loading a large
+    store costs one sort; afterwards every change is applied incrementally.
+    """
+
+    def __init__(self) -> None:
+        self._ordinals: Dict[int, int] = {}
+        self._entries: List[tuple[int, int]] | None = None
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    def set(self, habit_id: int, ordinal: int) -> None:
+        """
+        Insert or move a habit in the index.
+
+        Args:
+            habit_id (int): ID of the habit
+            ordinal (int): Date ordinal to index the habit under
+        """
+        old = self._ordinals.get(habit_id)
+        if old == ordinal:
+            return
+        if old is not None:
+            self._remove_entry(old, habit_id)
+        self._ordinals[habit_id] = ordinal
+        if self._entries is not None:
+            insort(self._entries, (ordinal, habit_id))
+
+    def discard(self, habit_id: int) -> None:
+        """
+        Remove a habit from the index if present.
+
+        Args:
+            habit_id (int): ID of the habit
+        """
+        old = self._ordinals.pop(habit_id, None)
+        if old is not None:
+            self._remove_entry(old, habit_id)
+
+    def clear(self) -> None:
+        """Remove all habits from the index."""
+        self._ordinals.clear()
+        self._entries = None
+
+    def between(self, low: int, high: int) -> List[int]:
+        """
+        Return habits indexed under an ordinal in [low, high].
+
+        Args:
+            low (int): Lowest date ordinal, inclusive
+            high (int): Highest date ordinal, inclusive
+
+        Returns:
+            List[int]: Habit IDs ordered by date
+        """
+        entries = self._sorted()
+        start = bisect_left(entries, (low, -1))
+        end = bisect_right(entries, (high, float("inf")))
+        return [habit_id for _, habit_id in entries[start:end]]
+
+    def before(self, ordinal: int) -> List[int]:
+        """
+        Return habits indexed under an ordinal lower than the given one.
+
+        Args:
+            ordinal (int): Exclusive upper bound
+
+        Returns:
+            List[int]: Habit IDs ordered by date
+        """
+        entries = self._sorted()
+        end = bisect_left(entries, (ordinal, -1))
+        return [habit_id for _, habit_id in entries[:end]]
+
+    def _sorted(self) -> List[tuple[int, int]]:
+        """Return the sorted entries, building them on first use."""
+        if self._entries is None:
+            self._entries = sorted(
+                (ordinal, habit_id) for habit_id, ordinal in self._ordinals.items()
+            )
+        return self._entries
+
+    def _remove_entry(self, ordinal: int, habit_id: int) -> None:
+        """Delete one entry from the sorted list, if it is materialized."""
+        if self._entries is None:
+            return
+        i = bisect_left(self._entries, (ordinal, habit_id))
+        if i < len(self._entries) and self._entries[i] == (ordinal, habit_id):
+            del self._entries[i]
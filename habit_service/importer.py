@@ -0,0 +1,112 @@
+import csv
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from pydantic import ValidationError
+
+from schemas.habit_schema import (
+    DailyHabitSchema,
+    HabitBatchAdapter,
+    WeeklyHabitSchema,
+)
+
+
+def iter_rows(filename: str) -> Iterator[tuple[int, Dict | None, str | None]]:
+    """
+    Stream raw habit rows from a CSV or JSON Lines file.
+
+    CSV files need a header row with habit_name, habit_description, category
+    and optionally type_habit. Every other suffix is read as JSON Lines.
+    Empty CSV cells are dropped so schema defaults apply.
+
+    Args:
+        filename (str): Path of the input file
+
+    Yields:
+        tuple[int, Dict | None, str | None]: (line number, row, parse error)
+    """
+    path = Path(filename)
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, {k: v for k, v in row.items() if v}, None
+            return
+
+        for line_num, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_num, None, f"Invalid JSON: {e}"
+                continue
+            if not isinstance(row, dict):
+                yield line_num, None, "Row must be a JSON object"
+                continue
+            yield line_num, row, None
+
+
+def iter_batches(
+    filename: str, batch_size: int
+) -> Iterator[tuple[List[tuple[int, Dict]], List[Dict]]]:
+    """
+    Group rows into batches of ``batch_size`` parsed rows.
+
+    Args:
+        filename (str): Path of the input file
+        batch_size (int): Number of parsed rows per batch
+
+    Yields:
+        tuple[List[tuple[int, Dict]], List[Dict]]: Parsed (line, row) pairs and
+            rejects for rows that could not be parsed at all
+    """
+    batch = []
+    rejects = []
+    for line_num, row, error in iter_rows(filename):
+        if error:
+            rejects.append({"line": line_num, "row": None, "errors": [error]})
+            continue
+        batch.append((line_num, row))
+        if len(batch) >= batch_size:
+            yield batch, rejects
+            batch, rejects = [], []
+    if batch or rejects:
+        yield batch, rejects
+
+
+def validate_batch(
+    batch: List[tuple[int, Dict]],
+) -> tuple[List[DailyHabitSchema | WeeklyHabitSchema], List[Dict]]:
+    """
+    Validate a batch of rows with one TypeAdapter call.
+
+    Rows named in the validation errors are split off as rejects and the
+    remaining rows are validated again, so one bad row never sinks its batch.
+
+    Args:
+        batch (List[tuple[int, Dict]]): (line number, row) pairs
+
+    Returns:
+        tuple[List[DailyHabitSchema | WeeklyHabitSchema], List[Dict]]:
+            Validated schemas and reject records
+    """
+    rows = [row for _, row in batch]
+    try:
+        return HabitBatchAdapter.validate_python(rows), []
+    except ValidationError as e:
+        errors: Dict[int, List[str]] = {}
+        for error in e.errors():
+            index = error["loc"][0]
+            field = ".".join(str(part) for part in error["loc"][2:])
+            message = f"{field}: {error['msg']}" if field else error["msg"]
+            if message not in errors.setdefault(index, []):
+                errors[index].append(message)
+
+    rejects = [
+        {"line": batch[index][0], "row": batch[index][1], "errors": messages}
+        for index, messages in sorted(errors.items())
+    ]
+    good = [row for index, row in enumerate(rows) if index not in errors]
+    return HabitBatchAdapter.validate_python(good), rejects
@@ -0,0 +1,364 @@
+import inspect
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Callable, Dict, List
+
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+STORAGE_METHODS = ("load", "save", "commit", "commit_many", "compact", "clear", "flush")
+STORAGE_COUNTERS = (
+    "bytes_read",
+    "bytes_written",
+    "cache_hits",
+    "cache_misses",
+    "mutations",
+    "flushes",
+)
+
+
+class Histogram:
+    """Latency histogram with fixed upper bounds, plus call and error counts."""
+
+    __slots__ = ("bounds", "counts", "sum", "errors")
+
+    def __init__(self, bounds: tuple) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.errors = 0
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def cumulative(self) -> List[int]:
+        """Return the bucket counts as cumulative counts, last one is +Inf."""
+        total = 0
+        result = []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+
+class Metrics:
+    """
+    In-process call metrics for services and storage backends.
+
+    ``instrument`` wraps the public methods of one object so every call
+    records its latency in a per-method histogram; the cost is two clock
+    reads, a bisect and a lock per call. Values that the objects already
+    track (habit counts, storage byte and cache counters) are pulled when
+    the metrics are exported, so they cost nothing on the hot path.
+    """
+
+    enabled = True
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS) -> None:
+        """
+        Initialize an empty registry.
+
+        Args:
+            buckets (tuple): Histogram upper bounds in seconds, ascending
+        """
+        self.buckets = tuple(buckets)
+        self._histograms: Dict[str, Histogram] = {}
+        self._gauges: Dict[str, Dict[str, Callable[[], float]]] = {}
+        self._counters: Dict[str, Dict[str, Callable[[], float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float, error: bool = False) -> None:
+        """
+        Record one call.
+
+        Args:
+            name (str): Method name, e.g. "service.complete_habit"
+            seconds (float): Call latency
+            error (bool): The call raised
+        """
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(self.buckets)
+            histogram.counts[bisect_left(self.buckets, seconds)] += 1
+            histogram.sum += seconds
+            if error:
+                histogram.errors += 1
+
+    def timed(self, name: str, func: Callable) -> Callable:
+        """
+        Wrap a callable so its calls are observed under name.
+
+        Generator functions are timed until the generator is exhausted or
+        closed, so streaming methods report the full iteration.
+
+        Args:
+            name (str): Metric label
+            func (Callable): Function or bound method
+
+        Returns:
+            Callable: Wrapper with the same signature
+        """
+        clock = time.perf_counter
+        observe = self.observe
+
+        if inspect.isgeneratorfunction(func):
+
+            @wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                started = clock()
+                error = True
+                try:
+                    yield from func(*args, **kwargs)
+                    error = False
+                except GeneratorExit:
+                    error = False
+                    raise
+                finally:
+                    observe(name, clock() - started, error)
+
+            return generator_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = clock()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                observe(name, clock() - started, True)
+                raise
+            observe(name, clock() - started)
+            return result
+
+        return wrapper
+
+    def instrument(self, obj, prefix: str, methods: List[str] | None = None):
+        """
+        Time the public methods of an object in place.
+
+        Bound methods are replaced by instance attributes, so only this
+        object is affected and internal ``self.method`` calls are counted too.
+
+        Args:
+            obj: Object to instrument
+            prefix (str): Metric label prefix, e.g. "service"
+            methods (List[str] | None): Method names, defaults to all public methods
+
+        Returns:
+            The same object
+        """
+        if methods is None:
+            methods = [
+                name
+                for name, _ in inspect.getmembers(type(obj), inspect.isfunction)
+                if not name.startswith("_")
+            ]
+        for name in methods:
+            setattr(obj, name, self.timed(f"{prefix}.{name}", getattr(obj, name)))
+        return obj
+
+    def gauge(self, name: str, label: str, func: Callable[[], float]) -> None:
+        """
+        Register a value read at export time.
+
+        Args:
+            name (str): Metric name, e.g. "habits"
+            label (str): Source label, e.g. "service"
+            func (Callable[[], float]): Returns the current value
+        """
+        self._gauges.setdefault(name, {})[label] = func
+
+    def counter(self, name: str, label: str, func: Callable[[], float]) -> None:
+        """
+        Register a monotonically growing value read at export time.
+
+        Args:
+            name (str): Metric name, e.g. "bytes_written"
+            label (str): Source label, e.g. "storage"
+            func (Callable[[], float]): Returns the current total
+        """
+        self._counters.setdefault(name, {})[label] = func
+
+    def instrument_storage(self, storage, label: str = "storage"):
+        """
+        Time a storage backend and export its byte and cache counters.
+
+        Only the I/O operations in STORAGE_METHODS are timed; the cheap
+        ``revision``/``version`` probes run on every service call and are
+        left alone.
+
+        Args:
+            storage: HabitJsonStorage, HabitSqliteStorage or a wrapper
+            label (str): Metric label prefix
+
+        Returns:
+            The same storage
+        """
+        for name in STORAGE_COUNTERS:
+            if hasattr(storage, name):
+                self.counter(name, label, lambda name=name: getattr(storage, name))
+        methods = [name for name in STORAGE_METHODS if hasattr(storage, name)]
+        return self.instrument(storage, label, methods)
+
+    def instrument_service(self, service, label: str = "service"):
+        """
+        Time a HabitService and its storage, and export its habit count.
+
+        Args:
+            service (HabitService): Service to instrument
+            label (str): Metric label prefix
+
+        Returns:
+            The same service
+        """
+        self.instrument_storage(service.storage, f"{label}.storage")
+        self.gauge("habits", label, lambda: len(service.store))
+        return self.instrument(service, label)
+
+    def snapshot(self) -> Dict:
+        """
+        Return all metrics as plain data.
+
+        Returns:
+            Dict: {"calls": {method: {count, errors, sum_seconds, buckets}},
+                "counters": {name: {source: value}}, "gauges": {name: {source: value}}};
+                buckets map upper bounds to cumulative counts
+        """
+        with self._lock:
+            calls = {
+                name: {
+                    "count": histogram.count,
+                    "errors": histogram.errors,
+                    "sum_seconds": histogram.sum,
+                    "buckets": dict(
+                        zip(
+                            [str(bound) for bound in self.buckets] + ["+Inf"],
+                            histogram.cumulative(),
+                        )
+                    ),
+                }
+                for name, histogram in sorted(self._histograms.items())
+            }
+        return {
+            "calls": calls,
+            "counters": self._read(self._counters),
+            "gauges": self._read(self._gauges),
+        }
+
+    def to_json(self) -> str:
+        """Return the snapshot as a JSON document."""
+        return json.dumps(self.snapshot())
+
+    def to_prometheus(self) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text ending with a newline
+        """
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP habit_call_duration_seconds Latency of instrumented calls.",
+            "# TYPE habit_call_duration_seconds histogram",
+        ]
+        for name, call in snapshot["calls"].items():
+            for bound, count in call["buckets"].items():
+                lines.append(
+                    f'habit_call_duration_seconds_bucket{{method="{name}",le="{bound}"}} {count}'
+                )
+            lines.append(
+                f'habit_call_duration_seconds_sum{{method="{name}"}} {call["sum_seconds"]}'
+            )
+            lines.append(
+                f'habit_call_duration_seconds_count{{method="{name}"}} {call["count"]}'
+            )
+        lines += [
+            "# HELP habit_call_errors_total Instrumented calls that raised.",
+            "# TYPE habit_call_errors_total counter",
+        ]
+        for name, call in snapshot["calls"].items():
+            lines.append(f'habit_call_errors_total{{method="{name}"}} {call["errors"]}')
+        for kind, suffix in (("counter", "_total"), ("gauge", "")):
+            for name, sources in snapshot[kind + "s"].items():
+                metric = f"habit_{name}{suffix}"
+                lines.append(f"# TYPE {metric} {kind}")
+                for label, value in sources.items():
+                    lines.append(f'{metric}{{source="{label}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _read(values: Dict[str, Dict[str, Callable[[], float]]]) -> Dict:
+        """Evaluate registered pull values, sorted by name."""
+        return {
+            name: {label: func() for label, func in sources.items()}
+            for name, sources in sorted(values.items())
+        }
+
+    def write_prometheus(self, filename: str) -> None:
+        """
+        Atomically write the Prometheus text to a file, e.g. for the node
+        exporter's textfile collector.
+
+        Args:
+            filename (str): Target path
+        """
+        tmp = f"{filename}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp, filename)
+
+
+class NullMetrics(Metrics):
+    """
+    Disabled metrics: nothing is wrapped or recorded, so instrumented code
+    runs exactly as uninstrumented code.
+    """
+
+    enabled = False
+
+    def observe(self, name: str, seconds: float, error: bool = False) -> None:
+        pass
+
+    def timed(self, name: str, func: Callable) -> Callable:
+        return func
+
+    def instrument(self, obj, prefix: str, methods: List[str] | None = None):
+        return obj
+
+    def gauge(self, name: str, label: str, func: Callable[[], float]) -> None:
+        pass
+
+    def counter(self, name: str, label: str, func: Callable[[], float]) -> None:
+        pass
+
+
+def metrics_from_env() -> Metrics:
+    """
+    Return enabled metrics if HABIT_METRICS is set to a non-empty value
+    other than "0", else NullMetrics.
+
+    Returns:
+        Metrics: Registry to instrument with
+    """
+    value = os.environ.get("HABIT_METRICS", "")
+    return Metrics() if value not in ("", "0") else NullMetrics()
@@ -0,0 +1,165 @@
+import json
+from bisect import bisect_left, bisect_right
+from enum import Enum
+from typing import Dict, Iterable
+
+from schemas.habit_schema import (
+    AchievementHabit,
+    AchievementWeeklyHabit,
+    GoalDaysHabit,
+    GoalWeeklyHabit,
+)
+
+
+class MilestoneLadder:
+    """Sorted streak thresholds mapped to rewards, looked up by bisection."""
+
+    __slots__ = ("thresholds", "rewards")
+
+    def __init__(self, steps: Iterable[tuple[int, object]]) -> None:
+        """
+        Build the ladder.
+
+        Args:
+            steps (Iterable[tuple[int, object]]): (streak threshold, reward) pairs;
+                enum rewards are stored as their raw values
+        """
+        ordered = sorted(steps, key=lambda step: step[0])
+        self.thresholds = [threshold for threshold, _ in ordered]
+        self.rewards = [
+            reward.value if isinstance(reward, Enum) else reward
+            for _, reward in ordered
+        ]
+
+    def __len__(self) -> int:
+        return len(self.thresholds)
+
+    def at(self, streak: int):
+        """
+        Return the reward unlocked exactly at this streak.
+
+        Args:
+            streak (int): Current streak
+
+        Returns:
+            Reward for the streak, or None if it is not a milestone
+        """
+        i = bisect_left(self.thresholds, streak)
+        if i < len(self.thresholds) and self.thresholds[i] == streak:
+            return self.rewards[i]
+        return None
+
+    def next_after(self, streak: int) -> tuple[int, object] | None:
+        """
+        Return the next milestone above the streak.
+
+        Args:
+            streak (int): Current streak
+
+        Returns:
+            tuple[int, object] | None: (threshold, reward), or None past the top
+        """
+        i = bisect_right(self.thresholds, streak)
+        if i == len(self.thresholds):
+            return None
+        return self.thresholds[i], self.rewards[i]
+
+
+class MilestoneEngine:
+    """Goal and achievement ladders for daily and weekly habits."""
+
+    def __init__(
+        self,
+        daily_goals: MilestoneLadder,
+        weekly_goals: MilestoneLadder,
+        daily_achievements: MilestoneLadder,
+        weekly_achievements: MilestoneLadder,
+    ) -> None:
+        """
+        Initialize the engine.
+
+        Args:
+            daily_goals (MilestoneLadder): Streak in days -> next goal in days
+            weekly_goals (MilestoneLadder): Streak in weeks -> next goal in weeks
+            daily_achievements (MilestoneLadder): Streak in days -> achievement
+            weekly_achievements (MilestoneLadder): Streak in weeks -> achievement
+        """
+        self.daily_goals = daily_goals
+        self.weekly_goals = weekly_goals
+        self.daily_achievements = daily_achievements
+        self.weekly_achievements = weekly_achievements
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "MilestoneEngine":
+        """
+        Build an engine from custom ladders, falling back to the defaults.
+
+        Args:
+            data (Dict): Optional "daily_goals", "weekly_goals",
+                "daily_achievements" and "weekly_achievements" lists of
+                [threshold, reward] pairs
+
+        Returns:
+            MilestoneEngine: Engine with the given ladders
+        """
+        ladders = {
+            name: MilestoneLadder(data[name]) if name in data else default
+            for name, default in vars(DEFAULT_MILESTONES).items()
+        }
+        return cls(**ladders)
+
+    @classmethod
+    def from_file(cls, filename: str) -> "MilestoneEngine":
+        """
+        Build an engine from a JSON file of custom ladders.
+
+        Args:
+            filename (str): Path of the JSON file (see from_dict)
+
+        Returns:
+            MilestoneEngine: Engine with the given ladders
+        """
+        with open(filename, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+DEFAULT_MILESTONES = MilestoneEngine(
+    daily_goals=MilestoneLadder(
+        [
+            (1, GoalDaysHabit.ONE_WEEK),
+            (7, GoalDaysHabit.THREE_WEEKS),
+            (21, GoalDaysHabit.ONE_MONTH),
+            (30, GoalDaysHabit.TWO_MONTHS),
+            (60, GoalDaysHabit.SIX_MONTHS),
+            (180, GoalDaysHabit.ONE_YEAR),
+        ]
+    ),
+    weekly_goals=MilestoneLadder(
+        [
+            (1, GoalWeeklyHabit.ONE_MONTH),
+            (4, GoalWeeklyHabit.TWO_MONTHS),
+            (8, GoalWeeklyHabit.SIX_MONTHS),
+            (45, GoalWeeklyHabit.ONE_YEAR),
+        ]
+    ),
+    daily_achievements=MilestoneLadder(
+        [
+            (1, AchievementHabit.ONE_DAY),
+            (7, AchievementHabit.ONE_WEEK),
+            (21, AchievementHabit.THREE_WEEKS),
+            (30, AchievementHabit.ONE_MONTH),
+            (60, AchievementHabit.TWO_MONTHS),
+            (180, AchievementHabit.SIX_MONTHS),
+            (365, AchievementHabit.ONE_YEAR),
+        ]
+    ),
+    weekly_achievements=MilestoneLadder(
+        [
+            (1, AchievementWeeklyHabit.ONE_WEEK),
+            (4, AchievementWeeklyHabit.ONE_MONTH),
+            (8, AchievementWeeklyHabit.TWO_MONTHS),
+            (45, AchievementWeeklyHabit.SIX_MONTHS),
+            (91, AchievementWeeklyHabit.ONE_YEAR),
+        ]
+    ),
+)
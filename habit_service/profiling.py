@@ -0,0 +1,166 @@
+import cProfile
+import inspect
+import io
+import os
+import pstats
+import re
+import time
+import tracemalloc
+from functools import wraps
+from pathlib import Path
+from typing import Callable, List
+
+
+class ActionProfiler:
+    """
+    Per-action cProfile and tracemalloc capture for interactive sessions.
+
+    Every outermost call into an instrumented object is one action: it runs
+    under cProfile with tracemalloc tracing, and leaves two files in the
+    output directory, ``<n>-<action>.prof`` (pstats dump, e.g. for
+    ``python -m pstats`` or snakeviz) and ``<n>-<action>.txt`` (top functions
+    by cumulative time and top allocation sites). Calls made from inside an
+    action belong to that action's profile.
+    """
+
+    def __init__(self, directory: str, top: int = 25, echo: bool = True) -> None:
+        """
+        Initialize the profiler.
+
+        Args:
+            directory (str): Output directory, created if missing
+            top (int): Number of functions and allocation sites in the reports
+            echo (bool): Print a one-line summary after each action
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.top = top
+        self.echo = echo
+        self.actions = 0
+        self._active = False
+        self._was_tracing = False
+
+    def instrument(self, obj, methods: List[str] | None = None):
+        """
+        Profile the public methods of an object in place.
+
+        Args:
+            obj: Object to instrument, typically a HabitService
+            methods (List[str] | None): Method names, defaults to all public methods
+
+        Returns:
+            The same object
+        """
+        if methods is None:
+            methods = [
+                name
+                for name, _ in inspect.getmembers(type(obj), inspect.isfunction)
+                if not name.startswith("_")
+            ]
+        for name in methods:
+            setattr(obj, name, self.wrap(name, getattr(obj, name)))
+        return obj
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        """
+        Wrap a callable so each outermost call is profiled as an action.
+
+        Generators are profiled until exhausted or closed.
+
+        Args:
+            name (str): Action name used in file names and summaries
+            func (Callable): Function or bound method
+
+        Returns:
+            Callable: Wrapper with the same signature
+        """
+        if inspect.isgeneratorfunction(func):
+
+            @wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                if self._active:
+                    yield from func(*args, **kwargs)
+                    return
+                session = self._start()
+                try:
+                    yield from func(*args, **kwargs)
+                finally:
+                    self._finish(name, *session)
+
+            return generator_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if self._active:
+                return func(*args, **kwargs)
+            session = self._start()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._finish(name, *session)
+
+        return wrapper
+
+    def _start(self) -> tuple[cProfile.Profile, float]:
+        """Start tracing and profiling an action."""
+        self._active = True
+        self._was_tracing = tracemalloc.is_tracing()
+        if self._was_tracing:
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+        profile = cProfile.Profile()
+        started = time.perf_counter()
+        profile.enable()
+        return profile, started
+
+    def _finish(self, name: str, profile: cProfile.Profile, started: float) -> None:
+        """Stop an action and write its profile, report and summary."""
+        profile.disable()
+        elapsed = time.perf_counter() - started
+        snapshot = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        if not self._was_tracing:
+            tracemalloc.stop()
+        self._active = False
+
+        self.actions += 1
+        stem = f"{self.actions:04d}-{re.sub(r'[^A-Za-z0-9_.-]', '_', name)}"
+        profile.dump_stats(self.directory / f"{stem}.prof")
+        with open(self.directory / f"{stem}.txt", "w", encoding="utf-8") as f:
+            f.write(self._report(name, profile, snapshot, elapsed, peak))
+        if self.echo:
+            calls = sum(entry.callcount for entry in profile.getstats())
+            print(
+                f"[profile] {name}: {elapsed * 1000:.1f} ms, "
+                f"{calls} calls, peak {peak / 2**20:.2f} MiB "
+                f"-> {self.directory / stem}.prof"
+            )
+
+    def _report(
+        self,
+        name: str,
+        profile: cProfile.Profile,
+        snapshot: tracemalloc.Snapshot,
+        elapsed: float,
+        peak: int,
+    ) -> str:
+        """Render the text report of one action."""
+        out = io.StringIO()
+        out.write(f"action: {name}\n")
+        out.write(f"wall time: {elapsed * 1000:.3f} ms\n")
+        out.write(f"peak traced memory: {peak} bytes\n\n")
+        stats = pstats.Stats(profile, stream=out)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+
+        out.write(f"top {self.top} allocation sites still alive at the end:\n")
+        snapshot = snapshot.filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+                tracemalloc.Filter(False, os.path.join("*", "cProfile.py")),
+            ]
+        )
+        for stat in snapshot.statistics("lineno")[: self.top]:
+            out.write(f"{stat}\n")
+        return out.getvalue()
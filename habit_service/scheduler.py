@@ -0,0 +1,107 @@
+import heapq
+from datetime import date
+from typing import Dict, List
+
+from models.base import BaseHabit
+
+
+def expiry_ordinal(habit: BaseHabit) -> int | None:
+    """
+    Return the last day on which a habit's streak is still alive.
+
+    Weekly habits expire after their deadline; daily habits after the day
+    following their last completion. Habits without a running streak never
+    expire.
+
+    Args:
+        habit (BaseHabit): Habit object
+
+    Returns:
+        int | None: Date ordinal of the last safe day, or None
+    """
+    try:
+        if habit.type_habit == "weekly":
+            if not habit.weekly_streak or not habit.deadline:
+                return None
+            return date.fromisoformat(habit.deadline).toordinal()
+        if not habit.streak or not habit.last_completed:
+            return None
+        return date.fromisoformat(habit.last_completed).toordinal() + 1
+    except (ValueError, TypeError):
+        return None
+
+
+class DeadlineQueue:
+    """
+    Min-heap of habit expiry dates.
+
+    Rescheduling and cancelling are lazy: the heap may hold outdated entries,
+    which are skipped when popped and dropped when the heap is rebuilt.
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[tuple[int, int]] = []
+        self._expiry: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    def schedule(self, habit: BaseHabit) -> None:
+        """
+        (Re)schedule a habit according to its current state.
+
+        Args:
+            habit (BaseHabit): Habit object
+        """
+        habit_id = habit.habit_id
+        expiry = expiry_ordinal(habit)
+        if expiry is None:
+            self.cancel(habit_id)
+            return
+        if self._expiry.get(habit_id) == expiry:
+            return
+        self._expiry[habit_id] = expiry
+        heapq.heappush(self._heap, (expiry, habit_id))
+        if len(self._heap) > 2 * len(self._expiry) + 64:
+            self._rebuild()
+
+    def cancel(self, habit_id: int) -> None:
+        """
+        Stop tracking a habit.
+
+        Args:
+            habit_id (int): ID of the habit
+        """
+        self._expiry.pop(habit_id, None)
+
+    def clear(self) -> None:
+        """Stop tracking all habits."""
+        self._heap.clear()
+        self._expiry.clear()
+
+    def pop_expired(self, today: date) -> List[int]:
+        """
+        Remove and return habits whose streak expired before today.
+
+        Costs O(k log n) for k expired habits.
+
+        Args:
+            today (date): Current date
+
+        Returns:
+            List[int]: IDs of expired habits, earliest expiry first
+        """
+        today_ordinal = today.toordinal()
+        expired = []
+        heap = self._heap
+        while heap and heap[0][0] < today_ordinal:
+            expiry, habit_id = heapq.heappop(heap)
+            if self._expiry.get(habit_id) == expiry:
+                del self._expiry[habit_id]
+                expired.append(habit_id)
+        return expired
+
+    def _rebuild(self) -> None:
+        """Drop outdated heap entries."""
+        self._heap = [(expiry, habit_id) for habit_id, expiry in self._expiry.items()]
+        heapq.heapify(self._heap)
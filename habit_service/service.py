@@ -1,38 +1,192 @@
+import json
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta, date
-from typing import List, Dict
+from functools import wraps
+from itertools import islice
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List
+
+from habit_service.milestones import DEFAULT_MILESTONES, MilestoneEngine
+from habit_service.store import HabitStore
+from habit_storage.errors import StorageConflictError
 from habit_storage.json_storage import HabitJsonStorage
-from models.base import DailyHabit, WeeklyHabit
-from schemas.habit_schema import (
-    DailyHabitSchema,
-    WeeklyHabitSchema,
-    GoalDaysHabit,
-    AchievementHabit,
-    TypeHabit,
-    AchievementWeeklyHabit,
-    GoalWeeklyHabit,
-)
+from habit_storage.sequence import IdSequence
+from habit_storage.sqlite_storage import HabitSqliteStorage
+from models.base import BaseHabit, DailyHabit, WeeklyHabit, habit_from_dict
+from models.history import RATE_WINDOWS
+from schemas.habit_schema import CategoryHabit, TypeHabit
+
+if TYPE_CHECKING:
+    # NumPy and pydantic are imported on first use, they dominate startup.
+    from habit_service.analytics import HabitAnalytics
+    from schemas.input_schema import DailyHabitSchema, WeeklyHabitSchema
+
+CONFLICT_RETRIES = 10
+
+
+def _retry_on_conflict(method):
+    """
+    Re-run a mutating service method on freshly loaded data when another
+    process wrote between this service's load and its commit.
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        for _ in range(CONFLICT_RETRIES):
+            try:
+                return method(self, *args, **kwargs)
+            except StorageConflictError:
+                self._revision = None
+        return method(self, *args, **kwargs)
+
+    return wrapper
 
 
 class HabitService:
-    """Service class for managing habits: creation, deletion, completion, and display."""
+    """
+    Service class for managing habits: creation, deletion, completion, and display.
 
-    def __init__(self, storage: HabitJsonStorage) -> None:
+    Reloads, ID reservations and every store change together with its commit
+    hold ``commit_lock``, so calls on different habits may run in parallel
+    threads. Calls on the same habit must be serialized by the caller, and
+    callers iterating the whole store from several threads hold the lock too.
+    """
+
+    def __init__(
+        self,
+        storage: HabitJsonStorage | HabitSqliteStorage,
+        milestones: MilestoneEngine = DEFAULT_MILESTONES,
+        id_sequence: IdSequence | None = None,
+    ) -> None:
         """
         Initialize the HabitService with a storage backend.
 
         Args:
-            storage (HabitJsonStorage): Storage instance used to persist habits.
+            storage (HabitJsonStorage | HabitSqliteStorage): Storage instance
+                used to persist habits.
+            milestones (MilestoneEngine): Goal and achievement ladders.
+            id_sequence (IdSequence | None): Source of unique IDs; defaults to a
+                sequence in the storage's sequence file, or to continuing after
+                the highest loaded ID for storages without one.
         """
         self.storage = storage
-        self.habits_data: List[Dict] = self.storage.load()
+        self.milestones = milestones
+        sequence_file = getattr(storage, "sequence_file", None)
+        if id_sequence is None and sequence_file is not None:
+            id_sequence = IdSequence(str(sequence_file))
+        self.id_sequence = id_sequence
+        self.commit_lock = threading.RLock()
+        self._revision = self.storage.revision()
+        self._version = self.storage.version()
+        self.store = self._load()
+
+    def _load(self) -> HabitStore:
+        """
+        Load habits from storage into habit objects and index them.
+
+        Returns:
+            HabitStore: Store holding the loaded habits
+        """
+        return HabitStore(habit_from_dict(habit) for habit in self.storage.load())
 
     def _reload(self) -> None:
-        """Reload habits data from storage."""
-        self.habits_data = self.storage.load()
+        """
+        Reload habits data from storage and rebuild the indexes.
+
+        Skipped when the storage reports that nothing changed since the last
+        load or write made by this service. The version is read before loading,
+        so it is never newer than the loaded data.
+        """
+        with self.commit_lock:
+            revision = self.storage.revision()
+            version = self.storage.version()
+            if (
+                revision is not None
+                and revision == self._revision
+                and version == self._version
+            ):
+                return
+            self._revision, self._version = revision, version
+            self.store = self._load()
 
     def _save(self) -> None:
         """Save current habits data to storage."""
-        self.storage.save(self.habits_data)
+        with self.commit_lock:
+            self._version = self.storage.save(self.store.to_records())
+            self._revision = self.storage.revision()
+
+    def _commit(self, op: str, habit: BaseHabit | None = None) -> None:
+        """
+        Persist a single mutation through the storage backend.
+
+        Args:
+            op (str): Mutation kind - "create", "complete", "update", "delete" or "clear"
+            habit (BaseHabit | None): Affected habit
+
+        Raises:
+            StorageConflictError: If another process wrote since the last load
+        """
+        record = habit.to_dict() if habit is not None else None
+        self._version = self.storage.commit(
+            op, record, self.store.to_records, self._version
+        )
+        self._revision = self.storage.revision()
+
+    def _commit_many(self, op: str, habits: List[BaseHabit]) -> None:
+        """
+        Persist the same mutation for several habits with a single write.
+
+        Args:
+            op (str): Mutation kind - "create", "complete", "update" or "delete"
+            habits (List[BaseHabit]): Affected habits
+
+        Raises:
+            StorageConflictError: If another process wrote since the last load
+        """
+        records = [habit.to_dict() for habit in habits]
+        self._version = self.storage.commit_many(
+            op, records, self.store.to_records, self._version
+        )
+        self._revision = self.storage.revision()
+
+    def _commit_created(self, habits: List[BaseHabit]) -> None:
+        """
+        Add new habits to the store and persist them with a single write.
+
+        If the write fails the store is reloaded before the error propagates,
+        so habits that were never persisted do not stay visible.
+
+        Args:
+            habits (List[BaseHabit]): Habits with reserved IDs
+
+        Raises:
+            StorageConflictError: If another process wrote since the last load
+        """
+        with self._mutation():
+            for habit in habits:
+                self.store.add(habit)
+            self._commit_many("create", habits)
+
+    @contextmanager
+    def _mutation(self) -> Iterator[None]:
+        """
+        Hold the commit lock and undo in-memory store changes whose write fails.
+
+        Store changes made inside the block are persisted by a commit inside
+        the block. If anything raises before the commit succeeded, the store
+        is reloaded before the error propagates, so changes that never reached
+        storage do not stay visible.
+
+        Yields:
+            None
+        """
+        with self.commit_lock:
+            try:
+                yield
+            except Exception:
+                self._revision = None
+                self._reload()
+                raise
 
     def _generate_id(self) -> int:
         """
@@ -41,74 +195,86 @@ class HabitService:
         Returns:
             int: The next available habit ID (starts from 1 if empty).
         """
-        self.habits_data = self.storage.load()
-        if not self.habits_data:
-            return 1
-        return max(h.get("habit_id", 0) for h in self.habits_data) + 1
+        return self._reserve_ids(1)[0]
+
+    def _reserve_ids(self, count: int) -> range:
+        """
+        Reserve a block of new habit IDs.
+
+        Args:
+            count (int): Number of IDs
 
-    def _streak_increase(self, habit_id: int) -> str | None:
+        Returns:
+            range: Reserved IDs
+        """
+        with self.commit_lock:
+            if self.id_sequence is not None:
+                return self.id_sequence.allocate(count, floor=self.store.max_id)
+            return self.store.reserve_ids(count)
+
+    def _streak_increase(self, habit: DailyHabit) -> str:
         """
         Increase the streak for a daily habit if completed today.
 
         Handles streak logic, goal updates, and achievement unlocking.
 
         Args:
-            habit_id (int): ID of the habit to update.
+            habit (DailyHabit): Daily habit to update.
 
         Returns:
-            str | None: Success message with streak/goal/achievement info,
-                        or error message, or None if habit not found.
+            str: Success message with streak/goal/achievement info,
+                 or error message.
         """
         today = datetime.now().date()
         today_iso = today.isoformat()
-        for habit in self.habits_data:
-            if habit["habit_id"] != habit_id:
-                continue
-            last_iso = habit.get("last_completed")
-            if last_iso == today_iso:
-                return "The habit has already been completed!"
-            if last_iso is None:
-                habit["streak"] = 1
-            else:
-                try:
-                    last_date = datetime.fromisoformat(last_iso).date()
-                    delta = (today - last_date).days
-                    if delta == 1:
-                        habit["streak"] += 1
-                    elif delta > 1:
-                        habit["streak"] = 1
-                    else:
-                        pass
-                except (ValueError, TypeError):
-                    habit["streak"] = 1
-            messages = []
-
-            update_goal_message = self._update_goal_days(habit)
-            if update_goal_message:
-                messages.append(update_goal_message)
-
-            update_achievement_message = self._update_achievements(habit)
-            if update_achievement_message:
-                messages.append(update_achievement_message)
-
-            if messages:
-                return "\n".join(messages)
-            else:
-                return f"Habit completed! Current streak - {habit['streak']} days"
-        return None
+        last_iso = habit.last_completed
+        if last_iso == today_iso:
+            return "The habit has already been completed!"
+        habit.last_completed = today_iso
+        habit.history.add(today)
+        if last_iso is None:
+            habit.streak = 1
+        else:
+            try:
+                last_date = datetime.fromisoformat(last_iso).date()
+                delta = (today - last_date).days
+                if delta == 1:
+                    habit.streak += 1
+                elif delta > 1:
+                    habit.streak = 1
+                else:
+                    pass
+            except (ValueError, TypeError):
+                habit.streak = 1
+        messages = []
+
+        update_goal_message = self._update_goal_days(habit)
+        if update_goal_message:
+            messages.append(update_goal_message)
+
+        update_achievement_message = self._update_achievements(habit)
+        if update_achievement_message:
+            messages.append(update_achievement_message)
+
+        if messages:
+            return "\n".join(messages)
+        else:
+            return f"Habit completed! Current streak - {habit.streak} days"
 
-    def _check_weekly_deadline(self, habit: dict, today: date) -> tuple[int, str]:
+    def _check_weekly_deadline(
+        self, habit: WeeklyHabit, today: date
+    ) -> tuple[int, str]:
         """
         Check if the weekly deadline has passed and determine new streak value.
 
         Args:
-            habit (dict): Habit data dictionary.
+            habit (WeeklyHabit): Habit object.
             today (date): Current date.
 
         Returns:
             tuple[int, str]: (new_streak_value, message)
         """
-        deadline_iso = habit.get("deadline")
+        deadline_iso = habit.deadline
 
         if not deadline_iso:
             return 1, "Weekly streak started!"
@@ -120,169 +286,127 @@ class HabitService:
                 return 1, "Weekly streak reset - missed the deadline!"
             else:
                 return (
-                    habit.get("weekly_streak", 0) + 1,
-                    f"Weekly streak increased to {habit.get('weekly_streak', 0) + 1}!",
+                    habit.weekly_streak + 1,
+                    f"Weekly streak increased to {habit.weekly_streak + 1}!",
                 )
 
         except (ValueError, TypeError):
             return 1, "Data parsing error. Weekly streak reset to 1."
 
-    def _weekly_streak_increase(self, habit_id: int) -> str | None:
+    def _weekly_streak_increase(self, habit: WeeklyHabit) -> str:
         """
         Increase the weekly streak and update deadline for a weekly habit.
 
         Also handles goal and achievement updates.
 
         Args:
-            habit_id (int): ID of the weekly habit.
+            habit (WeeklyHabit): Weekly habit to update.
 
         Returns:
-            str | None: Message about streak update, new deadline, goals/achievements,
-                        or error message, or None if not found.
+            str: Message about streak update, new deadline, goals/achievements,
+                 or error message.
         """
         today = datetime.now().date()
         today_iso = today.isoformat()
 
-        for habit in self.habits_data:
-            if habit["habit_id"] != habit_id:
-                continue
+        if habit.last_completed == today_iso:
+            return "The habit has already been completed today!"
 
-            if habit.get("last_completed") == today_iso:
-                return "The habit has already been completed today!"
+        new_streak, streak_message = self._check_weekly_deadline(habit, today)
+        habit.weekly_streak = new_streak
 
-            new_streak, streak_message = self._check_weekly_deadline(habit, today)
-            habit["weekly_streak"] = new_streak
+        new_deadline = today + timedelta(weeks=1)
+        habit.deadline = new_deadline.isoformat()
 
-            new_deadline = today + timedelta(weeks=1)
-            habit["deadline"] = new_deadline.isoformat()
+        habit.last_completed = today_iso
+        habit.history.add(today)
 
-            habit["last_completed"] = today_iso
+        messages = [
+            streak_message,
+            f"New deadline: {new_deadline.strftime('%Y-%m-%d')}",
+        ]
 
-            messages = [
-                streak_message,
-                f"New deadline: {new_deadline.strftime('%Y-%m-%d')}",
-            ]
+        if goal_msg := self._update_weekly_goal_days(habit):
+            messages.append(goal_msg)
 
-            if goal_msg := self._update_weekly_goal_days(habit):
-                messages.append(goal_msg)
+        if achievement_msg := self._update_weekly_achievements(habit):
+            messages.append(achievement_msg)
 
-            if achievement_msg := self._update_weekly_achievements(habit):
-                messages.append(achievement_msg)
-
-            return "\n".join(messages)
+        return "\n".join(messages)
 
-        return None
-
-    def _update_goal_days(self, habit: dict) -> str | None:
+    def _update_goal_days(self, habit: DailyHabit) -> str | None:
         """
         Check if current daily streak matches any goal milestone and update it.
 
         Args:
-            habit (dict): Habit data dictionary.
+            habit (DailyHabit): Habit object.
 
         Returns:
             str | None: Congratulation message if a new goal was reached, else None.
         """
-        goal_map = {
-            1: GoalDaysHabit.ONE_WEEK,
-            7: GoalDaysHabit.THREE_WEEKS,
-            21: GoalDaysHabit.ONE_MONTH,
-            30: GoalDaysHabit.TWO_MONTHS,
-            60: GoalDaysHabit.SIX_MONTHS,
-            180: GoalDaysHabit.ONE_YEAR,
-        }
-        for days, goal in goal_map.items():
-            if habit["streak"] == days:
-                habit["current_goal_days"] = goal
-                return (
-                    f"Congratulations! You've reached your goal! "
-                    f"New target - {goal.value} days!"
-                )
-        return None
-
-    def _update_weekly_goal_days(self, habit: dict) -> str | None:
+        goal = self.milestones.daily_goals.at(habit.streak)
+        if goal is None:
+            return None
+        habit.current_goal_days = goal
+        return (
+            f"Congratulations! You've reached your goal! " f"New target - {goal} days!"
+        )
+
+    def _update_weekly_goal_days(self, habit: WeeklyHabit) -> str | None:
         """
         Check if current weekly streak matches any weekly goal milestone.
 
         Args:
-            habit (dict): Habit data dictionary.
+            habit (WeeklyHabit): Habit object.
 
         Returns:
             str | None: Congratulation message if a new goal was reached, else None.
         """
-        goal_map = {
-            1: GoalWeeklyHabit.ONE_MONTH,
-            4: GoalWeeklyHabit.TWO_MONTHS,
-            8: GoalWeeklyHabit.SIX_MONTHS,
-            45: GoalWeeklyHabit.ONE_YEAR,
-        }
-        for weeks, goal in goal_map.items():
-            if habit["weekly_streak"] == weeks:
-                habit["current_goal_weeks"] = goal
-                return (
-                    f"Congratulations! You've reached your goal! "
-                    f"New target - {goal.value} weeks!"
-                )
-        return None
-
-    def _update_achievements(self, habit: dict) -> str | None:
+        goal = self.milestones.weekly_goals.at(habit.weekly_streak)
+        if goal is None:
+            return None
+        habit.current_goal_weeks = goal
+        return (
+            f"Congratulations! You've reached your goal! " f"New target - {goal} weeks!"
+        )
+
+    def _update_achievements(self, habit: DailyHabit) -> str | None:
         """
         Check and award new daily achievements based on current streak.
 
         Args:
-            habit (dict): Habit data dictionary.
+            habit (DailyHabit): Habit object.
 
         Returns:
             str | None: Message about new achievement, or None if none awarded.
         """
-        achievement_map = {
-            1: AchievementHabit.ONE_DAY,
-            7: AchievementHabit.ONE_WEEK,
-            21: AchievementHabit.THREE_WEEKS,
-            30: AchievementHabit.ONE_MONTH,
-            60: AchievementHabit.TWO_MONTHS,
-            180: AchievementHabit.SIX_MONTHS,
-            365: AchievementHabit.ONE_YEAR,
-        }
-        for days, achievement in achievement_map.items():
-            if habit["streak"] == days:
-                if achievement in habit["achievement"]:
-                    return None
-                habit["achievement"].append(achievement.value)
-                return f"You have received a new achievement - {achievement.value}!"
-        return None
+        achievement = self.milestones.daily_achievements.at(habit.streak)
+        if achievement is None or achievement in habit.achievement:
+            return None
+        habit.achievement.append(achievement)
+        return f"You have received a new achievement - {achievement}!"
 
-    def _update_weekly_achievements(self, habit: dict) -> str | None:
+    def _update_weekly_achievements(self, habit: WeeklyHabit) -> str | None:
         """
         Check and award new weekly achievements based on current weekly streak.
 
         Args:
-            habit (dict): Habit data dictionary.
+            habit (WeeklyHabit): Habit object.
 
         Returns:
             str | None: Message about new weekly achievement, or None if none.
         """
-        achievement_map = {
-            1: AchievementWeeklyHabit.ONE_WEEK,
-            4: AchievementWeeklyHabit.ONE_MONTH,
-            8: AchievementWeeklyHabit.TWO_MONTHS,
-            45: AchievementWeeklyHabit.SIX_MONTHS,
-            91: AchievementWeeklyHabit.ONE_YEAR,
-        }
-        for days, achievement in achievement_map.items():
-            if habit["weekly_streak"] == days:
-                if achievement in habit["achievement"]:
-                    return None
-                habit["achievement"].append(achievement.value)
-                return (
-                    f"You have received a new weekly achievement - {achievement.value}!"
-                )
-        return None
+        achievement = self.milestones.weekly_achievements.at(habit.weekly_streak)
+        if achievement is None or achievement in habit.achievement:
+            return None
+        habit.achievement.append(achievement)
+        return f"You have received a new weekly achievement - {achievement}!"
 
+    @_retry_on_conflict
     def create_habit(
         self,
         type_habit: TypeHabit,
-        daily_schema: DailyHabitSchema,
+        daily_schema: "DailyHabitSchema",
     ) -> str:
         """
         Create a new daily habit.
@@ -302,14 +426,16 @@ class HabitService:
                 habit_description=daily_schema.habit_description,
                 category=daily_schema.category,
             )
-            self.habits_data.append(habit.to_dict())
-            self._save()
+            with self._mutation():
+                self.store.add(habit)
+                self._commit("create", habit)
         return f"Habit - '{daily_schema.habit_name.title()}' added!"
 
+    @_retry_on_conflict
     def create_weekly_habit(
         self,
         type_habit: TypeHabit,
-        weekly_schema: WeeklyHabitSchema,
+        weekly_schema: "WeeklyHabitSchema",
     ) -> str:
         """
         Create a new weekly habit.
@@ -329,10 +455,104 @@ class HabitService:
                 habit_description=weekly_schema.habit_description,
                 category=weekly_schema.category,
             )
-            self.habits_data.append(habit.to_dict())
-            self._save()
+            with self._mutation():
+                self.store.add(habit)
+                self._commit("create", habit)
         return f"Weekly habit - '{weekly_schema.habit_name.title()}' added!"
 
+    @_retry_on_conflict
+    def add_habits(
+        self, schemas: List["DailyHabitSchema | WeeklyHabitSchema"]
+    ) -> List[BaseHabit]:
+        """
+        Create habits of either type with a single write.
+
+        Args:
+            schemas (List[DailyHabitSchema | WeeklyHabitSchema]): Validated
+                habit input data; type_habit selects the habit class
+
+        Returns:
+            List[BaseHabit]: Created habits, in input order
+        """
+        self._reload()
+        habits = [
+            self._new_habit(habit_id, schema)
+            for schema, habit_id in zip(schemas, self._reserve_ids(len(schemas)))
+        ]
+        if habits:
+            self._commit_created(habits)
+        return habits
+
+    @staticmethod
+    def _new_habit(
+        habit_id: int, schema: "DailyHabitSchema | WeeklyHabitSchema"
+    ) -> BaseHabit:
+        """Build a daily or weekly habit from validated input."""
+        habit_class = (
+            WeeklyHabit if schema.type_habit == TypeHabit.WEEKLY else DailyHabit
+        )
+        return habit_class(
+            habit_id=habit_id,
+            habit_name=schema.habit_name,
+            habit_description=schema.habit_description,
+            category=schema.category,
+        )
+
+    @_retry_on_conflict
+    def import_habits(
+        self,
+        filename: str,
+        batch_size: int = 1000,
+        rejects_filename: str | None = None,
+    ) -> str:
+        """
+        Bulk-create habits from a CSV or JSON Lines file.
+
+        Rows are streamed and validated in batches, each batch gets a contiguous
+        block of IDs, and all created habits are persisted with one write.
+        Invalid rows are written to a rejects report (one JSON object per line)
+        instead of aborting the import. Habits only join the store once the
+        whole file was read, so a failed import leaves the store unchanged.
+
+        Args:
+            filename (str): Path of the CSV or JSON Lines file
+            batch_size (int): Number of rows validated per batch
+            rejects_filename (str | None): Rejects report path,
+                defaults to "<filename>.rejects.jsonl"
+
+        Returns:
+            str: Summary with imported and rejected row counts
+        """
+        from habit_service.importer import iter_batches, validate_batch
+
+        self._reload()
+        rejects_filename = rejects_filename or f"{filename}.rejects.jsonl"
+        created = []
+        rejected = 0
+        rejects_file = None
+        try:
+            for batch, parse_rejects in iter_batches(filename, batch_size):
+                schemas, rejects = validate_batch(batch) if batch else ([], [])
+                for schema, habit_id in zip(schemas, self._reserve_ids(len(schemas))):
+                    created.append(self._new_habit(habit_id, schema))
+
+                for reject in parse_rejects + rejects:
+                    if rejects_file is None:
+                        rejects_file = open(rejects_filename, "w", encoding="utf-8")
+                    rejects_file.write(json.dumps(reject, ensure_ascii=False) + "\n")
+                    rejected += 1
+        finally:
+            if rejects_file is not None:
+                rejects_file.close()
+
+        if created:
+            self._commit_created(created)
+        message = f"Imported {len(created)} habits, rejected {rejected} rows."
+        if rejected:
+            message += f" See {rejects_filename}"
+        return message
+
+    @_retry_on_conflict
     def delete_habit(self, habit_id: int) -> str:
         """
         Delete a habit by its ID.
@@ -344,22 +564,71 @@ class HabitService:
             str: Success message or "Habit not found!"
         """
         self._reload()
-        for i, habit in enumerate(self.habits_data):
-            if habit["habit_id"] == habit_id:
-                del self.habits_data[i]
-                self._save()
-                return f"Habit - {habit['habit_name']} removed!"
-        return "Habit not found!"
+        with self._mutation():
+            habit = self.store.remove(habit_id)
+            if habit is None:
+                return "Habit not found!"
+            self._commit("delete", habit)
+        return f"Habit - {habit.habit_name} removed!"
+
+    def delete_many(self, habit_ids: Iterable[int]) -> List[tuple[int, str]]:
+        """
+        Delete several habits with a single load and a single write.
+
+        Args:
+            habit_ids (Iterable[int]): IDs of the habits to delete
+
+        Returns:
+            List[tuple[int, str]]: (habit_id, message) for every requested ID, in order
+        """
+        habit_ids = list(habit_ids)
+        return [
+            (
+                habit_id,
+                (
+                    "Habit not found!"
+                    if habit is None
+                    else f"Habit - {habit.habit_name} removed!"
+                ),
+            )
+            for habit_id, habit in zip(habit_ids, self.remove_habits(habit_ids))
+        ]
+
+    @_retry_on_conflict
+    def remove_habits(self, habit_ids: Iterable[int]) -> List[BaseHabit | None]:
+        """
+        Delete several habits with a single write.
 
+        Args:
+            habit_ids (Iterable[int]): IDs of the habits to delete
+
+        Returns:
+            List[BaseHabit | None]: Removed habit for every requested ID, in
+                order, or None where no habit had that ID
+        """
+        self._reload()
+        with self._mutation():
+            removed = [self.store.remove(habit_id) for habit_id in habit_ids]
+            found = [habit for habit in removed if habit is not None]
+            if found:
+                self._commit_many("delete", found)
+        return removed
+
+    @_retry_on_conflict
     def delete_all_habits(self):
         """
         Delete all habits from storage.
 
         Returns:
-            str: Confirmation message from storage
+            str: Confirmation message
         """
-        return self.storage.clear()
+        self._reload()
+        with self._mutation():
+            self.store.clear()
+            self._commit("clear")
+        return "All Habits cleared!"
 
+    @_retry_on_conflict
     def complete_habit(self, habit_id: int) -> str:
         """
         Mark a habit as completed for today and update streak/goals/achievements.
@@ -371,20 +640,173 @@ class HabitService:
             str: Result message (streak info, achievements, errors, etc.)
         """
         self._reload()
-        for habit in self.habits_data:
-            if habit["type_habit"] == "daily":
-                if habit["habit_id"] == habit_id:
-                    habit["completed"] = True
-                    message = self._streak_increase(habit_id)
-                    self.storage.save(self.habits_data)
-                    return message
-            if habit["type_habit"] == "weekly":
-                if habit["habit_id"] == habit_id:
-                    habit["completed"] = True
-                    message = self._weekly_streak_increase(habit_id)
-                    self.storage.save(self.habits_data)
-                    return message
-        return "Habit not found!"
+        with self._mutation():
+            message, habit = self._complete(habit_id)
+            if habit is not None:
+                self._commit("complete", habit)
+        return message
+
+    @_retry_on_conflict
+    def complete_many(self, habit_ids: Iterable[int]) -> List[tuple[int, str]]:
+        """
+        Complete several habits with a single load and a single write.
+
+        IDs are processed in order, so a repeated ID sees the state left by
+        its earlier occurrence, exactly like repeated complete_habit calls.
+
+        Args:
+            habit_ids (Iterable[int]): IDs of the habits to complete
+
+        Returns:
+            List[tuple[int, str]]: (habit_id, message) for every requested ID, in order
+        """
+        self._reload()
+        results = []
+        completed = {}
+        with self._mutation():
+            for habit_id in habit_ids:
+                message, habit = self._complete(habit_id)
+                results.append((habit_id, message))
+                if habit is not None:
+                    completed[habit_id] = habit
+            if completed:
+                self._commit_many("complete", list(completed.values()))
+        return results
+
+    def _complete(self, habit_id: int) -> tuple[str, BaseHabit | None]:
+        """
+        Apply completion logic to one habit without persisting it.
+
+        Args:
+            habit_id (int): ID of the habit to complete
+
+        Returns:
+            tuple[str, BaseHabit | None]: Result message and the updated habit,
+                or None as habit if it was not found
+        """
+        habit = self.store.get(habit_id)
+        if habit is None:
+            return "Habit not found!", None
+        if habit.type_habit == "daily":
+            habit.completed = True
+            message = self._streak_increase(habit)
+        elif habit.type_habit == "weekly":
+            habit.completed = True
+            message = self._weekly_streak_increase(habit)
+        else:
+            return "Habit not found!", None
+        self.store.update(habit)
+        return message, habit
+
+    @_retry_on_conflict
+    def rollover(self, today: date | None = None, persist: bool = True) -> str:
+        """
+        Reset streaks whose deadline has passed, in one batched write.
+
+        Weekly habits past their deadline get weekly_streak 0; daily habits
+        that missed a whole day get streak 0. Expired habits are drained from
+        the store's deadline heap, so only they are touched.
+
+        Args:
+            today (date | None): Current date, defaults to today
+            persist (bool): Write the reset habits back; read-only callers
+                pass False to only correct the in-memory view
+
+        Returns:
+            str: Summary of the reset streaks
+        """
+        self._reload()
+        today = today or datetime.now().date()
+        expired = []
+        with self.commit_lock:
+            for habit_id in self.store.deadlines.pop_expired(today):
+                habit = self.store.get(habit_id)
+                if habit.type_habit == "weekly":
+                    habit.weekly_streak = 0
+                else:
+                    habit.streak = 0
+                habit.completed = False
+                expired.append(habit)
+            if expired and persist:
+                self._commit_many("update", expired)
+        weekly = sum(1 for habit in expired if habit.type_habit == "weekly")
+        return (
+            f"Rollover complete: {weekly} weekly and "
+            f"{len(expired) - weekly} daily streaks reset."
+        )
+
+    def due_habits(
+        self, days: int = 3, today: date | None = None
+    ) -> tuple[List[BaseHabit], List[BaseHabit]]:
+        """
+        Find weekly habits overdue or due soon and daily habits still open today.
+
+        Both lists come from bisection over the store's sorted date indexes.
+
+        Args:
+            days (int): Look-ahead window for weekly deadlines, in days
+            today (date | None): Current date, defaults to today
+
+        Returns:
+            tuple[List[BaseHabit], List[BaseHabit]]: Weekly habits whose deadline
+                passed or falls within the next ``days`` days (earliest first)
+                and daily habits not completed today (least recently completed
+                first)
+        """
+        self._reload()
+        today_ordinal = (today or datetime.now().date()).toordinal()
+        # Ordinal 0 marks a missing deadline, not an overdue one.
+        weekly = self.store.deadline_index.between(1, today_ordinal + days)
+        daily = self.store.last_completed_index.before(today_ordinal)
+        return (
+            [self.store.get(habit_id) for habit_id in weekly],
+            [self.store.get(habit_id) for habit_id in daily],
+        )
+
+    def show_due_soon(self, days: int = 3) -> str:
+        """
+        Return formatted lists of habits that need attention soon.
+
+        Args:
+            days (int): Look-ahead window for weekly deadlines, in days
+
+        Returns:
+            str: Weekly habits overdue or due within ``days`` days and daily
+                habits not completed today
+        """
+        today = datetime.now().date()
+        weekly, daily = self.due_habits(days, today)
+        if not weekly and not daily:
+            return "Nothing is due!"
+        result = f"Weekly habits overdue or due within {days} days:\n"
+        for habit in weekly:
+            overdue = " (overdue)" if habit.deadline < today.isoformat() else ""
+            result += (
+                f"ID: {habit.habit_id} | "
+                f"Name: {habit.habit_name.title()} | "
+                f"Deadline: {habit.deadline}{overdue} |\n"
+            )
+        result += "\nDaily habits not completed today:\n"
+        for habit in daily:
+            result += (
+                f"ID: {habit.habit_id} | "
+                f"Name: {habit.habit_name.title()} | "
+                f"Streak: {habit.streak} days |\n"
+            )
+        return result.rstrip()
+
+    def get_habit(self, habit_id: int) -> BaseHabit | None:
+        """
+        Return a single habit.
+
+        Args:
+            habit_id (int): ID of the habit
+
+        Returns:
+            BaseHabit | None: The habit, or None if not found
+        """
+        self._reload()
+        return self.store.get(habit_id)
 
     def show_habit(self, habit_id: int) -> str:
         """
@@ -397,65 +819,142 @@ class HabitService:
             str: Formatted habit info or "Habit not found!"
         """
         self._reload()
-        if not self.habits_data:
-            return f"Habits not found!"
+        if not self.store:
+            return "Habits not found!"
         result = "Habit:\n"
-        for habit in self.habits_data:
-            if habit["type_habit"] == "daily":
-                if habit["habit_id"] == habit_id:
-                    result += (
-                        f"\nID: {habit['habit_id']} | "
-                        f"Name: {habit['habit_name'].title()} | "
-                        f"Category: {habit['category'].title()} | "
-                        f"Streak: {habit['streak']} days | "
-                        f"Type: {habit['type_habit'].title()} | "
-                    )
-            if habit["type_habit"] == "weekly":
-                if habit["habit_id"] == habit_id:
-                    result += (
-                        f"\nID: {habit['habit_id']} | "
-                        f"Name: {habit['habit_name'].title()} | "
-                        f"Category: {habit['category'].title()} | "
-                        f"Streak: {habit['weekly_streak']} weeks | "
-                        f"Type: {habit['type_habit'].title()} | "
-                    )
+        habit = self.store.get(habit_id)
+        if habit is None:
+            return result
+        if habit.type_habit == "daily":
+            result += (
+                f"\nID: {habit.habit_id} | "
+                f"Name: {habit.habit_name.title()} | "
+                f"Category: {habit.category.title()} | "
+                f"Streak: {habit.streak} days | "
+                f"Type: {habit.type_habit.title()} | "
+            )
+        if habit.type_habit == "weekly":
+            result += (
+                f"\nID: {habit.habit_id} | "
+                f"Name: {habit.habit_name.title()} | "
+                f"Category: {habit.category.title()} | "
+                f"Streak: {habit.weekly_streak} weeks | "
+                f"Type: {habit.type_habit.title()} | "
+            )
         return result
 
-    def show_all_habits(self) -> str:
+    def iter_habits(
+        self,
+        offset: int = 0,
+        limit: int | None = None,
+        category: CategoryHabit | str | None = None,
+        type_habit: TypeHabit | str | None = None,
+    ) -> Iterator[BaseHabit]:
+        """
+        Stream habits grouped by category, in the order iter_all_habits renders them.
+
+        Args:
+            offset (int): Number of matching habits to skip
+            limit (int | None): Maximum number of habits to yield
+            category (CategoryHabit | str | None): Only yield this category
+            type_habit (TypeHabit | str | None): Only yield this habit type
+
+        Yields:
+            BaseHabit: Matching habits
+        """
+        self._reload()
+        categories = self.store.categories() if category is None else [category]
+        habits = (
+            habit
+            for cat in categories
+            for habit in self.store.iter_category(cat)
+            if type_habit is None or habit.type_habit == type_habit
+        )
+        stop = None if limit is None else offset + limit
+        yield from islice(habits, offset, stop)
+
+    def iter_all_habits(
+        self,
+        offset: int = 0,
+        limit: int | None = None,
+        category: CategoryHabit | str | None = None,
+        type_habit: TypeHabit | str | None = None,
+    ) -> Iterator[str]:
+        """
+        Stream habits grouped by category, one output line at a time.
+
+        Habits are read straight from the store's category buckets, so the
+        first line is produced immediately and memory stays bounded by a page.
+        A page that starts inside a category repeats its header.
+
+        Args:
+            offset (int): Number of matching habits to skip
+            limit (int | None): Maximum number of habits to render
+            category (CategoryHabit | str | None): Only render this category
+            type_habit (TypeHabit | str | None): Only render this habit type
+
+        Returns:
+            Iterator[str]: Output lines without trailing newlines
+        """
+        return self.render_habits(self.iter_habits(offset, limit, category, type_habit))
+
+    @staticmethod
+    def render_habits(habits: Iterable[BaseHabit]) -> Iterator[str]:
+        """
+        Render habits one output line at a time, with a header per category.
+
+        Consecutive habits of one category share a header, so a page that
+        starts inside a category repeats its header.
+
+        Args:
+            habits (Iterable[BaseHabit]): Habits in display order, e.g. from
+                iter_habits
+
+        Yields:
+            str: Output lines without trailing newlines
+        """
+        current = None
+        for habit in habits:
+            if habit.category != current:
+                if current is not None:
+                    yield ""
+                current = habit.category
+                yield f"Category: {current.title()}"
+            if habit.type_habit == "daily":
+                yield (
+                    f"ID: {habit.habit_id} | "
+                    f"Name: {habit.habit_name.title()} | "
+                    f"Streak: {habit.streak} days |"
+                    f" Type: {habit.type_habit.title()} |"
+                )
+            if habit.type_habit == "weekly":
+                yield (
+                    f"ID: {habit.habit_id} | "
+                    f"Name: {habit.habit_name.title()} | "
+                    f"Streak: {habit.weekly_streak} weeks |"
+                    f" Type: {habit.type_habit.title()} |"
+                )
+
+    def show_all_habits(
+        self,
+        offset: int = 0,
+        limit: int | None = None,
+        category: CategoryHabit | str | None = None,
+        type_habit: TypeHabit | str | None = None,
+    ) -> str:
         """
         Return formatted string with all habits grouped by category.
 
+        Args:
+            offset (int): Number of matching habits to skip
+            limit (int | None): Maximum number of habits to render
+            category (CategoryHabit | str | None): Only render this category
+            type_habit (TypeHabit | str | None): Only render this habit type
+
         Returns:
             str: Multi-line string with categorized habits
         """
-        self._reload()
-        category = {}
-        for habit in self.habits_data:
-            cat = habit["category"]
-            if cat not in category:
-                category[cat] = []
-            category[cat].append(habit)
-
-        result = ""
-        for cat, habits in category.items():
-            result += f"Category: {cat.title()}\n"
-            for habit in habits:
-                if habit["type_habit"] == "daily":
-                    result += (
-                        f"ID: {habit['habit_id']} | "
-                        f"Name: {habit['habit_name'].title()} | "
-                        f"Streak: {habit['streak']} days |"
-                        f" Type: {habit['type_habit'].title()} |\n"
-                    )
-                if habit["type_habit"] == "weekly":
-                    result += (
-                        f"ID: {habit['habit_id']} | "
-                        f"Name: {habit['habit_name'].title()} | "
-                        f"Streak: {habit['weekly_streak']} weeks |"
-                        f" Type: {habit['type_habit'].title()} |\n"
-                    )
-            result += "\n"
-        return result.rstrip()
+        return "\n".join(self.iter_all_habits(offset, limit, category, type_habit))
 
     def show_achievement(self, habit_id: int) -> str | None:
         """
@@ -468,31 +967,139 @@ class HabitService:
             str: List of achievements or error message
         """
         self._reload()
-        if not self.habits_data:
-            return f"Habits not found!"
+        if not self.store:
+            return "Habits not found!"
+        habit = self.store.get(habit_id)
+        if habit is None:
+            return "Achievement not found!"
         result = "Achievement:\n"
-        for habit in self.habits_data:
-            if habit["habit_id"] == habit_id:
-                for value in habit["achievement"]:
-                    result += f'"{value}"\n'
-                return result
-        return "Achievement not found!"
+        for value in habit.achievement:
+            result += f'"{value}"\n'
+        return result
+
+    def iter_all_achievements(
+        self, offset: int = 0, limit: int | None = None
+    ) -> Iterator[str]:
+        """
+        Stream all achievements earned across all habits, one line at a time.
+
+        Args:
+            offset (int): Number of achievements to skip
+            limit (int | None): Maximum number of achievements to render
 
-    def show_all_achievements(self):
+        Yields:
+            str: Output lines without trailing newlines
+        """
+        self._reload()
+        if not self.store:
+            yield "Habits not found!"
+            return
+        yield "All achievements:"
+        yield ""
+        achievements = (
+            element for habit in self.store for element in habit.achievement
+        )
+        stop = None if limit is None else offset + limit
+        for element in islice(achievements, offset, stop):
+            yield f'"{element}"'
+
+    def show_all_achievements(self, offset: int = 0, limit: int | None = None) -> str:
         """
         Return a list of all achievements earned across all habits.
 
+        Args:
+            offset (int): Number of achievements to skip
+            limit (int | None): Maximum number of achievements to render
+
         Returns:
             str: Formatted string with all unique achievements
         """
+        return "\n".join(self.iter_all_achievements(offset, limit))
+
+    def analytics(self, today: date | None = None) -> "HabitAnalytics":
+        """
+        Compute vectorized statistics over all habits.
+
+        Args:
+            today (date | None): Reference date, defaults to today
+
+        Returns:
+            HabitAnalytics: Per-habit streaks and completion rates
+
+        Raises:
+            RuntimeError: If NumPy is not installed
+        """
+        try:
+            from habit_service.analytics import HabitAnalytics
+        except ImportError:
+            raise RuntimeError("Statistics require NumPy to be installed!")
         self._reload()
-        if not self.habits_data:
-            return f"Habits not found!"
-        result = "All achievements:\n"
-        achievement = []
-        for habit in self.habits_data:
-            if habit.get("achievement"):
-                achievement.extend(habit.get("achievement"))
-        for element in achievement:
-            result += f'\n"{element}"'
-        return result
\ No newline at end of file
+        return HabitAnalytics(self.store, today=today)
+
+    def show_habit_statistics(self, habit_id: int) -> str:
+        """
+        Return streaks and completion rates of a single habit.
+
+        Args:
+            habit_id (int): ID of the habit
+
+        Returns:
+            str: Formatted statistics or error message
+        """
+        self._reload()
+        habit = self.store.get(habit_id)
+        if habit is None:
+            return "Habit not found!"
+        # One history needs no vectorizing; analytics() is for the whole population.
+        today = datetime.now().date()
+        weekly = habit.type_habit == "weekly"
+        current, longest = habit.history.streaks(today, gap=7 if weekly else 1)
+        rates = {
+            window: min(
+                habit.history.days_between(today - timedelta(days=window - 1), today)
+                / (window / 7 if weekly else window),
+                1.0,
+            )
+            for window in RATE_WINDOWS
+        }
+        unit = "weeks" if weekly else "days"
+        return (
+            f"Statistics:\n"
+            f"\nID: {habit_id} | "
+            f"Name: {habit.habit_name.title()} | "
+            f"Current streak: {current} {unit} | "
+            f"Longest streak: {longest} {unit} | " + self._format_rates(rates)
+        )
+
+    def show_statistics(self) -> str:
+        """
+        Return completion statistics aggregated per category and habit type.
+
+        Returns:
+            str: Multi-line statistics report
+        """
+        self._reload()
+        if not self.store:
+            return "Habits not found!"
+        try:
+            analytics = self.analytics()
+        except RuntimeError as e:
+            return str(e)
+        lines = []
+        for title, by in (("category", "category"), ("type", "type_habit")):
+            lines.append(f"Statistics by {title}:")
+            for name, stats in analytics.group_stats(by).items():
+                lines.append(
+                    f"{name.title()} | "
+                    f"Habits: {stats['habits']} | "
+                    f"Avg streak: {stats['mean_current_streak']:.1f} | "
+                    f"Best streak: {stats['longest_streak']} | "
+                    + self._format_rates(stats["completion_rate"])
+                )
+            lines.append("")
+        return "\n".join(lines).rstrip()
+
+    @staticmethod
+    def _format_rates(rates: Dict[int, float]) -> str:
+        """Format completion rates as '7d: 43% | 30d: 10% |'."""
+        return " ".join(f"{window}d: {rate:.0%} |" for window, rate in rates.items())
@@ -0,0 +1,183 @@
+from datetime import date
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from habit_service.milestones import DEFAULT_MILESTONES, MilestoneEngine
+from habit_service.service import HabitService
+from habit_storage.columnar import write_columnar
+from habit_storage.sharded import ShardedStorage
+
+
+def _rollover_user(today: date | None, storage_factory: Callable, filename: str) -> str:
+    """Run the streak rollover for one user's storage (pool worker)."""
+    return HabitService(storage_factory(filename)).rollover(today)
+
+
+def _group_stats_user(
+    today: date | None, storage_factory: Callable, filename: str
+) -> Dict[str, Dict]:
+    """Compute per-category and per-type statistics of one user (pool worker)."""
+    service = HabitService(storage_factory(filename))
+    if not service.store:
+        return {"category": {}, "type_habit": {}}
+    analytics = service.analytics(today)
+    return {by: analytics.group_stats(by) for by in ("category", "type_habit")}
+
+
+def _export_user(directory: str, storage_factory: Callable, filename: str) -> int:
+    """Export one user's habits to a columnar snapshot (pool worker)."""
+    target = Path(directory) / (Path(filename).stem + ".col")
+    return write_columnar(str(target), storage_factory(filename).load())
+
+
+def merge_group_stats(parts: List[Dict[str, Dict]]) -> Dict[str, Dict]:
+    """
+    Combine HabitAnalytics.group_stats results of several users.
+
+    Means are weighted by the number of habits in each part.
+
+    Args:
+        parts (List[Dict[str, Dict]]): group_stats results
+
+    Returns:
+        Dict[str, Dict]: Statistics in the same shape, over all parts
+    """
+    merged: Dict[str, Dict] = {}
+    for part in parts:
+        for name, stats in part.items():
+            total = merged.setdefault(
+                name,
+                {
+                    "habits": 0,
+                    "mean_current_streak": 0.0,
+                    "longest_streak": 0,
+                    "completion_rate": {},
+                },
+            )
+            count = stats["habits"]
+            total["habits"] += count
+            total["mean_current_streak"] += stats["mean_current_streak"] * count
+            total["longest_streak"] = max(
+                total["longest_streak"], stats["longest_streak"]
+            )
+            for window, rate in stats["completion_rate"].items():
+                total["completion_rate"][window] = (
+                    total["completion_rate"].get(window, 0.0) + rate * count
+                )
+    for total in merged.values():
+        count = max(total["habits"], 1)
+        total["mean_current_streak"] /= count
+        for window in total["completion_rate"]:
+            total["completion_rate"][window] /= count
+    return merged
+
+
+class ShardedHabitService:
+    """
+    Habit services for many users on top of a ShardedStorage.
+
+    Per-user operations go through ``for_user``, which only touches that
+    user's shard. Administrative scans fan out over all users with a thread
+    pool, or a process pool for CPU-bound work.
+    """
+
+    def __init__(
+        self,
+        storage: ShardedStorage,
+        milestones: MilestoneEngine = DEFAULT_MILESTONES,
+    ) -> None:
+        """
+        Initialize the sharded service.
+
+        Args:
+            storage (ShardedStorage): Sharded storage of all users
+            milestones (MilestoneEngine): Goal and achievement ladders
+        """
+        self.storage = storage
+        self.milestones = milestones
+        self._services: Dict[str, HabitService] = {}
+
+    def for_user(self, user_id: str) -> HabitService:
+        """
+        Return the (cached) service of one user.
+
+        Args:
+            user_id (str): User ID
+
+        Returns:
+            HabitService: Service bound to the user's storage and shard ID sequence
+        """
+        service = self._services.get(user_id)
+        if service is None:
+            service = self._services[user_id] = HabitService(
+                self.storage.storage(user_id),
+                self.milestones,
+                id_sequence=self.storage.sequence(user_id),
+            )
+        return service
+
+    def rollover(
+        self,
+        today: date | None = None,
+        workers: int | None = None,
+        processes: bool = False,
+    ) -> Dict[str, str]:
+        """
+        Reset expired streaks of every user.
+
+        Args:
+            today (date | None): Reference date, defaults to today
+            workers (int | None): Pool size
+            processes (bool): Use a process pool
+
+        Returns:
+            Dict[str, str]: Rollover summary per user
+        """
+        return self.storage.map(partial(_rollover_user, today), workers, processes)
+
+    def statistics(
+        self,
+        today: date | None = None,
+        workers: int | None = None,
+        processes: bool = False,
+    ) -> Dict[str, Dict]:
+        """
+        Compute statistics per category and per habit type over all users.
+
+        Args:
+            today (date | None): Reference date, defaults to today
+            workers (int | None): Pool size
+            processes (bool): Use a process pool
+
+        Returns:
+            Dict[str, Dict]: {"category": ..., "type_habit": ...} in the shape
+                of HabitAnalytics.group_stats
+        """
+        parts = self.storage.map(
+            partial(_group_stats_user, today), workers, processes
+        ).values()
+        return {
+            by: merge_group_stats([part[by] for part in parts])
+            for by in ("category", "type_habit")
+        }
+
+    def export_columnar(
+        self,
+        directory: str,
+        workers: int | None = None,
+        processes: bool = False,
+    ) -> Dict[str, int]:
+        """
+        Export every user's habits to ``<directory>/<user>.col``.
+
+        Args:
+            directory (str): Target directory, created if missing
+            workers (int | None): Pool size
+            processes (bool): Use a process pool
+
+        Returns:
+            Dict[str, int]: Number of exported habits per user
+        """
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        return self.storage.map(partial(_export_user, directory), workers, processes)
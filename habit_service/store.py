@@ -0,0 +1,271 @@
+from enum import Enum
+from typing import Dict, Iterable, Iterator, List
+
+from habit_service.date_index import DateIndex, date_ordinal
+from habit_service.scheduler import DeadlineQueue
+from models.base import BaseHabit
+
+
+def index_key(value) -> str:
+    """
+    Normalize an enum member or raw string to a plain index key.
+
+    Habits created in this process carry enum members while habits loaded
+    from storage carry their string values; both must land in the same bucket.
+
+    Args:
+        value: Enum member or plain value
+
+    Returns:
+        str: Plain value usable as a dictionary key
+    """
+    return value.value if isinstance(value, Enum) else value
+
+
+class HabitStore:
+    """In-memory habit store indexed by ID, category, habit type and expiry."""
+
+    def __init__(self, habits: Iterable[BaseHabit] | None = None) -> None:
+        """
+        Build the store and its indexes from habit objects.
+
+        Args:
+            habits (Iterable[BaseHabit] | None): Habits loaded from storage
+        """
+        self._by_id: Dict[int, BaseHabit] = {}
+        self._by_category: Dict[str, Dict[int, BaseHabit]] = {}
+        self._by_type: Dict[str, Dict[int, BaseHabit]] = {}
+        self._keys: Dict[int, tuple[str, str]] = {}
+        self._max_id = 0
+        self._max_id_stale = False
+        self.deadlines = DeadlineQueue()
+        self.deadline_index = DateIndex()
+        self.last_completed_index = DateIndex()
+        for habit in habits or []:
+            self.add(habit)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[BaseHabit]:
+        return iter(self._by_id.values())
+
+    def __contains__(self, habit_id: int) -> bool:
+        return habit_id in self._by_id
+
+    def get(self, habit_id: int) -> BaseHabit | None:
+        """
+        Return the habit with the given ID.
+
+        Args:
+            habit_id (int): ID of the habit
+
+        Returns:
+            BaseHabit | None: Habit object, or None if not found
+        """
+        return self._by_id.get(habit_id)
+
+    def add(self, habit: BaseHabit) -> None:
+        """
+        Insert a habit, replacing any habit with the same ID.
+
+        Args:
+            habit (BaseHabit): Habit object
+        """
+        habit_id = habit.habit_id
+        if habit_id in self._by_id:
+            self._unindex(habit_id)
+        self._by_id[habit_id] = habit
+        self._index(habit)
+        self._index_dates(habit)
+        if habit_id > self._max_id:
+            self._max_id = habit_id
+
+    def update(self, habit: BaseHabit) -> None:
+        """
+        Re-index a habit after it was modified in place.
+
+        Only the secondary indexes whose key actually changed are touched;
+        the habit's expiry and date index entries are refreshed.
+
+        Args:
+            habit (BaseHabit): Habit object already present in the store
+        """
+        habit_id = habit.habit_id
+        if habit_id not in self._by_id:
+            self.add(habit)
+            return
+        self._by_id[habit_id] = habit
+        keys = (index_key(habit.category), index_key(habit.type_habit))
+        if self._keys[habit_id] != keys:
+            self._unindex(habit_id)
+            self._index(habit)
+        self._index_dates(habit)
+
+    def remove(self, habit_id: int) -> BaseHabit | None:
+        """
+        Remove a habit from the store and all indexes.
+
+        Args:
+            habit_id (int): ID of the habit to remove
+
+        Returns:
+            BaseHabit | None: Removed habit, or None if not found
+        """
+        habit = self._by_id.pop(habit_id, None)
+        if habit is None:
+            return None
+        self._unindex(habit_id)
+        self.deadlines.cancel(habit_id)
+        self.deadline_index.discard(habit_id)
+        self.last_completed_index.discard(habit_id)
+        if habit_id == self._max_id:
+            self._max_id_stale = True
+        return habit
+
+    def clear(self) -> None:
+        """Remove all habits from the store."""
+        self._by_id.clear()
+        self._by_category.clear()
+        self._by_type.clear()
+        self._keys.clear()
+        self.deadlines.clear()
+        self.deadline_index.clear()
+        self.last_completed_index.clear()
+        self._max_id = 0
+        self._max_id_stale = False
+
+    def by_category(self, category) -> List[BaseHabit]:
+        """
+        Return habits of one category in insertion order.
+
+        Args:
+            category (CategoryHabit | str): Category to look up
+
+        Returns:
+            List[BaseHabit]: Matching habits
+        """
+        return list(self._by_category.get(index_key(category), {}).values())
+
+    def iter_category(self, category) -> Iterator[BaseHabit]:
+        """
+        Iterate over habits of one category without copying the bucket.
+
+        Args:
+            category (CategoryHabit | str): Category to look up
+
+        Returns:
+            Iterator[BaseHabit]: Matching habits in insertion order
+        """
+        return iter(self._by_category.get(index_key(category), {}).values())
+
+    def by_type(self, type_habit) -> List[BaseHabit]:
+        """
+        Return habits of one type in insertion order.
+
+        Args:
+            type_habit (TypeHabit | str): Habit type to look up
+
+        Returns:
+            List[BaseHabit]: Matching habits
+        """
+        return list(self._by_type.get(index_key(type_habit), {}).values())
+
+    def categories(self) -> List[str]:
+        """
+        Return categories that currently hold habits, in first-seen order.
+
+        Returns:
+            List[str]: Category values
+        """
+        return list(self._by_category)
+
+    @property
+    def max_id(self) -> int:
+        """
+        Return the highest habit ID added since loading, without a scan.
+
+        After removals this is an upper bound of the remaining IDs.
+
+        Returns:
+            int: Highest ID, 0 for an empty store
+        """
+        return self._max_id
+
+    def next_id(self) -> int:
+        """
+        Return the next free habit ID (max existing ID + 1).
+
+        Returns:
+            int: Next habit ID, 1 for an empty store
+        """
+        if self._max_id_stale:
+            self._max_id = max(self._by_id, default=0)
+            self._max_id_stale = False
+        return self._max_id + 1
+
+    def reserve_ids(self, count: int) -> range:
+        """
+        Reserve a contiguous block of habit IDs.
+
+        Args:
+            count (int): Number of IDs to reserve
+
+        Returns:
+            range: Reserved IDs; next_id continues after the block
+        """
+        start = self.next_id()
+        self._max_id = start + count - 1
+        return range(start, start + count)
+
+    def to_list(self) -> List[BaseHabit]:
+        """
+        Return all habits as a list.
+
+        Returns:
+            List[BaseHabit]: Habit objects in insertion order
+        """
+        return list(self._by_id.values())
+
+    def to_records(self) -> List[Dict]:
+        """
+        Return all habits as dictionaries suitable for storage.
+
+        Returns:
+            List[Dict]: Habit dictionaries in insertion order
+        """
+        return [habit.to_dict() for habit in self._by_id.values()]
+
+    def _index(self, habit: BaseHabit) -> None:
+        """Add a habit to the secondary indexes."""
+        habit_id = habit.habit_id
+        category = index_key(habit.category)
+        type_habit = index_key(habit.type_habit)
+        self._by_category.setdefault(category, {})[habit_id] = habit
+        self._by_type.setdefault(type_habit, {})[habit_id] = habit
+        self._keys[habit_id] = (category, type_habit)
+
+    def _index_dates(self, habit: BaseHabit) -> None:
+        """
+        Refresh the expiry heap and the date indexes for one habit.
+
+        Weekly habits are indexed by deadline, daily habits by last_completed
+        (never-completed habits sort first with ordinal 0).
+        """
+        habit_id = habit.habit_id
+        self.deadlines.schedule(habit)
+        if habit.type_habit == "weekly":
+            self.deadline_index.set(habit_id, date_ordinal(habit.deadline))
+            self.last_completed_index.discard(habit_id)
+        else:
+            self.last_completed_index.set(habit_id, date_ordinal(habit.last_completed))
+            self.deadline_index.discard(habit_id)
+
+    def _unindex(self, habit_id: int) -> None:
+        """Drop a habit from the secondary indexes, removing empty buckets."""
+        category, type_habit = self._keys.pop(habit_id)
+        for index, key in ((self._by_category, category), (self._by_type, type_habit)):
+            bucket = index[key]
+            del bucket[habit_id]
+            if not bucket:
+                del index[key]
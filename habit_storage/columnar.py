@@ -0,0 +1,342 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import date
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List
+
+from models.history import CompletionHistory, history_from_record
+
+MAGIC = b"HABC"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQ")
+SECTION = struct.Struct("<QQ")
+ALIGNMENT = 8
+
+TYPES = ("daily", "weekly")
+
+# Fixed-width columns: (name, array typecode).
+NUMERIC_COLUMNS = (
+    ("habit_id", "q"),
+    ("created_at", "i"),
+    ("last_completed", "i"),
+    ("deadline", "i"),
+    ("streak", "i"),
+    ("goal", "i"),
+    ("type_code", "B"),
+    ("category_code", "B"),
+    ("completed", "B"),
+)
+# Variable-width columns, each stored as offsets plus a UTF-8/bytes blob.
+STRING_COLUMNS = ("habit_name", "habit_description", "achievement", "history")
+ACHIEVEMENT_SEPARATOR = "\x1f"
+
+
+def _plain(value):
+    """Return the raw value of an enum member."""
+    return value.value if isinstance(value, Enum) else value
+
+
+def _ordinal(value: str | None) -> int:
+    """Convert an ISO date to an ordinal, 0 for a missing date."""
+    return date.fromisoformat(value).toordinal() if value else 0
+
+
+def _iso(ordinal: int) -> str | None:
+    """Convert an ordinal back to an ISO date, None for 0."""
+    return date.fromordinal(ordinal).isoformat() if ordinal else None
+
+
+def _little_endian(values: array) -> bytes:
+    """Return the array's bytes in little-endian order."""
+    if sys.byteorder == "big" and values.itemsize > 1:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def write_columnar(filename: str, habits: List[Dict]) -> int:
+    """
+    Write habits to a binary columnar snapshot.
+
+    The file holds a header, a section directory and 8-byte aligned sections:
+    one little-endian array per fixed-width column, an offsets array plus a
+    data blob per variable-width column, and the category table. Dates are
+    stored as ordinals (0 for missing), daily and weekly streaks and goals
+    share the ``streak`` and ``goal`` columns. The file is written to a
+    temporary path and swapped in.
+
+    Args:
+        filename (str): Target path
+        habits (List[Dict]): Habit dictionaries
+
+    Returns:
+        int: Number of habits written
+    """
+    categories: Dict[str, int] = {}
+    numeric = {name: array(typecode) for name, typecode in NUMERIC_COLUMNS}
+    strings = {name: [] for name in STRING_COLUMNS}
+
+    for habit in habits:
+        weekly = _plain(habit["type_habit"]) == "weekly"
+        category = _plain(habit["category"])
+        numeric["habit_id"].append(habit["habit_id"])
+        numeric["created_at"].append(_ordinal(habit.get("created_at")))
+        numeric["last_completed"].append(_ordinal(habit.get("last_completed")))
+        numeric["deadline"].append(_ordinal(habit.get("deadline")) if weekly else 0)
+        numeric["streak"].append(
+            habit.get("weekly_streak" if weekly else "streak") or 0
+        )
+        numeric["goal"].append(
+            _plain(habit.get("current_goal_weeks" if weekly else "current_goal_days"))
+            or 0
+        )
+        numeric["type_code"].append(int(weekly))
+        numeric["category_code"].append(
+            categories.setdefault(category, len(categories))
+        )
+        numeric["completed"].append(bool(habit.get("completed")))
+        strings["habit_name"].append(habit["habit_name"].encode("utf-8"))
+        strings["habit_description"].append(habit["habit_description"].encode("utf-8"))
+        strings["achievement"].append(
+            ACHIEVEMENT_SEPARATOR.join(
+                _plain(value) for value in habit.get("achievement") or []
+            ).encode("utf-8")
+        )
+        strings["history"].append(history_from_record(habit).to_bytes())
+
+    sections = [_little_endian(numeric[name]) for name, _ in NUMERIC_COLUMNS]
+    for name in STRING_COLUMNS:
+        offsets = array("Q", [0])
+        for value in strings[name]:
+            offsets.append(offsets[-1] + len(value))
+        sections.append(_little_endian(offsets))
+        sections.append(b"".join(strings[name]))
+    sections.append("\n".join(categories).encode("utf-8"))
+
+    directory_end = HEADER.size + SECTION.size * len(sections)
+    position = directory_end
+    directory = []
+    for data in sections:
+        position += -position % ALIGNMENT
+        directory.append(SECTION.pack(position, len(data)))
+        position += len(data)
+
+    path = Path(filename)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(sections), len(numeric["habit_id"])))
+        f.write(b"".join(directory))
+        for data in sections:
+            f.write(b"\0" * (-f.tell() % ALIGNMENT))
+            f.write(data)
+    os.replace(tmp, path)
+    return len(numeric["habit_id"])
+
+
+class ColumnarSnapshot:
+    """
+    Read-only, memory-mapped view of a columnar habit snapshot.
+
+    Fixed-width columns are exposed zero-copy as ``memoryview`` casts or
+    NumPy arrays over the mapping. Views must be released before ``close``.
+    """
+
+    def __init__(self, filename: str) -> None:
+        """
+        Map the snapshot file and read its section directory.
+
+        Args:
+            filename (str): Snapshot path
+
+        Raises:
+            ValueError: If the file is not a columnar habit snapshot
+        """
+        self.filename = filename
+        with open(filename, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, section_count, count = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"{filename} is not a columnar habit snapshot")
+        self.count = count
+        self._sections = [
+            SECTION.unpack_from(self._mmap, HEADER.size + SECTION.size * i)
+            for i in range(section_count)
+        ]
+        self._numeric = {
+            name: (i, typecode) for i, (name, typecode) in enumerate(NUMERIC_COLUMNS)
+        }
+        self._strings = {
+            name: len(NUMERIC_COLUMNS) + 2 * i for i, name in enumerate(STRING_COLUMNS)
+        }
+        categories = self._bytes(len(self._sections) - 1).decode("utf-8")
+        self.categories = categories.split("\n") if categories else []
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self) -> "ColumnarSnapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._mmap.close()
+
+    def column(self, name: str) -> memoryview:
+        """
+        Return a fixed-width column as a zero-copy memoryview.
+
+        Args:
+            name (str): Column name from NUMERIC_COLUMNS
+
+        Returns:
+            memoryview: View cast to the column's typecode (a byteswapped copy
+                on big-endian hosts)
+        """
+        index, typecode = self._numeric[name]
+        view = self._section(index)
+        if sys.byteorder == "big" and typecode != "B":
+            values = array(typecode, view.tobytes())
+            view.release()
+            values.byteswap()
+            return memoryview(values)
+        return view.cast(typecode)
+
+    def array(self, name: str):
+        """
+        Return a fixed-width column as a read-only NumPy array over the mapping.
+
+        Args:
+            name (str): Column name from NUMERIC_COLUMNS
+
+        Returns:
+            numpy.ndarray: Column values
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        # Imported here: NumPy is only needed for array views and costs more
+        # to import than opening a snapshot.
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("NumPy is required for array views") from None
+        index, typecode = self._numeric[name]
+        offset, length = self._sections[index]
+        dtype = np.dtype(typecode).newbyteorder("<")
+        return np.frombuffer(
+            self._mmap, dtype=dtype, count=length // dtype.itemsize, offset=offset
+        )
+
+    def strings(self, name: str) -> List[str] | List[bytes]:
+        """
+        Decode a whole variable-width column.
+
+        Args:
+            name (str): Column name from STRING_COLUMNS
+
+        Returns:
+            List[str] | List[bytes]: Values in row order; the history column
+                is returned as packed bytes
+        """
+        index = self._strings[name]
+        offsets = self._offsets(index)
+        data = self._bytes(index + 1)
+        raw = [data[offsets[i] : offsets[i + 1]] for i in range(self.count)]
+        if name == "history":
+            return raw
+        return [value.decode("utf-8") for value in raw]
+
+    def records(self) -> List[Dict]:
+        """
+        Rebuild habit dictionaries in the same shape as HabitJsonStorage.load.
+
+        Returns:
+            List[Dict]: Habit dictionaries
+        """
+        columns = {}
+        for name, _ in NUMERIC_COLUMNS:
+            with self.column(name) as view:
+                columns[name] = view.tolist()
+        # Dates repeat heavily across habits, so each ordinal is converted once.
+        dates = {0: None}
+        for name in ("created_at", "last_completed", "deadline"):
+            columns[name] = [
+                dates[value] if value in dates else dates.setdefault(value, _iso(value))
+                for value in columns[name]
+            ]
+        categories = self.categories
+        histories = [
+            CompletionHistory.from_bytes(data) for data in self.strings("history")
+        ]
+
+        habits = []
+        for (
+            habit_id,
+            created_at,
+            last_completed,
+            deadline,
+            streak,
+            goal,
+            type_code,
+            category_code,
+            completed,
+            habit_name,
+            habit_description,
+            achievement,
+            history,
+        ) in zip(
+            *(columns[name] for name, _ in NUMERIC_COLUMNS),
+            self.strings("habit_name"),
+            self.strings("habit_description"),
+            self.strings("achievement"),
+            histories,
+        ):
+            habit = {
+                "habit_id": habit_id,
+                "created_at": created_at,
+                "habit_name": habit_name,
+                "habit_description": habit_description,
+                "category": categories[category_code],
+                "type_habit": TYPES[type_code],
+                "completed": bool(completed),
+            }
+            if type_code:
+                habit["weekly_streak"] = streak
+                habit["current_goal_weeks"] = goal
+                habit["last_completed"] = last_completed
+                habit["deadline"] = deadline
+            else:
+                habit["streak"] = streak
+                habit["current_goal_days"] = goal
+                habit["last_completed"] = last_completed
+            habit["achievement"] = (
+                achievement.split(ACHIEVEMENT_SEPARATOR) if achievement else []
+            )
+            habit["history"] = history
+            habits.append(habit)
+        return habits
+
+    def _section(self, index: int) -> memoryview:
+        """Return a zero-copy view of one section."""
+        offset, length = self._sections[index]
+        return memoryview(self._mmap)[offset : offset + length]
+
+    def _bytes(self, index: int) -> bytes:
+        """Return a copy of one section."""
+        offset, length = self._sections[index]
+        return self._mmap[offset : offset + length]
+
+    def _offsets(self, index: int) -> List[int]:
+        """Return the offsets array of a variable-width column."""
+        offsets = array("Q", self._bytes(index))
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        return offsets.tolist()
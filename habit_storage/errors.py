@@ -0,0 +1,6 @@
+class StorageError(Exception):
+    """Raised when stored habit data cannot be read."""
+
+
+class StorageConflictError(StorageError):
+    """Raised when another process wrote since the caller loaded its data."""
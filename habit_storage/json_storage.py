@@ -1,39 +1,269 @@
 import json
+import os
+import struct
+from contextlib import contextmanager
 from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterator, List
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+from habit_storage.columnar import ColumnarSnapshot, write_columnar
+from habit_storage.errors import StorageConflictError, StorageError
+from models.history import CompletionHistory, history_from_record
+
+VERSION = struct.Struct("<Q")
+
+
+def _encode(value):
+    """JSON fallback that stores completion histories as flat run lists."""
+    if isinstance(value, CompletionHistory):
+        return value.to_list()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
 
 
 class HabitJsonStorage:
-    """JSON file-based storage for habits."""
+    """
+    JSON file-based storage for habits.
+
+    Safe to share between processes: every write replaces the file atomically
+    while holding an exclusive ``fcntl`` lock on ``<file>.lock``, and bumps a
+    version counter kept in that lock file. Writers pass the version they
+    loaded to ``commit``/``commit_many`` and get a StorageConflictError if
+    another process wrote in between.
+    """
+
+    def __init__(
+        self,
+        filename="habits.json",
+        journal: bool = False,
+        compact_threshold: int = 1000,
+    ) -> None:
+        """
+        Initialize the storage.
 
-    def __init__(self, filename="habits.json") -> None:
+        Args:
+            filename (str): Path of the JSON snapshot file
+            journal (bool): Append mutations to a log instead of rewriting the snapshot
+            compact_threshold (int): Number of log records that triggers compaction
+        """
         self.filename = filename
         self.file = Path(filename)
+        self.journal = journal
+        self.journal_file = self.file.with_name(self.file.name + ".log")
+        self.lock_file = self.file.with_name(self.file.name + ".lock")
+        self.sequence_file = self.file.with_name(self.file.name + ".seq")
+        self.compact_threshold = compact_threshold
+        self._journal_records = 0
+        self._cache: List[Dict] | None = None
+        self._cache_key: tuple | None = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
 
     def load(self):
         """
         Load habits from JSON file.
 
+        In journal mode the log is replayed on top of the snapshot. The parsed
+        list is cached and returned as-is while the files keep the same
+        (mtime_ns, size, inode) identity, so the result is shared between
+        callers and must not be changed in place; habit_from_dict copies the
+        mutable fields it takes over.
+
         Returns:
             List[Dict]: List of habit dictionaries. Returns empty list if file missing.
+
+        Raises:
+            StorageError: If the file does not contain valid JSON
         """
         if not self.file.exists():
-            self.save([])
+            with self._locked():
+                if not self.file.exists():
+                    self._write(self.file, [])
+
+        key = self.revision()
+        if key == self._cache_key:
+            self.cache_hits += 1
+            return self._cache
+        self.cache_misses += 1
+
+        with self._locked(shared=True):
+            try:
+                with open(self.file, "r", encoding="utf-8") as f:
+                    habits = json.load(f)
+                    self.bytes_read += os.fstat(f.fileno()).st_size
+            except json.JSONDecodeError as e:
+                raise StorageError(f"Failed to load {self.filename}: {e}") from e
+            if self.journal:
+                habits = self._replay(habits)
+        for habit in habits:
+            habit["history"] = history_from_record(habit)
+        self._cache, self._cache_key = habits, key
+        return habits
 
+    def revision(self) -> tuple | None:
+        """
+        Return a change token for the stored data.
+
+        Returns:
+            tuple | None: (mtime_ns, size, inode) of the snapshot, followed by
+                the log's identity in journal mode; None if the snapshot is missing.
+        """
+        key = self._file_key(self.file)
+        if key is None or not self.journal:
+            return key
+        return key + (self._file_key(self.journal_file),)
+
+    def version(self) -> int:
+        """
+        Return the write counter shared by all processes using this file.
+
+        Read without locking: a version read before loading is never newer
+        than the loaded data, so a stale value can only cause a spurious
+        conflict, never a lost update.
+
+        Returns:
+            int: Number of writes made through HabitJsonStorage, 0 if none
+        """
         try:
-            with open(self.file, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except json.JSONDecodeError as e:
-            print(f"Failed to load {self.filename}: {e}")
+            with open(self.lock_file, "rb") as f:
+                data = f.read(VERSION.size)
+        except FileNotFoundError:
+            return 0
+        return VERSION.unpack(data)[0] if len(data) == VERSION.size else 0
 
-    def save(self, habit):
+    def save(self, habit) -> int:
         """
         Save habits list to JSON file.
 
+        In journal mode this writes a fresh snapshot and truncates the log.
+
         Args:
             habits (List[Dict]): Habits data to persist
+
+        Returns:
+            int: New version
+        """
+        with self._locked() as fd:
+            if self.journal:
+                self._compact(habit)
+            else:
+                self._save(habit)
+            return self._bump_version(fd)
+
+    def commit(
+        self,
+        op: str,
+        habit: Dict | None,
+        snapshot: Callable[[], List[Dict]],
+        expected: int | None = None,
+    ) -> int:
+        """
+        Persist a single mutation.
+
+        Without journal mode the whole habit list is rewritten. In journal mode
+        the mutation is appended to the log as one compact line, and the log is
+        folded into a new snapshot once it reaches ``compact_threshold`` records.
+
+        Args:
+            op (str): Mutation kind - "create", "complete", "update", "delete" or "clear"
+            habit (Dict | None): Affected habit (None for "clear")
+            snapshot (Callable[[], List[Dict]]): Returns the full habit list,
+                only called when a full write is needed
+            expected (int | None): Version the caller's data was loaded at
+
+        Returns:
+            int: New version
+
+        Raises:
+            StorageConflictError: If the stored version differs from expected
+        """
+        return self.commit_many(op, [habit], snapshot, expected)
+
+    def commit_many(
+        self,
+        op: str,
+        habits: List[Dict | None],
+        snapshot: Callable[[], List[Dict]],
+        expected: int | None = None,
+    ) -> int:
+        """
+        Persist the same mutation for several habits with a single write.
+
+        The version check and the write happen under the exclusive lock.
+
+        Args:
+            op (str): Mutation kind - "create", "complete", "update", "delete" or "clear"
+            habits (List[Dict | None]): Affected habits
+            snapshot (Callable[[], List[Dict]]): Returns the full habit list,
+                only called when a full write is needed
+            expected (int | None): Version the caller's data was loaded at,
+                None to skip the check
+
+        Returns:
+            int: New version
+
+        Raises:
+            StorageConflictError: If the stored version differs from expected
+        """
+        with self._locked() as fd:
+            current = self._read_version(fd)
+            if expected is not None and current != expected:
+                raise StorageConflictError(
+                    f"{self.filename} changed: version {current}, expected {expected}"
+                )
+            if self.journal:
+                self._append(op, habits, snapshot)
+            else:
+                self._save(snapshot())
+            return self._bump_version(fd)
+
+    def compact(self, habits: List[Dict]) -> int:
+        """
+        Write habits as a new snapshot and truncate the log.
+
+        The snapshot is written to a temporary file and swapped in, so a crash
+        never leaves a half-written snapshot next to a truncated log.
+
+        Args:
+            habits (List[Dict]): Full habit list to snapshot
+
+        Returns:
+            int: New version
+        """
+        with self._locked() as fd:
+            self._compact(habits)
+            return self._bump_version(fd)
+
+    def export_columnar(self, filename: str) -> int:
         """
-        with open(self.file, "w", encoding="utf-8") as f:
-            json.dump(habit, f, ensure_ascii=False, indent=4)
+        Export the current habits to a binary columnar snapshot.
+
+        Args:
+            filename (str): Snapshot path
+
+        Returns:
+            int: Number of habits exported
+        """
+        return write_columnar(filename, self.load())
+
+    def load_columnar(self, filename: str) -> List[Dict]:
+        """
+        Load habits from a columnar snapshot instead of the JSON file.
+
+        The result is not cached and does not include unexported changes.
+
+        Args:
+            filename (str): Snapshot path written by export_columnar
+
+        Returns:
+            List[Dict]: Habit dictionaries in the same shape as load
+        """
+        with ColumnarSnapshot(filename) as snapshot:
+            return snapshot.records()
 
     def clear(self) -> str:
         """
@@ -42,5 +272,194 @@ class HabitJsonStorage:
         Returns:
             str: Confirmation message
         """
-        self.save([])
-        return f"All Habits cleared!"
+        if self.journal:
+            self.commit("clear", None, list)
+        else:
+            self.save([])
+        return "All Habits cleared!"
+
+    @staticmethod
+    def _file_key(path: Path) -> tuple | None:
+        """Return (mtime_ns, size, inode) of a file, or None if it is missing."""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def _append(
+        self,
+        op: str,
+        habits: List[Dict | None],
+        snapshot: Callable[[], List[Dict]],
+    ) -> None:
+        """Append mutation records to the log, compacting past the threshold."""
+        lines = []
+        for habit in habits:
+            if op == "delete":
+                record = {"op": op, "habit_id": habit["habit_id"]}
+            elif op == "clear":
+                record = {"op": op}
+            else:
+                record = {"op": op, "habit": habit}
+            lines.append(
+                json.dumps(
+                    record, ensure_ascii=False, separators=(",", ":"), default=_encode
+                )
+                + "\n"
+            )
+        data = "".join(lines).encode("utf-8")
+        with open(self.journal_file, "a+b") as f:
+            self._truncate_torn_tail(f)
+            f.write(data)
+        self.bytes_written += len(data)
+        self._journal_records += len(lines)
+        self._cache_key = None
+
+        if self._journal_records >= self.compact_threshold:
+            self._compact(snapshot())
+
+    @staticmethod
+    def _truncate_torn_tail(f: BinaryIO) -> None:
+        """
+        Cut off an unterminated last log line left by a crash during append.
+
+        Such a line was never acknowledged; appending behind it would merge
+        the next record into the same line and make both unreadable.
+        """
+        size = f.seek(0, os.SEEK_END)
+        if not size:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        end = size
+        while end > 0:
+            start = max(end - 65536, 0)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b"\n")
+            if newline >= 0:
+                f.truncate(start + newline + 1)
+                return
+            end = start
+        f.truncate(0)
+
+    def _save(self, habits: List[Dict]) -> None:
+        """Replace the snapshot; the caller holds the lock."""
+        self.bytes_written += self._write(self.file, habits)
+        self._cache, self._cache_key = habits, self.revision()
+
+    def _compact(self, habits: List[Dict]) -> None:
+        """Replace the snapshot and truncate the log; the caller holds the lock."""
+        self.bytes_written += self._write(self.file, habits)
+        open(self.journal_file, "w", encoding="utf-8").close()
+        self._journal_records = 0
+        self._cache, self._cache_key = habits, self.revision()
+
+    @contextmanager
+    def _locked(self, shared: bool = False) -> Iterator[int]:
+        """
+        Hold an advisory lock on the lock file.
+
+        Without fcntl (e.g. on Windows) no lock is taken.
+
+        Args:
+            shared (bool): Take a shared (reader) lock instead of an exclusive one
+
+        Yields:
+            int: Descriptor of the lock file
+        """
+        flags = os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0)
+        fd = os.open(self.lock_file, flags, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            yield fd
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _read_version(fd: int) -> int:
+        """Read the version counter from the lock file."""
+        os.lseek(fd, 0, os.SEEK_SET)
+        data = os.read(fd, VERSION.size)
+        return VERSION.unpack(data)[0] if len(data) == VERSION.size else 0
+
+    def _bump_version(self, fd: int) -> int:
+        """
+        Increment the version counter; called after the data was replaced.
+
+        Returns:
+            int: New version
+        """
+        version = self._read_version(fd) + 1
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, VERSION.pack(version))
+        return version
+
+    @staticmethod
+    def _write(path: Path, habits: List[Dict]) -> int:
+        """
+        Serialize habits to a temporary file and atomically swap it in at path.
+
+        Readers therefore always see either the old or the new document.
+
+        Returns:
+            int: Number of bytes written
+        """
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(habits, f, ensure_ascii=False, indent=4, default=_encode)
+            f.flush()
+            size = os.fstat(f.fileno()).st_size
+        os.replace(tmp, path)
+        return size
+
+    def _replay(self, habits: List[Dict]) -> List[Dict]:
+        """
+        Apply logged mutations on top of snapshot habits.
+
+        An unreadable last line is a torn append from a crash and is
+        ignored; an unreadable line anywhere else means the log is corrupt.
+
+        Args:
+            habits (List[Dict]): Habits read from the snapshot
+
+        Returns:
+            List[Dict]: Current habit list
+
+        Raises:
+            StorageError: If a record before the last line cannot be read
+        """
+        self._journal_records = 0
+        if not self.journal_file.exists():
+            return habits
+
+        by_id = {habit["habit_id"]: habit for habit in habits}
+        with open(self.journal_file, "r", encoding="utf-8") as f:
+            self.bytes_read += os.fstat(f.fileno()).st_size
+            lines = iter(f)
+            line = next(lines, None)
+            line_num = 0
+            while line is not None:
+                following = next(lines, None)
+                line_num += 1
+                try:
+                    record = json.loads(line)
+                    op = record["op"]
+                    if op == "delete":
+                        by_id.pop(record["habit_id"], None)
+                    elif op == "clear":
+                        by_id.clear()
+                    else:
+                        habit = record["habit"]
+                        by_id[habit["habit_id"]] = habit
+                except (json.JSONDecodeError, KeyError, TypeError) as e:
+                    if following is None:
+                        break
+                    raise StorageError(
+                        f"Corrupt journal {self.journal_file} at line {line_num}: {e}"
+                    ) from e
+                self._journal_records += 1
+                line = following
+        return list(by_id.values())
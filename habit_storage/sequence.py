@@ -0,0 +1,139 @@
+import atexit
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+COUNTER = struct.Struct("<Q")
+DEFAULT_BLOCK_SIZE = 64
+
+
+class IdSequence:
+    """
+    Persistent habit ID sequence shared by every process using the same file.
+
+    The file holds one counter: the number of sequence slots handed out so
+    far. A process reserves a block of slots with one locked read-modify-write
+    of that counter and then serves IDs from the block in memory, so
+    allocation is O(1), needs no habit data, and blocks reserved by
+    concurrent processes never overlap. Slot ``n`` is ID ``n * step + offset + 1``,
+    which lets several sequences (e.g. shards) partition one ID space.
+
+    The unused tail of the current block is handed back at exit if no other
+    process reserved after it, so a single writer keeps getting consecutive
+    IDs across runs.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        step: int = 1,
+        offset: int = 0,
+    ) -> None:
+        """
+        Initialize the sequence; the file is created on first allocation.
+
+        Args:
+            filename (str): Counter file
+            block_size (int): Slots reserved per locked counter update
+            step (int): Distance between consecutive IDs
+            offset (int): ID of slot 0 minus one
+        """
+        self.filename = filename
+        self.block_size = block_size
+        self.step = step
+        self.offset = offset
+        self.reservations = 0
+        self._next = 0
+        self._end = 0
+        self._pid = None
+        self._lock = threading.Lock()
+        self._registered = False
+
+    def allocate(self, count: int = 1, floor: int = 0) -> range:
+        """
+        Reserve IDs.
+
+        Args:
+            count (int): Number of IDs to reserve
+            floor (int): New blocks start above this ID, e.g. the highest
+                loaded habit ID, so a sequence file created next to existing
+                data or restored from a backup cannot hand out used IDs
+
+        Returns:
+            range: Reserved IDs, ascending with the sequence's step
+        """
+        floor_slot = max(floor - self.offset - 1, -1) // self.step + 1
+        with self._lock:
+            if self._pid != os.getpid() or self._end - self._next < count:
+                # Blocks are not shared with forked children; a refill
+                # replaces the block and drops its unused rest.
+                self._next, self._end = self._reserve(
+                    max(count, self.block_size), floor_slot
+                )
+                self._pid = os.getpid()
+            start = self._next
+            self._next += count
+        first = start * self.step + self.offset + 1
+        return range(first, first + count * self.step, self.step)
+
+    def release(self) -> None:
+        """
+        Hand the unused rest of the current block back to the file.
+
+        This only succeeds while no other process has reserved after the
+        block; otherwise the rest is skipped and those IDs are never used.
+        """
+        with self._lock:
+            if self._pid != os.getpid() or self._next == self._end:
+                return
+            try:
+                with self._locked(create=False) as fd:
+                    if self._read(fd) == self._end:
+                        self._write(fd, self._next)
+            except FileNotFoundError:
+                pass  # the counter file was removed with its data
+            self._end = self._next
+
+    def _reserve(self, size: int, floor_slot: int) -> tuple[int, int]:
+        """Reserve size slots at or after floor_slot; caller holds _lock."""
+        with self._locked() as fd:
+            start = max(self._read(fd), floor_slot)
+            self._write(fd, start + size)
+        self.reservations += 1
+        if not self._registered:
+            atexit.register(self.release)
+            self._registered = True
+        return start, start + size
+
+    @contextmanager
+    def _locked(self, create: bool = True) -> Iterator[int]:
+        """Open the counter file under an exclusive lock."""
+        flags = os.O_RDWR | getattr(os, "O_BINARY", 0)
+        fd = os.open(self.filename, flags | (os.O_CREAT if create else 0), 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            yield fd
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _read(fd: int) -> int:
+        """Return the counter, 0 for a new file."""
+        os.lseek(fd, 0, os.SEEK_SET)
+        data = os.read(fd, COUNTER.size)
+        return COUNTER.unpack(data)[0] if len(data) == COUNTER.size else 0
+
+    @staticmethod
+    def _write(fd: int, value: int) -> None:
+        """Store value as the counter."""
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, COUNTER.pack(value))
@@ -0,0 +1,198 @@
+import concurrent.futures
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, List
+from urllib.parse import quote, unquote
+
+from habit_storage.json_storage import HabitJsonStorage
+from habit_storage.sequence import DEFAULT_BLOCK_SIZE, IdSequence
+from habit_storage.sqlite_storage import HabitSqliteStorage
+
+
+def _file_name(user_id: str) -> str:
+    """
+    Return the file-safe form of a user ID used for paths and hashing.
+
+    Characters outside ``A-Za-z0-9_.-~`` are percent-encoded, so distinct
+    user IDs never share a file and IDs made of safe characters keep their
+    plain name.
+    """
+    return quote(str(user_id), safe="")
+
+
+class ShardIdSequence(IdSequence):
+    """
+    Habit IDs of one shard, unique across all shards without a global scan.
+
+    Shard ``s`` of ``n`` hands out ``s + 1, s + 1 + n, s + 1 + 2n, ...``; its
+    counter file is shared by every process using the shard.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        shard_index: int,
+        shard_count: int,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ) -> None:
+        """
+        Initialize the sequence.
+
+        Args:
+            filename (str): Counter file of the shard
+            shard_index (int): Index of the shard
+            shard_count (int): Total number of shards
+            block_size (int): IDs reserved per counter update
+        """
+        super().__init__(filename, block_size, step=shard_count, offset=shard_index)
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+
+
+class ShardedStorage:
+    """
+    Per-user habit storage partitioned into shard directories.
+
+    Every user gets a storage of their own at ``<root>/<shard>/<user>.<ext>``,
+    where the shard is a stable hash of the user ID, so a service working for
+    one user only ever opens that user's file. Users of the same shard share
+    an ID sequence; IDs are unique across the whole deployment.
+    """
+
+    def __init__(
+        self,
+        root: str = "habits",
+        shard_count: int = 16,
+        storage_factory: Callable = HabitJsonStorage,
+    ) -> None:
+        """
+        Initialize the sharded storage.
+
+        Args:
+            root (str): Directory holding the shard directories
+            shard_count (int): Number of shards; must not change once used
+            storage_factory (Callable): Backend class taking a filename,
+                HabitJsonStorage or HabitSqliteStorage
+        """
+        self.root = Path(root)
+        self.shard_count = shard_count
+        self.storage_factory = storage_factory
+        self.extension = ".db" if storage_factory is HabitSqliteStorage else ".json"
+        self._storages: Dict[str, HabitJsonStorage | HabitSqliteStorage] = {}
+        self._sequences: Dict[int, ShardIdSequence] = {}
+
+    def shard_index(self, user_id: str) -> int:
+        """
+        Return the shard of a user (stable across processes and runs).
+
+        Args:
+            user_id (str): User ID
+
+        Returns:
+            int: Shard index
+        """
+        return zlib.crc32(_file_name(user_id).encode("utf-8")) % self.shard_count
+
+    def path(self, user_id: str) -> Path:
+        """
+        Return the storage file of a user.
+
+        Args:
+            user_id (str): User ID
+
+        Returns:
+            Path: File path inside the user's shard directory
+        """
+        return (
+            self.root
+            / f"{self.shard_index(user_id):02x}"
+            / (_file_name(user_id) + self.extension)
+        )
+
+    def storage(self, user_id: str) -> HabitJsonStorage | HabitSqliteStorage:
+        """
+        Return the (cached) storage of a user, creating its shard directory.
+
+        Args:
+            user_id (str): User ID
+
+        Returns:
+            HabitJsonStorage | HabitSqliteStorage: The user's storage
+        """
+        storage = self._storages.get(user_id)
+        if storage is None:
+            path = self.path(user_id)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            storage = self._storages[user_id] = self.storage_factory(str(path))
+        return storage
+
+    def sequence(self, user_id: str) -> ShardIdSequence:
+        """
+        Return the ID sequence of a user's shard.
+
+        Args:
+            user_id (str): User ID
+
+        Returns:
+            ShardIdSequence: Sequence shared by all users of the shard
+        """
+        index = self.shard_index(user_id)
+        sequence = self._sequences.get(index)
+        if sequence is None:
+            directory = self.root / f"{index:02x}"
+            directory.mkdir(parents=True, exist_ok=True)
+            sequence = self._sequences[index] = ShardIdSequence(
+                str(directory / "sequence"), index, self.shard_count
+            )
+        return sequence
+
+    def users(self) -> List[str]:
+        """
+        Return all users that have a storage file, in shard order.
+
+        Returns:
+            List[str]: User IDs
+        """
+        return [
+            unquote(path.name[: -len(self.extension)])
+            for path in sorted(self.root.glob(f"*/*{self.extension}"))
+        ]
+
+    def map(
+        self,
+        func: Callable,
+        workers: int | None = None,
+        processes: bool = False,
+    ) -> Dict[str, object]:
+        """
+        Run a function for every user in parallel.
+
+        The function receives the storage factory and the user's file name and
+        opens its own storage, so it can run in another process; with
+        ``processes=True`` it must be picklable (a module-level function or a
+        partial of one).
+
+        Args:
+            func (Callable): Called as func(storage_factory, filename)
+            workers (int | None): Pool size, defaults to the executor's default
+            processes (bool): Use a process pool instead of a thread pool
+
+        Returns:
+            Dict[str, object]: Result per user
+        """
+        users = self.users()
+        # Attribute access keeps concurrent.futures from importing
+        # multiprocessing until a process pool is actually requested.
+        executor: concurrent.futures.Executor = (
+            concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+            if processes
+            else concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        )
+        with executor:
+            futures = {
+                user_id: executor.submit(
+                    func, self.storage_factory, str(self.path(user_id))
+                )
+                for user_id in users
+            }
+            return {user_id: future.result() for user_id, future in futures.items()}
@@ -0,0 +1,346 @@
+import sqlite3
+from enum import Enum
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from habit_storage.errors import StorageConflictError
+from habit_storage.json_storage import HabitJsonStorage
+from models.history import CompletionHistory, history_from_record
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS habits (
+    habit_id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    habit_name TEXT NOT NULL,
+    habit_description TEXT NOT NULL,
+    category TEXT NOT NULL,
+    type_habit TEXT NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    streak INTEGER,
+    current_goal_days INTEGER,
+    weekly_streak INTEGER,
+    current_goal_weeks INTEGER,
+    last_completed TEXT,
+    deadline TEXT,
+    history BLOB
+);
+CREATE TABLE IF NOT EXISTS achievements (
+    habit_id INTEGER NOT NULL REFERENCES habits (habit_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    achievement TEXT NOT NULL,
+    PRIMARY KEY (habit_id, position)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0);
+CREATE INDEX IF NOT EXISTS idx_habits_category ON habits (category);
+CREATE INDEX IF NOT EXISTS idx_habits_type_habit ON habits (type_habit);
+CREATE INDEX IF NOT EXISTS idx_habits_deadline ON habits (deadline);
+"""
+
+HABIT_COLUMNS = (
+    "habit_id",
+    "created_at",
+    "habit_name",
+    "habit_description",
+    "category",
+    "type_habit",
+    "completed",
+    "streak",
+    "current_goal_days",
+    "weekly_streak",
+    "current_goal_weeks",
+    "last_completed",
+    "deadline",
+    "history",
+)
+
+UPSERT_HABIT = (
+    f"INSERT INTO habits ({', '.join(HABIT_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in HABIT_COLUMNS)}) "
+    f"ON CONFLICT (habit_id) DO UPDATE SET "
+    + ", ".join(f"{column} = excluded.{column}" for column in HABIT_COLUMNS[1:])
+)
+
+
+def _plain(value):
+    """Convert enum members and completion histories to SQLite values."""
+    if isinstance(value, CompletionHistory):
+        return value.to_bytes()
+    return value.value if isinstance(value, Enum) else value
+
+
+class HabitSqliteStorage:
+    """
+    SQLite-based storage for habits with per-record transactional writes.
+
+    Every write transaction increments a version counter in the ``meta``
+    table before touching any habit, so the version check and the write are
+    atomic and callers get the same optimistic concurrency as with
+    HabitJsonStorage. Completion dates live in each habit's ``history``
+    column.
+
+    HabitService keeps all habits in memory, so it reloads every row with
+    ``load`` whenever another connection commits; ``get`` is for callers
+    that need a single habit without a full load.
+    """
+
+    def __init__(self, filename="habits.db") -> None:
+        """
+        Open (and create if needed) the habit database.
+
+        Args:
+            filename (str): Path of the SQLite database file
+        """
+        self.filename = filename
+        self.sequence_file = None if filename == ":memory:" else Path(f"{filename}.seq")
+        # Writes may come from a write-behind flusher thread; callers serialize them.
+        self.conn = sqlite3.connect(filename, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+
+    def load(self) -> List[Dict]:
+        """
+        Load all habits with their achievements.
+
+        Returns:
+            List[Dict]: Habit dictionaries ordered by habit_id
+        """
+        achievements: Dict[int, List[str]] = {}
+        for habit_id, achievement in self.conn.execute(
+            "SELECT habit_id, achievement FROM achievements ORDER BY habit_id, position"
+        ):
+            achievements.setdefault(habit_id, []).append(achievement)
+
+        cursor = self.conn.execute(
+            f"SELECT {', '.join(HABIT_COLUMNS)} FROM habits ORDER BY habit_id"
+        )
+        return [self._row_to_habit(row, achievements) for row in cursor]
+
+    def get(self, habit_id: int) -> Dict | None:
+        """
+        Load a single habit by ID.
+
+        Args:
+            habit_id (int): ID of the habit
+
+        Returns:
+            Dict | None: Habit dictionary, or None if not found
+        """
+        row = self.conn.execute(
+            f"SELECT {', '.join(HABIT_COLUMNS)} FROM habits WHERE habit_id = ?",
+            (habit_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        achievements = [
+            achievement
+            for (achievement,) in self.conn.execute(
+                "SELECT achievement FROM achievements WHERE habit_id = ? "
+                "ORDER BY position",
+                (habit_id,),
+            )
+        ]
+        return self._row_to_habit(row, {habit_id: achievements})
+
+    def revision(self) -> int:
+        """
+        Return a token that changes when another connection commits.
+
+        Returns:
+            int: SQLite data_version of this connection
+        """
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def version(self) -> int:
+        """
+        Return the write counter shared by all connections to the database.
+
+        Returns:
+            int: Number of write transactions made through HabitSqliteStorage
+        """
+        return self.conn.execute(
+            "SELECT value FROM meta WHERE key = 'version'"
+        ).fetchone()[0]
+
+    def save(self, habit: List[Dict]) -> int:
+        """
+        Replace all stored habits in a single transaction.
+
+        Args:
+            habits (List[Dict]): Habits data to persist
+
+        Returns:
+            int: New version
+        """
+        with self.conn:
+            version = self._bump_version(None)
+            self.conn.execute("DELETE FROM habits")
+            for item in habit:
+                self._upsert(item)
+        return version
+
+    def commit(
+        self,
+        op: str,
+        habit: Dict | None,
+        snapshot: Callable[[], List[Dict]],
+        expected: int | None = None,
+    ) -> int:
+        """
+        Persist a single mutation as single-row SQL in its own transaction.
+
+        Args:
+            op (str): Mutation kind - "create", "complete", "update", "delete" or "clear"
+            habit (Dict | None): Affected habit (None for "clear")
+            snapshot (Callable[[], List[Dict]]): Unused, accepted for
+                compatibility with HabitJsonStorage.commit
+            expected (int | None): Version the caller's data was loaded at
+
+        Returns:
+            int: New version
+
+        Raises:
+            StorageConflictError: If the stored version differs from expected
+        """
+        return self.commit_many(op, [habit], snapshot, expected)
+
+    def commit_many(
+        self,
+        op: str,
+        habits: List[Dict | None],
+        snapshot: Callable[[], List[Dict]],
+        expected: int | None = None,
+    ) -> int:
+        """
+        Persist the same mutation for several habits in one transaction.
+
+        Args:
+            op (str): Mutation kind - "create", "complete", "update", "delete" or "clear"
+            habits (List[Dict | None]): Affected habits
+            snapshot (Callable[[], List[Dict]]): Unused, accepted for
+                compatibility with HabitJsonStorage.commit_many
+            expected (int | None): Version the caller's data was loaded at,
+                None to skip the check
+
+        Returns:
+            int: New version
+
+        Raises:
+            StorageConflictError: If the stored version differs from expected
+        """
+        with self.conn:
+            version = self._bump_version(expected)
+            if op == "clear":
+                self.conn.execute("DELETE FROM habits")
+            elif op == "delete":
+                self.conn.executemany(
+                    "DELETE FROM habits WHERE habit_id = ?",
+                    [(habit["habit_id"],) for habit in habits],
+                )
+            else:
+                for habit in habits:
+                    self._upsert(habit)
+        return version
+
+    def clear(self) -> str:
+        """
+        Remove all habits.
+
+        Returns:
+            str: Confirmation message
+        """
+        self.commit("clear", None, list)
+        return "All Habits cleared!"
+
+    def migrate_json(self, json_filename="habits.json") -> int:
+        """
+        One-shot import of an existing habits.json file.
+
+        The import is skipped if the database already holds habits, so running
+        it twice does not duplicate or overwrite data.
+
+        Args:
+            json_filename (str): Path of the JSON file to import
+
+        Returns:
+            int: Number of imported habits
+
+        Raises:
+            FileNotFoundError: If json_filename does not exist
+        """
+        if not Path(json_filename).exists():
+            raise FileNotFoundError(f"No such file: {json_filename}")
+        if self.conn.execute("SELECT 1 FROM habits LIMIT 1").fetchone():
+            return 0
+        habits = HabitJsonStorage(json_filename).load()
+        self.save(habits)
+        return len(habits)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def _bump_version(self, expected: int | None) -> int:
+        """
+        Increment the version as the first write of the open transaction.
+
+        The UPDATE takes SQLite's write lock, so no other connection can
+        commit between the check and the caller's writes.
+
+        Raises:
+            StorageConflictError: If the previous version differs from expected
+        """
+        self.conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+        version = self.version()
+        if expected is not None and version - 1 != expected:
+            raise StorageConflictError(
+                f"{self.filename} changed: version {version - 1}, expected {expected}"
+            )
+        return version
+
+    def _upsert(self, habit: Dict) -> None:
+        """Insert or update one habit row and rewrite its achievements."""
+        habit_id = habit["habit_id"]
+        self.conn.execute(
+            UPSERT_HABIT,
+            tuple(_plain(habit.get(column)) for column in HABIT_COLUMNS),
+        )
+        self.conn.execute("DELETE FROM achievements WHERE habit_id = ?", (habit_id,))
+        self.conn.executemany(
+            "INSERT INTO achievements (habit_id, position, achievement) "
+            "VALUES (?, ?, ?)",
+            [
+                (habit_id, position, _plain(achievement))
+                for position, achievement in enumerate(habit.get("achievement", []))
+            ],
+        )
+
+    @staticmethod
+    def _row_to_habit(row: tuple, achievements: Dict[int, List[str]]) -> Dict:
+        """Build a habit dictionary shaped like DailyHabit/WeeklyHabit.to_dict."""
+        values = dict(zip(HABIT_COLUMNS, row))
+        habit = {
+            "habit_id": values["habit_id"],
+            "created_at": values["created_at"],
+            "habit_name": values["habit_name"],
+            "habit_description": values["habit_description"],
+            "category": values["category"],
+            "type_habit": values["type_habit"],
+            "completed": bool(values["completed"]),
+        }
+        if values["type_habit"] == "weekly":
+            habit["weekly_streak"] = values["weekly_streak"]
+            habit["current_goal_weeks"] = values["current_goal_weeks"]
+            habit["last_completed"] = values["last_completed"]
+            habit["deadline"] = values["deadline"]
+        else:
+            habit["streak"] = values["streak"]
+            habit["current_goal_days"] = values["current_goal_days"]
+            habit["last_completed"] = values["last_completed"]
+        habit["achievement"] = achievements.get(values["habit_id"], [])
+        habit["history"] = history_from_record(habit, values["history"] or b"")
+        return habit
@@ -0,0 +1,346 @@
+import atexit
+import threading
+import time
+from typing import Callable, Dict, List
+
+from habit_storage.errors import StorageConflictError
+from habit_storage.json_storage import HabitJsonStorage
+from habit_storage.sqlite_storage import HabitSqliteStorage
+from models.history import CompletionHistory
+
+CONFLICT_RETRIES = 10
+
+
+def _copy_record(habit: Dict) -> Dict:
+    """Copy a habit dictionary so later in-place changes do not leak into it."""
+    record = dict(habit)
+    record["achievement"] = list(habit.get("achievement") or [])
+    history = habit.get("history")
+    if isinstance(history, CompletionHistory):
+        record["history"] = history.copy()
+    return record
+
+
+class WriteBehindStorage:
+    """
+    Write-behind cache in front of a storage backend.
+
+    Commits only update an in-memory copy of the records and mark the
+    affected habits dirty; a background flusher coalesces them into one
+    ``commit_many`` per kind of change (clear, upserts, deletes) once
+    ``max_dirty`` mutations are pending or ``interval`` seconds have passed
+    since the first unflushed one. Pending changes are flushed by ``flush``,
+    ``close`` and at interpreter exit.
+
+    Flushes are checked against the wrapped storage's version from the last
+    load or flush. When another process wrote in between, the wrapper reloads
+    the storage, reapplies its pending changes on top and retries, so only
+    the habits changed through the wrapper are overwritten.
+    """
+
+    def __init__(
+        self,
+        storage: HabitJsonStorage | HabitSqliteStorage,
+        interval: float = 1.0,
+        max_dirty: int = 100,
+    ) -> None:
+        """
+        Load the wrapped storage and start the flusher thread.
+
+        Args:
+            storage (HabitJsonStorage | HabitSqliteStorage): Backend to write to
+            interval (float): Maximum seconds a mutation stays unflushed
+            max_dirty (int): Pending mutation count that triggers a flush
+        """
+        self.storage = storage
+        self.sequence_file = getattr(storage, "sequence_file", None)
+        self.interval = interval
+        self.max_dirty = max_dirty
+        self._version = storage.version()
+        self._records: Dict[int, Dict] = {
+            habit["habit_id"]: _copy_record(habit) for habit in storage.load()
+        }
+        # Unflushed changes: habit_id -> record, or None for a deletion; a
+        # pending clear is written before them.
+        self._pending: Dict[int, Dict | None] = {}
+        self._cleared = False
+        self._generation = 0
+        self._dirty = 0
+        self._dirty_since = 0.0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+
+        self.mutations = 0
+        self.flushes = 0
+        self.flushed_mutations = 0
+        self.flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+        self.last_error: Exception | None = None
+
+        self._thread = threading.Thread(
+            target=self._run, name="habit-write-behind", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def load(self) -> List[Dict]:
+        """
+        Return the current records, including unflushed changes.
+
+        Returns:
+            List[Dict]: Copies of the habit dictionaries
+        """
+        with self._cond:
+            return [_copy_record(habit) for habit in self._records.values()]
+
+    def revision(self) -> int:
+        """
+        Return a token that changes on every commit through this wrapper.
+
+        Returns:
+            int: Commit generation
+        """
+        return self._generation
+
+    def version(self) -> None:
+        """
+        Return None: commits through the wrapper never conflict; the wrapper
+        checks versions itself when it flushes.
+
+        Returns:
+            None
+        """
+        return None
+
+    def save(self, habit: List[Dict]) -> None:
+        """
+        Replace all records; written out by the next flush as a clear
+        followed by the new records.
+
+        Args:
+            habits (List[Dict]): Habits data to persist
+        """
+        with self._cond:
+            self._records = {item["habit_id"]: _copy_record(item) for item in habit}
+            self._pending = dict(self._records)
+            self._cleared = True
+            self._mark_dirty(1)
+
+    def commit(
+        self,
+        op: str,
+        habit: Dict | None,
+        snapshot: Callable[[], List[Dict]],
+        expected: int | None = None,
+    ) -> None:
+        """
+        Record a single mutation; written out by a later flush.
+
+        Args:
+            op (str): Mutation kind - "create", "complete", "update", "delete" or "clear"
+            habit (Dict | None): Affected habit (None for "clear")
+            snapshot (Callable[[], List[Dict]]): Unused, the wrapper keeps its
+                own copy of the records
+            expected (int | None): Unused, see version
+        """
+        self.commit_many(op, [habit], snapshot)
+
+    def commit_many(
+        self,
+        op: str,
+        habits: List[Dict | None],
+        snapshot: Callable[[], List[Dict]],
+        expected: int | None = None,
+    ) -> None:
+        """
+        Record the same mutation for several habits; written out by a later flush.
+
+        Args:
+            op (str): Mutation kind - "create", "complete", "update", "delete" or "clear"
+            habits (List[Dict | None]): Affected habits
+            snapshot (Callable[[], List[Dict]]): Unused, see commit
+            expected (int | None): Unused, see version
+        """
+        with self._cond:
+            self._apply(self._records, self._pending, op, habits)
+            if op == "clear":
+                self._cleared = True
+            self._mark_dirty(len(habits))
+
+    def clear(self) -> str:
+        """
+        Remove all habits.
+
+        Returns:
+            str: Confirmation message
+        """
+        self.commit("clear", None, list)
+        return "All Habits cleared!"
+
+    def flush(self) -> None:
+        """
+        Write pending changes to the wrapped storage now and wait for it.
+
+        Raises:
+            StorageConflictError: If other processes kept writing through
+                every retry
+        """
+        with self._flush_lock:
+            with self._cond:
+                if not self._dirty:
+                    return
+                count, self._dirty = self._dirty, 0
+                cleared, pending = self._cleared, self._pending
+                self._cleared, self._pending = False, {}
+            start = time.perf_counter()
+            try:
+                self._write(cleared, pending)
+            except Exception as e:
+                with self._cond:
+                    # Changes made during the flush are newer than the failed ones.
+                    if not self._cleared:
+                        pending.update(self._pending)
+                        self._cleared, self._pending = cleared, pending
+                    if not self._dirty:
+                        self._dirty_since = time.monotonic()
+                    self._dirty += count
+                self.last_error = e
+                raise
+            elapsed = time.perf_counter() - start
+            self.flushes += 1
+            self.flushed_mutations += count
+            self.flush_seconds += elapsed
+            self.max_flush_seconds = max(self.max_flush_seconds, elapsed)
+
+    def close(self) -> None:
+        """Stop the flusher thread and flush pending changes."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        atexit.unregister(self.close)
+        self.flush()
+
+    def metrics(self) -> Dict:
+        """
+        Return write-behind counters.
+
+        Returns:
+            Dict: Mutation and flush counts, pending mutations, coalescing ratio
+                (mutations written per flush) and mean/max flush latency in seconds
+        """
+        with self._cond:
+            pending = self._dirty
+        return {
+            "mutations": self.mutations,
+            "flushes": self.flushes,
+            "pending": pending,
+            "coalescing_ratio": self.flushed_mutations / max(self.flushes, 1),
+            "mean_flush_seconds": self.flush_seconds / max(self.flushes, 1),
+            "max_flush_seconds": self.max_flush_seconds,
+        }
+
+    @staticmethod
+    def _apply(
+        records: Dict[int, Dict],
+        pending: Dict[int, Dict | None],
+        op: str,
+        habits: List[Dict | None],
+    ) -> None:
+        """Apply a mutation to records and note it in pending."""
+        if op == "clear":
+            records.clear()
+            pending.clear()
+        elif op == "delete":
+            for habit in habits:
+                records.pop(habit["habit_id"], None)
+                pending[habit["habit_id"]] = None
+        else:
+            for habit in habits:
+                record = _copy_record(habit)
+                records[habit["habit_id"]] = record
+                pending[habit["habit_id"]] = record
+
+    def _write(self, cleared: bool, pending: Dict[int, Dict | None]) -> None:
+        """Commit pending changes at the last seen version, rebasing on conflicts."""
+        steps = []
+        if cleared:
+            steps.append(("clear", [None]))
+        upserts = [record for record in pending.values() if record is not None]
+        if upserts:
+            steps.append(("update", upserts))
+        deletes = [
+            {"habit_id": habit_id}
+            for habit_id, record in pending.items()
+            if record is None
+        ]
+        if deletes:
+            steps.append(("delete", deletes))
+
+        for attempt in range(CONFLICT_RETRIES + 1):
+            try:
+                while steps:
+                    op, habits = steps[0]
+                    self._version = self.storage.commit_many(
+                        op, habits, self.load, self._version
+                    )
+                    steps.pop(0)
+                    cleared = cleared and op != "clear"
+                return
+            except StorageConflictError:
+                if attempt == CONFLICT_RETRIES:
+                    raise
+                self._rebase(cleared, pending)
+
+    def _rebase(self, cleared: bool, pending: Dict[int, Dict | None]) -> None:
+        """Reload the wrapped storage and reapply unwritten changes on top."""
+        version = self.storage.version()
+        records = {
+            habit["habit_id"]: _copy_record(habit) for habit in self.storage.load()
+        }
+        with self._cond:
+            changes_since = (
+                (self._pending,) if self._cleared else (pending, self._pending)
+            )
+            if cleared or self._cleared:
+                records.clear()
+            for changes in changes_since:
+                for habit_id, record in changes.items():
+                    if record is None:
+                        records.pop(habit_id, None)
+                    else:
+                        records[habit_id] = record
+            self._records = records
+            self._version = version
+            self._generation += 1
+
+    def _mark_dirty(self, count: int) -> None:
+        """Count pending mutations and wake the flusher; caller holds _cond."""
+        if not self._dirty:
+            self._dirty_since = time.monotonic()
+        self._dirty += count
+        self.mutations += count
+        self._generation += 1
+        self._cond.notify()
+
+    def _run(self) -> None:
+        """Flusher loop: wait for dirty records, then for a threshold, then flush."""
+        while True:
+            with self._cond:
+                while not self._dirty and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                deadline = self._dirty_since + self.interval
+                while self._dirty < self.max_dirty and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            try:
+                self.flush()
+            except Exception:
+                time.sleep(self.interval)
@@ -1,49 +1,129 @@
-from pydantic import ValidationError
+import argparse
+import atexit
+import os
+import shlex
+import sys
+from itertools import islice
+from typing import TYPE_CHECKING, Iterable
+
+from habit_service.metrics import Metrics, metrics_from_env
 from habit_service.service import HabitService
+from habit_storage.errors import StorageError
 from habit_storage.json_storage import HabitJsonStorage
-from schemas.habit_schema import (
-    CategoryHabit,
-    DailyHabitSchema,
-    WeeklyHabitSchema,
-    TypeHabit,
-)
+from habit_storage.sqlite_storage import HabitSqliteStorage
+from habit_storage.write_behind import WriteBehindStorage
+from schemas.habit_schema import CategoryHabit, TypeHabit
+
+if TYPE_CHECKING:
+    from habit_service.profiling import ActionProfiler
+
+PAGE_SIZE = 20
+# Commands that never write; they run without persisting the rollover, so
+# they take no write lock and never load the pydantic input schemas.
+READ_COMMANDS = ("show", "due", "achievements", "stats")
+
+
+class CommandError(Exception):
+    """Invalid command input: a malformed command line or habit data."""
+
+
+class CommandParser(argparse.ArgumentParser):
+    """Argument parser that raises CommandError instead of exiting."""
+
+    def error(self, message):
+        raise CommandError(message)
 
 
 class HabitTrackerCLI:
-    def __init__(self):
-        self.habit_service = HabitService(HabitJsonStorage())
+    def __init__(
+        self,
+        storage: HabitJsonStorage | HabitSqliteStorage = None,
+        metrics: Metrics | None = None,
+        profiler: "ActionProfiler | None" = None,
+        read_only: bool = False,
+    ):
+        self.metrics = metrics or metrics_from_env()
+        self.habit_service = self.metrics.instrument_service(
+            HabitService(storage or HabitJsonStorage())
+        )
+        self.profiler = profiler
+        self.rollover_summary = self.habit_service.rollover(persist=not read_only)
+        self._draft = None
+        self._screens = {
+            "main": self._main_screen,
+            "create": self._create_habit_menu,
+            "category": self._category_menu,
+            "delete": self._delete_habits_menu,
+            "delete_all": self._delete_all_habits_menu,
+            "view": self._view_habits,
+            "achievements": self._view_achievements,
+            "statistics": self._view_statistics,
+        }
+        if profiler is not None:
+            # One action per screen visit; its wall time includes waiting for
+            # input, which the cProfile report lists under builtins.input.
+            self._screens = {
+                name: profiler.wrap(f"screen.{name}", screen)
+                for name, screen in self._screens.items()
+            }
 
     def main_menu(self):
+        """
+        Run the interactive menu until the user exits.
+
+        Every screen returns the name of the next screen (None to exit) and
+        this loop dispatches to it, so the stack depth stays constant no
+        matter how long the session runs. A file or storage error is
+        reported and leads back to the main screen.
+        """
+        screen = "main"
+        while screen is not None:
+            try:
+                screen = self._screens[screen]()
+            except ValueError:
+                print("Invalid input. Please enter a number.")
+            except (OSError, StorageError) as e:
+                print(f"Error: {e}", file=sys.stderr)
+                screen = "main"
+        print("Thank you for using this program!")
+
+    def _main_screen(self):
         print("=" * 10, "MENU", "=" * 10)
         print("1. Create Habit")
         print("2. Delete Habits")
         print("3. Complete Habit")
         print("4. View Habits")
         print("5. View Achievement")
-        print("6. Exit")
+        print("6. Import Habits")
+        print("7. View Statistics")
+        print("8. Exit")
         print("=" * 10, "MENU", "=" * 10)
 
         choice = input("Enter your choice: ")
 
         if choice == "1":
-            self._create_habit_menu()
+            return "create"
         elif choice == "2":
-            self._delete_habits_menu()
+            return "delete"
         elif choice == "3":
             habit_id = int(input("Enter the habit id to perform: "))
             print(self.habit_service.complete_habit(habit_id))
-            self.main_menu()
-            return
+            return "main"
         elif choice == "4":
-            self._view_habits()
+            return "view"
         elif choice == "5":
-            self._view_achievements()
+            return "achievements"
         elif choice == "6":
-            exit("Thank you for using this program!")
+            filename = input("Enter the CSV or JSON Lines file to import: ").strip()
+            print(self.habit_service.import_habits(filename))
+            return "main"
+        elif choice == "7":
+            return "statistics"
+        elif choice == "8":
+            return None
         else:
-            print("Invalid choice. Please select a number between 1 and 6.")
-            self.main_menu()
-            return
+            print("Invalid choice. Please select a number between 1 and 8.")
+            return "main"
 
     def _create_habit_menu(self):
         print("=" * 10, "CREATE HABIT", "=" * 10)
@@ -55,13 +135,11 @@ class HabitTrackerCLI:
         choice = int(input("Enter your choice: "))
 
         if choice == 3:
-            self.main_menu()
-            return
+            return "main"
 
         if choice not in [1, 2]:
             print("Invalid choice. Please select 1, 2, or 3.")
-            self._create_habit_menu()
-            return
+            return "create"
 
         habit_name = input("Enter your habit name: ").strip()
         habit_description = input("Enter your habit description: ").strip()
@@ -70,12 +148,11 @@ class HabitTrackerCLI:
             1: TypeHabit.DAILY,
             2: TypeHabit.WEEKLY,
         }
-        type_habit = type_habit_map[choice]
+        self._draft = (habit_name, habit_description, type_habit_map[choice])
+        return "category"
 
-        if self._category_menu(habit_name, habit_description, type_habit):
-            return
-
-    def _category_menu(self, habit_name, habit_description, type_habit):
+    def _category_menu(self):
+        habit_name, habit_description, type_habit = self._draft
         print("=" * 10, "CATEGORY", "=" * 10)
         print("1. Health")
         print("2. Productivity")
@@ -98,45 +175,46 @@ class HabitTrackerCLI:
         choice = int(input("Select a habit category: "))
 
         if choice == 7:
-            self.main_menu()
+            return "main"
 
         if choice not in category_map:
             print("Invalid choice. Please select a number between 1 and 7.")
-            self._category_menu(habit_name, habit_description, type_habit)
-            return
+            return "category"
 
-        category = category_map[choice]
         try:
-            if type_habit == TypeHabit.DAILY:
-                print(
-                    self.habit_service.create_habit(
-                        type_habit=TypeHabit.DAILY,
-                        daily_schema=DailyHabitSchema(
-                            habit_name=habit_name,
-                            habit_description=habit_description,
-                            category=category,
-                        ),
-                    )
+            print(
+                self._create(
+                    habit_name, habit_description, category_map[choice], type_habit
                 )
-                self.main_menu()
-                return
-            elif type_habit == TypeHabit.WEEKLY:
-                print(
-                    self.habit_service.create_weekly_habit(
-                        type_habit=TypeHabit.WEEKLY,
-                        weekly_schema=WeeklyHabitSchema(
-                            habit_name=habit_name,
-                            habit_description=habit_description,
-                            category=category,
-                        ),
-                    )
-                )
-                self.main_menu()
-                return
+            )
+        except CommandError as e:
+            print(e)
+            return "create"
+        return "main"
+
+    def _create(self, habit_name, habit_description, category, type_habit):
+        # pydantic is only imported once a habit is actually created.
+        from pydantic import ValidationError
+        from schemas.input_schema import DailyHabitSchema, WeeklyHabitSchema
+
+        schema_class = (
+            WeeklyHabitSchema if type_habit == TypeHabit.WEEKLY else DailyHabitSchema
+        )
+        try:
+            schema = schema_class(
+                habit_name=habit_name,
+                habit_description=habit_description,
+                category=category,
+            )
         except ValidationError as e:
-            print(f"Data validation error: {e}")
-            self._create_habit_menu()
-            return
+            raise CommandError(f"Data validation error: {e}") from e
+        if type_habit == TypeHabit.WEEKLY:
+            return self.habit_service.create_weekly_habit(
+                type_habit=TypeHabit.WEEKLY, weekly_schema=schema
+            )
+        return self.habit_service.create_habit(
+            type_habit=TypeHabit.DAILY, daily_schema=schema
+        )
 
     def _delete_habits_menu(self):
         print("=" * 10, "DELETE HABIT", "=" * 10)
@@ -150,20 +228,17 @@ class HabitTrackerCLI:
         if choice == "1":
             habit_id = int(input("Enter your habit id for delete: "))
             print(self.habit_service.delete_habit(habit_id))
-            self._delete_habits_menu()
-            return
+            return "delete"
 
         elif choice == "2":
-            self._delete_all_habits_menu()
+            return "delete_all"
 
         elif choice == "3":
-            self.main_menu()
-            return
+            return "main"
 
         else:
             print("Invalid choice. Please select a number between 1 and 3.")
-            self._delete_habits_menu()
-            return
+            return "delete"
 
     def _delete_all_habits_menu(self):
         print("=" * 10, "Do you want to delete the habit?", "=" * 10)
@@ -175,18 +250,16 @@ class HabitTrackerCLI:
 
         if choice == "1":
             print(self.habit_service.delete_all_habits())
-            self.main_menu()
-            return
+            return "main"
 
-        elif choice == "2":
-            self._delete_habits_menu()
-            return
+        return "delete"
 
     def _view_habits(self):
         print("=" * 10, "View Habits", "=" * 10)
         print("1. Show Habit by ID")
         print("2. Show All Habits")
-        print("3. Back")
+        print("3. Show Due Soon")
+        print("4. Back")
         print("=" * 10, "View Habits", "=" * 10)
 
         choice = input("Enter your choice: ")
@@ -194,22 +267,36 @@ class HabitTrackerCLI:
         if choice == "1":
             habit_id = int(input("Enter your habit id for view: "))
             print(self.habit_service.show_habit(habit_id))
-            self._view_habits()
-            return
+            return "view"
 
         elif choice == "2":
-            print(self.habit_service.show_all_habits())
-            self._view_habits()
-            return
+            self._page_habits()
+            return "view"
 
         elif choice == "3":
-            self.main_menu()
-            return
+            days = int(input("Show weekly habits due within how many days: "))
+            print(self.habit_service.show_due_soon(days))
+            return "view"
+
+        elif choice == "4":
+            return "main"
 
         else:
-            print("Invalid choice. Please select a number between 1 and 3.")
-            self._view_habits()
-            return
+            print("Invalid choice. Please select a number between 1 and 4.")
+            return "view"
+
+    def _page_habits(self):
+        # One iterator serves every page, so paging never rescans earlier habits.
+        habits = self.habit_service.iter_habits()
+        while True:
+            page = list(islice(habits, PAGE_SIZE))
+            if not page:
+                print("No more habits.")
+                return
+            for line in self.habit_service.render_habits(page):
+                print(line)
+            if input("Press Enter for the next page or 'q' to stop: ") == "q":
+                return
 
     def _view_achievements(self):
         print("=" * 10, "View Achievements", "=" * 10)
@@ -223,24 +310,263 @@ class HabitTrackerCLI:
         if choice == "1":
             habit_id = int(input("Enter the habit id: "))
             print(self.habit_service.show_achievement(habit_id))
-            self._view_achievements()
-            return
+            return "achievements"
 
         elif choice == "2":
             print(self.habit_service.show_all_achievements())
-            self._view_achievements()
-            return
+            return "achievements"
 
         elif choice == "3":
-            self.main_menu()
-            return
+            return "main"
 
         else:
             print("Invalid choice. Please select a number between 1 and 3.")
-            self._view_achievements()
-            return
+            return "achievements"
 
+    def _view_statistics(self):
+        print("=" * 10, "View Statistics", "=" * 10)
+        print("1. Show Statistics by ID")
+        print("2. Show All Statistics")
+        print("3. Back")
+        print("=" * 10, "View Statistics", "=" * 10)
 
-if __name__ == "__main__":
-    cli = HabitTrackerCLI()
+        choice = input("Enter your choice: ")
+
+        if choice == "1":
+            habit_id = int(input("Enter the habit id: "))
+            print(self.habit_service.show_habit_statistics(habit_id))
+            return "statistics"
+
+        elif choice == "2":
+            print(self.habit_service.show_statistics())
+            return "statistics"
+
+        elif choice == "3":
+            return "main"
+
+        else:
+            print("Invalid choice. Please select a number between 1 and 3.")
+            return "statistics"
+
+    def run_command(self, args: argparse.Namespace) -> str:
+        """
+        Execute one parsed subcommand.
+
+        Args:
+            args (argparse.Namespace): Result of a parser built by add_commands
+
+        Returns:
+            str: Command output
+
+        Raises:
+            CommandError: If the command input is invalid
+        """
+        if self.profiler is not None:
+            return self.profiler.wrap(f"command.{args.command}", self._run_command)(
+                args
+            )
+        return self._run_command(args)
+
+    def _run_command(self, args: argparse.Namespace) -> str:
+        service = self.habit_service
+        if args.command == "create":
+            return self._create(
+                args.name, args.description, args.category, TypeHabit(args.type)
+            )
+        if args.command == "complete":
+            return "\n".join(
+                message for _, message in service.complete_many(args.habit_ids)
+            )
+        if args.command == "delete":
+            if args.all:
+                return service.delete_all_habits()
+            if not args.habit_ids:
+                raise CommandError("delete needs habit IDs or --all")
+            return "\n".join(
+                message for _, message in service.delete_many(args.habit_ids)
+            )
+        if args.command == "show":
+            if args.habit_id is not None:
+                return service.show_habit(args.habit_id)
+            return service.show_all_habits(
+                args.offset, args.limit, args.category, args.type
+            )
+        if args.command == "due":
+            return service.show_due_soon(args.days)
+        if args.command == "achievements":
+            if args.habit_id is not None:
+                return service.show_achievement(args.habit_id)
+            return service.show_all_achievements(args.offset, args.limit)
+        if args.command == "stats":
+            if args.habit_id is not None:
+                return service.show_habit_statistics(args.habit_id)
+            return service.show_statistics()
+        if args.command == "import":
+            return service.import_habits(args.filename)
+        if args.command == "migrate":
+            storage = service.storage
+            if not isinstance(storage, HabitSqliteStorage):
+                raise CommandError("migrate needs a SQLite --storage (.db)")
+            count = storage.migrate_json(args.source)
+            return f"Imported {count} habits into {storage.filename}"
+        if args.command == "rollover":
+            # Every start already rolled over; report what it reset.
+            return self.rollover_summary
+        raise CommandError(f"Unknown command {args.command!r}")
+
+    def run_batch(self, lines: Iterable[str]) -> int:
+        """
+        Execute one subcommand per line against this CLI's loaded service.
+
+        Blank lines and lines starting with "#" are skipped. A failing line,
+        including one hitting a file or storage error, is reported on stderr
+        and does not stop the batch.
+
+        Args:
+            lines (Iterable[str]): Command lines, e.g. "complete 3 4"
+
+        Returns:
+            int: Number of failed lines
+        """
+        parser = CommandParser(prog="batch", add_help=False)
+        add_commands(parser)
+        failures = 0
+        for line_num, line in enumerate(lines, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                args = parser.parse_args(shlex.split(line))
+                if args.command is None:
+                    raise CommandError("missing command")
+                print(self.run_command(args))
+            except (CommandError, ValueError, OSError, StorageError) as e:
+                print(f"line {line_num}: {e}", file=sys.stderr)
+                failures += 1
+        return failures
+
+
+def add_commands(parser: argparse.ArgumentParser) -> None:
+    """Add the non-interactive subcommands to a parser."""
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    categories = [category.value for category in CategoryHabit]
+    types = [type_habit.value for type_habit in TypeHabit]
+
+    create = commands.add_parser("create", help="create a habit")
+    create.add_argument("name")
+    create.add_argument("description")
+    create.add_argument("--category", choices=categories, default="other")
+    create.add_argument("--type", choices=types, default="daily")
+
+    complete = commands.add_parser("complete", help="complete habits")
+    complete.add_argument("habit_ids", type=int, nargs="+", metavar="ID")
+
+    delete = commands.add_parser("delete", help="delete habits")
+    delete.add_argument("habit_ids", type=int, nargs="*", metavar="ID")
+    delete.add_argument("--all", action="store_true", help="delete all habits")
+
+    show = commands.add_parser("show", help="show one habit or a page of habits")
+    show.add_argument("habit_id", type=int, nargs="?", metavar="ID")
+    show.add_argument("--offset", type=int, default=0)
+    show.add_argument("--limit", type=int)
+    show.add_argument("--category", choices=categories)
+    show.add_argument("--type", choices=types)
+
+    due = commands.add_parser("due", help="show weekly habits due soon")
+    due.add_argument("--days", type=int, default=3)
+
+    achievements = commands.add_parser("achievements", help="show achievements")
+    achievements.add_argument("habit_id", type=int, nargs="?", metavar="ID")
+    achievements.add_argument("--offset", type=int, default=0)
+    achievements.add_argument("--limit", type=int)
+
+    stats = commands.add_parser("stats", help="show statistics")
+    stats.add_argument("habit_id", type=int, nargs="?", metavar="ID")
+
+    import_ = commands.add_parser("import", help="import a CSV or JSON Lines file")
+    import_.add_argument("filename")
+
+    commands.add_parser("rollover", help="reset expired streaks and print a summary")
+
+    migrate = commands.add_parser(
+        "migrate", help="copy a habits.json file into an empty SQLite --storage"
+    )
+    migrate.add_argument("source", nargs="?", default="habits.json")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Habit tracker. Without a command the interactive menu starts."
+    )
+    parser.add_argument(
+        "--storage",
+        default="habits.json",
+        help="habit file; a .db suffix selects SQLite storage",
+    )
+    parser.add_argument(
+        "--journal",
+        action="store_true",
+        help="append JSON mutations to a log instead of rewriting the file",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="run one command per line from FILE ('-' for stdin)",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="DIR",
+        default=os.environ.get("HABIT_PROFILE"),
+        help="write a cProfile dump and allocation report per menu screen or "
+        "command to DIR (default: $HABIT_PROFILE)",
+    )
+    add_commands(parser)
+    args = parser.parse_args(argv)
+
+    storage = (
+        HabitSqliteStorage(args.storage)
+        if args.storage.endswith(".db")
+        else HabitJsonStorage(args.storage, journal=args.journal)
+    )
+    if args.batch:
+        # Coalesce commits instead of rewriting the habit file once per line;
+        # flushes are version-checked and merge writes from other processes.
+        storage = WriteBehindStorage(storage)
+    profiler = None
+    if args.profile:
+        from habit_service.profiling import ActionProfiler
+
+        profiler = ActionProfiler(args.profile)
+    cli = HabitTrackerCLI(
+        storage,
+        profiler=profiler,
+        read_only=args.command in READ_COMMANDS and not args.batch,
+    )
+    if cli.metrics.enabled and os.environ.get("HABIT_METRICS_FILE"):
+        atexit.register(cli.metrics.write_prometheus, os.environ["HABIT_METRICS_FILE"])
+
+    if args.batch:
+        try:
+            if args.batch == "-":
+                failures = cli.run_batch(sys.stdin)
+            else:
+                with open(args.batch, "r", encoding="utf-8") as f:
+                    failures = cli.run_batch(f)
+        finally:
+            storage.close()
+        return 1 if failures else 0
+    if args.command:
+        try:
+            print(cli.run_command(args))
+        except CommandError as e:
+            parser.error(str(e))
+        except (OSError, StorageError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        return 0
     cli.main_menu()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
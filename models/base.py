@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta
+from models.history import CompletionHistory, history_from_record
 from schemas.habit_schema import (
     GoalDaysHabit,
     TypeHabit,
@@ -10,6 +11,19 @@ from schemas.habit_schema import (
 class BaseHabit:
     """Base class for all habit types."""
 
+    __slots__ = (
+        "habit_id",
+        "habit_name",
+        "habit_description",
+        "category",
+        "type_habit",
+        "completed",
+        "created_at",
+        "last_completed",
+        "achievement",
+        "history",
+    )
+
     def __init__(
         self,
         habit_name: str,
@@ -21,6 +35,8 @@ class BaseHabit:
         """
         Initialize common habit attributes.
 
+        Dates are kept as ISO strings, the same form they are stored in.
+
         Args:
             habit_name (str): Name of the habit
             habit_description (str): Description of the habit
@@ -33,13 +49,22 @@ class BaseHabit:
         self.category = category
         self.type_habit = type_habit
         self.completed = completed
-        self.created_at = datetime.now().date()
+        self.created_at = datetime.now().date().isoformat()
         self.last_completed = None
+        self.history = CompletionHistory()
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(habit_id={self.habit_id!r}, "
+            f"habit_name={self.habit_name!r})"
+        )
 
 
 class DailyHabit(BaseHabit):
     """Model representing a daily habit."""
 
+    __slots__ = ("streak", "current_goal_days")
+
     def __init__(
         self,
         habit_id: int,
@@ -69,7 +94,7 @@ class DailyHabit(BaseHabit):
         """
         return {
             "habit_id": self.habit_id,
-            "created_at": self.created_at.isoformat(),
+            "created_at": self.created_at,
             "habit_name": self.habit_name,
             "habit_description": self.habit_description,
             "category": self.category,
@@ -79,12 +104,44 @@ class DailyHabit(BaseHabit):
             "current_goal_days": self.current_goal_days,
             "last_completed": self.last_completed,
             "achievement": self.achievement,
+            "history": self.history,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "DailyHabit":
+        """
+        Restore a daily habit from its stored dictionary without validation.
+
+        The mutable fields are copied, so changing the habit never changes
+        data, which may be a storage backend's cached record.
+
+        Args:
+            data (dict): Dictionary produced by to_dict
+
+        Returns:
+            DailyHabit: Habit object
+        """
+        habit = cls.__new__(cls)
+        habit.habit_id = data["habit_id"]
+        habit.created_at = data["created_at"]
+        habit.habit_name = data["habit_name"]
+        habit.habit_description = data["habit_description"]
+        habit.category = data["category"]
+        habit.type_habit = data["type_habit"]
+        habit.completed = data["completed"]
+        habit.streak = data["streak"]
+        habit.current_goal_days = data["current_goal_days"]
+        habit.last_completed = data["last_completed"]
+        habit.achievement = list(data["achievement"])
+        habit.history = history_from_record(data).copy()
+        return habit
+
 
 class WeeklyHabit(BaseHabit):
     """Model representing a weekly habit."""
 
+    __slots__ = ("weekly_streak", "current_goal_weeks", "deadline")
+
     def __init__(
         self,
         habit_id: int,
@@ -102,7 +159,11 @@ class WeeklyHabit(BaseHabit):
         )
         self.habit_id = habit_id
         self.weekly_streak = weekly_streak
-        self.deadline = self.created_at + timedelta(weeks=1)
+        self.deadline = (
+            (datetime.fromisoformat(self.created_at) + timedelta(weeks=1))
+            .date()
+            .isoformat()
+        )
         self.current_goal_weeks = current_goal_weeks
         self.achievement = []
 
@@ -115,7 +176,7 @@ class WeeklyHabit(BaseHabit):
         """
         return {
             "habit_id": self.habit_id,
-            "created_at": self.created_at.isoformat(),
+            "created_at": self.created_at,
             "habit_name": self.habit_name,
             "habit_description": self.habit_description,
             "category": self.category,
@@ -124,6 +185,52 @@ class WeeklyHabit(BaseHabit):
             "weekly_streak": self.weekly_streak,
             "current_goal_weeks": self.current_goal_weeks,
             "last_completed": self.last_completed,
-            "deadline": self.deadline.isoformat(),
+            "deadline": self.deadline,
             "achievement": self.achievement,
+            "history": self.history,
         }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "WeeklyHabit":
+        """
+        Restore a weekly habit from its stored dictionary without validation.
+
+        The mutable fields are copied, so changing the habit never changes
+        data, which may be a storage backend's cached record.
+
+        Args:
+            data (dict): Dictionary produced by to_dict
+
+        Returns:
+            WeeklyHabit: Habit object
+        """
+        habit = cls.__new__(cls)
+        habit.habit_id = data["habit_id"]
+        habit.created_at = data["created_at"]
+        habit.habit_name = data["habit_name"]
+        habit.habit_description = data["habit_description"]
+        habit.category = data["category"]
+        habit.type_habit = data["type_habit"]
+        habit.completed = data["completed"]
+        habit.weekly_streak = data["weekly_streak"]
+        habit.current_goal_weeks = data["current_goal_weeks"]
+        habit.last_completed = data["last_completed"]
+        habit.deadline = data.get("deadline")
+        habit.achievement = list(data["achievement"])
+        habit.history = history_from_record(data).copy()
+        return habit
+
+
+def habit_from_dict(data: dict) -> DailyHabit | WeeklyHabit:
+    """
+    Restore a habit object of the right type from its stored dictionary.
+
+    Args:
+        data (dict): Dictionary produced by DailyHabit/WeeklyHabit.to_dict
+
+    Returns:
+        DailyHabit | WeeklyHabit: Habit object
+    """
+    if data["type_habit"] == "weekly":
+        return WeeklyHabit.from_dict(data)
+    return DailyHabit.from_dict(data)
@@ -0,0 +1,273 @@
+import sys
+from array import array
+from bisect import bisect_right
+from datetime import date
+from typing import Iterator, List
+
+# Completion rate windows in days, shared by single-habit and population statistics.
+RATE_WINDOWS = (7, 30, 90)
+
+
+class CompletionHistory:
+    """
+    Completion dates of one habit, stored as runs of consecutive days.
+
+    The runs live in a flat ``array('I')`` of (start ordinal, length) pairs
+    sorted by start, so a habit completed every day for years costs 8 bytes,
+    and the current streak is simply the length of the last run.
+    """
+
+    __slots__ = ("_runs",)
+
+    def __init__(self, runs: array | None = None) -> None:
+        """
+        Initialize the history.
+
+        Args:
+            runs (array | None): Flat (start ordinal, length) pairs
+        """
+        self._runs = runs if runs is not None else array("I")
+
+    def __len__(self) -> int:
+        """Return the number of completed days."""
+        return sum(self._runs[1::2])
+
+    def __bool__(self) -> bool:
+        return bool(self._runs)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, CompletionHistory) and self._runs == other._runs
+
+    def __contains__(self, day: date) -> bool:
+        ordinal = day.toordinal()
+        runs = self._runs
+        i = bisect_right(runs[0::2], ordinal) - 1
+        return i >= 0 and ordinal < runs[2 * i] + runs[2 * i + 1]
+
+    def __repr__(self) -> str:
+        return f"CompletionHistory({self.to_list()})"
+
+    def add(self, day: date) -> bool:
+        """
+        Record a completion, merging it into the adjacent runs.
+
+        Appending today's completion is O(1); back-filling an older date
+        costs one bisect plus an array insert.
+
+        Args:
+            day (date): Completion date
+
+        Returns:
+            bool: False if the day was already recorded
+        """
+        ordinal = day.toordinal()
+        runs = self._runs
+        if runs and ordinal >= runs[-2]:
+            end = runs[-2] + runs[-1]
+            if ordinal < end:
+                return False
+            if ordinal == end:
+                runs[-1] += 1
+            else:
+                runs.extend((ordinal, 1))
+            return True
+
+        starts = runs[0::2]
+        i = bisect_right(starts, ordinal) - 1
+        if i >= 0 and ordinal < starts[i] + runs[2 * i + 1]:
+            return False
+        merge_prev = i >= 0 and starts[i] + runs[2 * i + 1] == ordinal
+        merge_next = i + 1 < len(starts) and starts[i + 1] == ordinal + 1
+        if merge_prev and merge_next:
+            runs[2 * i + 1] += 1 + runs[2 * i + 3]
+            del runs[2 * i + 2 : 2 * i + 4]
+        elif merge_prev:
+            runs[2 * i + 1] += 1
+        elif merge_next:
+            runs[2 * i + 2] = ordinal
+            runs[2 * i + 3] += 1
+        else:
+            runs[2 * i + 2 : 2 * i + 2] = array("I", (ordinal, 1))
+        return True
+
+    def last(self) -> date | None:
+        """
+        Return the most recent completion date.
+
+        Returns:
+            date | None: Last completed day, or None if never completed
+        """
+        if not self._runs:
+            return None
+        return date.fromordinal(self._runs[-2] + self._runs[-1] - 1)
+
+    def current_streak(self, today: date) -> int:
+        """
+        Recompute the daily streak that is still alive today.
+
+        A streak stays alive until the end of the day after its last completion.
+
+        Args:
+            today (date): Reference date
+
+        Returns:
+            int: Length of the last run if it ends today or yesterday, else 0
+        """
+        if not self._runs:
+            return 0
+        end = self._runs[-2] + self._runs[-1] - 1
+        return self._runs[-1] if today.toordinal() - 1 <= end else 0
+
+    def longest_streak(self) -> int:
+        """
+        Return the longest run of consecutive completed days.
+
+        Returns:
+            int: Longest streak in days, 0 if never completed
+        """
+        return max(self._runs[1::2], default=0)
+
+    def streaks(self, today: date, gap: int = 1) -> tuple[int, int]:
+        """
+        Return the current and the longest streak, bridging short gaps.
+
+        Runs at most gap days apart form one streak, so a weekly habit
+        (gap 7) keeps its streak with one completion every seven days. The
+        current streak is alive while today is at most gap days after its end.
+
+        Args:
+            today (date): Reference date
+            gap (int): Largest number of days between two completions of a streak
+
+        Returns:
+            tuple[int, int]: Completed days in the current and the longest streak
+        """
+        current = longest = 0
+        end = None
+        for start, length in self.runs():
+            current = (
+                current + length if end is not None and start - end <= gap else length
+            )
+            end = start + length - 1
+            longest = max(longest, current)
+        if end is None or today.toordinal() - end > gap:
+            return 0, longest
+        return current, longest
+
+    def days_between(self, first: date, last: date) -> int:
+        """
+        Count completed days in a date range.
+
+        Args:
+            first (date): First day of the range
+            last (date): Last day of the range, inclusive
+
+        Returns:
+            int: Number of completed days from first to last
+        """
+        first, last = first.toordinal(), last.toordinal()
+        return sum(
+            max(min(start + length - 1, last) - max(start, first) + 1, 0)
+            for start, length in self.runs()
+        )
+
+    def copy(self) -> "CompletionHistory":
+        """
+        Return an independent copy of the history.
+
+        Returns:
+            CompletionHistory: Copy sharing no state with this history
+        """
+        return CompletionHistory(array("I", self._runs))
+
+    def runs(self) -> Iterator[tuple[int, int]]:
+        """
+        Iterate over runs of consecutive days.
+
+        Yields:
+            tuple[int, int]: (start ordinal, length in days)
+        """
+        runs = self._runs
+        for i in range(0, len(runs), 2):
+            yield runs[i], runs[i + 1]
+
+    def to_list(self) -> List[int]:
+        """
+        Return the flat (start ordinal, length) list used in JSON storage.
+
+        Returns:
+            List[int]: Flat run pairs
+        """
+        return self._runs.tolist()
+
+    @classmethod
+    def from_list(cls, values: List[int]) -> "CompletionHistory":
+        """
+        Build a history from the flat list produced by to_list.
+
+        Args:
+            values (List[int]): Flat run pairs
+
+        Returns:
+            CompletionHistory: Restored history
+        """
+        return cls(array("I", values))
+
+    def to_bytes(self) -> bytes:
+        """
+        Return the runs packed as little-endian uint32 values.
+
+        Returns:
+            bytes: Packed runs used in binary storage backends
+        """
+        if sys.byteorder == "little":
+            return self._runs.tobytes()
+        runs = array("I", self._runs)
+        runs.byteswap()
+        return runs.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CompletionHistory":
+        """
+        Build a history from bytes produced by to_bytes.
+
+        Args:
+            data (bytes): Packed little-endian runs
+
+        Returns:
+            CompletionHistory: Restored history
+        """
+        runs = array("I", data)
+        if sys.byteorder != "little":
+            runs.byteswap()
+        return cls(runs)
+
+
+def history_from_record(habit: dict, history=None) -> CompletionHistory:
+    """
+    Build the completion history for a stored habit record.
+
+    Records written before histories existed are seeded from last_completed.
+
+    Args:
+        habit (dict): Habit record as stored
+        history: Stored history (flat list, bytes or CompletionHistory),
+            defaults to habit["history"]
+
+    Returns:
+        CompletionHistory: History for the habit
+    """
+    if history is None:
+        history = habit.get("history")
+    if isinstance(history, CompletionHistory):
+        return history
+    if isinstance(history, (bytes, bytearray, memoryview)):
+        result = CompletionHistory.from_bytes(bytes(history))
+    else:
+        result = CompletionHistory.from_list(history or [])
+    if not result and habit.get("last_completed"):
+        try:
+            result.add(date.fromisoformat(habit["last_completed"]))
+        except (ValueError, TypeError):
+            pass
+    return result
@@ -1,5 +1,3 @@
-from pydantic import BaseModel, Field
-from typing import Annotated
 from enum import Enum
 
 class TypeHabit(str, Enum):
@@ -46,11 +44,27 @@ class AchievementWeeklyHabit(str, Enum):
     SIX_MONTHS = "Six months - you are not a hero on a schedule, you are a hero on life"
     ONE_YEAR = "A Year Without Stops – You've Created a Legend from Your Discipline"
 
-class DailyHabitSchema(BaseModel):
-    habit_name: Annotated[str, Field(min_length=1, max_length=500)]
-    habit_description: Annotated[str, Field(min_length=1, max_length=500)]
-    category: CategoryHabit
-    type_habit: TypeHabit = TypeHabit.DAILY
+# The input schemas need pydantic, whose import costs more than the rest of
+# the application together. They live in schemas.input_schema and are loaded
+# on first access, so read-only commands never import pydantic.
+INPUT_SCHEMAS = ("DailyHabitSchema", "WeeklyHabitSchema", "HabitBatchAdapter")
 
-class WeeklyHabitSchema(DailyHabitSchema):
-    type_habit: TypeHabit = TypeHabit.WEEKLY
\ No newline at end of file
+__all__ = [
+    "TypeHabit",
+    "CategoryHabit",
+    "GoalDaysHabit",
+    "GoalWeeklyHabit",
+    "AchievementHabit",
+    "AchievementWeeklyHabit",
+    *INPUT_SCHEMAS,
+]
+
+def __getattr__(name):
+    if name in INPUT_SCHEMAS:
+        from schemas import input_schema
+
+        return getattr(input_schema, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(INPUT_SCHEMAS))
@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field, TypeAdapter
+from typing import Annotated
+
+from schemas.habit_schema import CategoryHabit, TypeHabit
+
+class DailyHabitSchema(BaseModel):
+    habit_name: Annotated[str, Field(min_length=1, max_length=500)]
+    habit_description: Annotated[str, Field(min_length=1, max_length=500)]
+    category: CategoryHabit
+    type_habit: TypeHabit = TypeHabit.DAILY
+
+class WeeklyHabitSchema(DailyHabitSchema):
+    type_habit: TypeHabit = TypeHabit.WEEKLY
+
+HabitBatchAdapter = TypeAdapter(list[DailyHabitSchema | WeeklyHabitSchema])
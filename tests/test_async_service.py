@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import time
+
+from habit_service.async_service import AsyncHabitService
+from habit_service.service import HabitService
+from habit_storage.json_storage import HabitJsonStorage
+from schemas.habit_schema import CategoryHabit, TypeHabit
+from schemas.input_schema import DailyHabitSchema
+
+
+def make_service(tmp_path, count):
+    service = HabitService(HabitJsonStorage(str(tmp_path / "habits.json")))
+    for n in range(count):
+        service.create_habit(
+            TypeHabit.DAILY,
+            DailyHabitSchema(
+                habit_name=f"habit {n}",
+                habit_description="test",
+                category=CategoryHabit.OTHER,
+            ),
+        )
+    return service
+
+
+def test_completions_of_one_tick_share_a_write(tmp_path):
+    service = make_service(tmp_path, 3)
+    ids = [habit.habit_id for habit in service.iter_habits()]
+    batches = []
+    complete_many = service.complete_many
+
+    def recorded_complete_many(habit_ids):
+        batches.append(habit_ids)
+        return complete_many(habit_ids)
+
+    service.complete_many = recorded_complete_many
+
+    async def run():
+        async with AsyncHabitService(service) as async_service:
+            return await asyncio.gather(
+                *(async_service.complete_habit(habit_id) for habit_id in ids),
+                async_service.complete_habit(ids[0]),
+            )
+
+    messages = asyncio.run(run())
+    # The repeated ID waits for its habit's lock, so it lands in a later batch.
+    assert batches == [ids, [ids[0]]]
+    assert messages[-1] == "The habit has already been completed!"
+    assert messages[0] != messages[-1]
+
+
+def test_calls_are_serialized_per_habit_only(tmp_path):
+    service = make_service(tmp_path, 5)
+    ids = [habit.habit_id for habit in service.iter_habits()]
+    running = {}
+    overlaps = []
+    lock = threading.Lock()
+    show_habit = service.show_habit
+
+    def tracked_show(habit_id):
+        with lock:
+            running[habit_id] = running.get(habit_id, 0) + 1
+            overlaps.append((running[habit_id], sum(running.values())))
+        try:
+            time.sleep(0.01)
+            return show_habit(habit_id)
+        finally:
+            with lock:
+                running[habit_id] -= 1
+
+    service.show_habit = tracked_show
+
+    async def run():
+        async with AsyncHabitService(service, max_workers=4) as async_service:
+            return await asyncio.gather(
+                *(async_service.show_habit(habit_id) for habit_id in ids * 4)
+            )
+
+    assert len(asyncio.run(run())) == 20
+    assert max(same for same, _ in overlaps) == 1
+    assert max(total for _, total in overlaps) > 1
+
+
+def test_parallel_calls_on_different_habits_lose_no_writes(tmp_path):
+    service = make_service(tmp_path, 12)
+    ids = [habit.habit_id for habit in service.iter_habits()]
+
+    async def run():
+        async with AsyncHabitService(service, max_workers=4) as async_service:
+            await asyncio.gather(
+                *(async_service.complete_habit(habit_id) for habit_id in ids[:8]),
+                *(async_service.delete_habit(habit_id) for habit_id in ids[8:]),
+                async_service.show_all_habits(),
+                async_service.create_habit(
+                    TypeHabit.DAILY,
+                    DailyHabitSchema(
+                        habit_name="late",
+                        habit_description="test",
+                        category=CategoryHabit.OTHER,
+                    ),
+                ),
+            )
+
+    asyncio.run(run())
+    reloaded = HabitService(HabitJsonStorage(str(tmp_path / "habits.json")))
+    habits = {habit.habit_id: habit for habit in reloaded.iter_habits()}
+    assert sorted(habits) == sorted(ids[:8] + [max(habits)])
+    assert all(habits[habit_id].last_completed for habit_id in ids[:8])
+    assert habits[max(habits)].habit_name == "late"
@@ -0,0 +1,79 @@
+import pytest
+
+from habit_service.service import HabitService
+from habit_storage.columnar import ColumnarSnapshot, write_columnar
+from habit_storage.json_storage import HabitJsonStorage
+from schemas.habit_schema import CategoryHabit, TypeHabit
+from schemas.input_schema import DailyHabitSchema, WeeklyHabitSchema
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = HabitJsonStorage(str(tmp_path / "habits.json"))
+    service = HabitService(storage)
+    service.create_habit(
+        TypeHabit.DAILY,
+        DailyHabitSchema(
+            habit_name="Lesen ✓", habit_description="20 Seiten", category="other"
+        ),
+    )
+    service.create_weekly_habit(
+        TypeHabit.WEEKLY,
+        WeeklyHabitSchema(
+            habit_name="Run",
+            habit_description="long run",
+            category=CategoryHabit.SPORTS,
+        ),
+    )
+    service.create_habit(
+        TypeHabit.DAILY,
+        DailyHabitSchema(
+            habit_name="Save", habit_description="1 euro", category="finance"
+        ),
+    )
+    service.complete_many([habit.habit_id for habit in service.store][:2])
+    return storage
+
+
+def test_export_round_trips_records(storage, tmp_path):
+    target = str(tmp_path / "habits.col")
+    assert storage.export_columnar(target) == 3
+
+    expected = HabitJsonStorage(storage.filename).load()
+    assert storage.load_columnar(target) == expected
+    assert any(habit["achievement"] for habit in expected)
+    assert any(habit["history"] for habit in expected)
+
+
+def test_columns_hold_the_raw_values(storage, tmp_path):
+    target = str(tmp_path / "habits.col")
+    storage.export_columnar(target)
+    habits = storage.load()
+
+    with ColumnarSnapshot(target) as snapshot:
+        assert len(snapshot) == 3
+        with snapshot.column("habit_id") as ids:
+            assert ids.tolist() == [habit["habit_id"] for habit in habits]
+        with snapshot.column("type_code") as types:
+            assert types.tolist() == [0, 1, 0]
+        assert snapshot.strings("habit_name") == ["Lesen ✓", "Run", "Save"]
+        assert snapshot.categories == ["other", "sports", "finance"]
+
+
+def test_numpy_views_match_memoryviews(storage, tmp_path):
+    pytest.importorskip("numpy")
+    target = str(tmp_path / "habits.col")
+    storage.export_columnar(target)
+
+    with ColumnarSnapshot(target) as snapshot:
+        with snapshot.column("streak") as streaks:
+            expected = streaks.tolist()
+        assert snapshot.array("streak").tolist() == expected
+
+
+def test_empty_snapshot(tmp_path):
+    target = str(tmp_path / "empty.col")
+    assert write_columnar(target, []) == 0
+    with ColumnarSnapshot(target) as snapshot:
+        assert len(snapshot) == 0
+        assert snapshot.records() == []
@@ -0,0 +1,139 @@
+import json
+import multiprocessing
+from datetime import date
+
+import pytest
+
+from habit_service.service import CONFLICT_RETRIES, HabitService
+from habit_storage.errors import StorageConflictError
+from habit_storage.json_storage import HabitJsonStorage
+from models.base import habit_from_dict
+from schemas.habit_schema import CategoryHabit, TypeHabit
+from schemas.input_schema import DailyHabitSchema
+
+
+def schema(name):
+    return DailyHabitSchema(
+        habit_name=name, habit_description="test", category=CategoryHabit.OTHER
+    )
+
+
+@pytest.fixture
+def filename(tmp_path):
+    filename = str(tmp_path / "habits.json")
+    service = HabitService(HabitJsonStorage(filename))
+    service.create_habit(TypeHabit.DAILY, schema("first"))
+    service.create_habit(TypeHabit.DAILY, schema("second"))
+    return filename
+
+
+def stored(filename):
+    with open(filename, "r", encoding="utf-8") as f:
+        return {habit["habit_name"]: habit for habit in json.load(f)}
+
+
+def test_stale_commit_is_rejected_without_writing(filename):
+    storage = HabitJsonStorage(filename)
+    version = storage.version()
+    HabitService(HabitJsonStorage(filename)).create_habit(
+        TypeHabit.DAILY, schema("other")
+    )
+
+    with pytest.raises(StorageConflictError):
+        storage.commit("clear", None, list, expected=version)
+    assert sorted(stored(filename)) == ["first", "other", "second"]
+
+
+def test_conflicting_write_is_retried_on_fresh_data(filename):
+    service = HabitService(HabitJsonStorage(filename))
+    other = HabitService(HabitJsonStorage(filename))
+    second = next(h for h in other.store if h.habit_name == "second").habit_id
+    commit_many = service.storage.commit_many
+    attempts = []
+
+    def commit_after_other_process(*args):
+        # Another process writes between this service's load and its commit.
+        if not attempts:
+            other.complete_habit(second)
+        attempts.append(args[-1])
+        return commit_many(*args)
+
+    service.storage.commit_many = commit_after_other_process
+    first = next(h for h in service.store if h.habit_name == "first").habit_id
+    service.complete_habit(first)
+
+    assert len(attempts) == 2
+    habits = stored(filename)
+    assert habits["first"]["last_completed"] is not None
+    assert habits["second"]["last_completed"] is not None
+
+
+def test_conflicts_past_the_retry_limit_propagate(filename, monkeypatch):
+    service = HabitService(HabitJsonStorage(filename))
+    calls = []
+
+    def always_conflict(*args):
+        calls.append(args)
+        raise StorageConflictError("busy")
+
+    monkeypatch.setattr(service.storage, "commit_many", always_conflict)
+    with pytest.raises(StorageConflictError):
+        service.create_habit(TypeHabit.DAILY, schema("third"))
+    assert len(calls) == CONFLICT_RETRIES + 1
+
+
+def test_failed_writes_leave_no_phantom_state(filename, monkeypatch):
+    service = HabitService(HabitJsonStorage(filename))
+    first = next(h for h in service.store if h.habit_name == "first").habit_id
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(service.storage, "commit", fail)
+    monkeypatch.setattr(service.storage, "commit_many", fail)
+    for call in (
+        lambda: service.create_habit(TypeHabit.DAILY, schema("third")),
+        lambda: service.complete_habit(first),
+        lambda: service.delete_habit(first),
+    ):
+        with pytest.raises(OSError):
+            call()
+
+    assert sorted(h.habit_name for h in service.store) == ["first", "second"]
+    assert service.store.get(first).last_completed is None
+    assert service.store.get(first).streak == 0
+
+
+def test_loaded_habits_do_not_share_the_storage_cache(filename):
+    storage = HabitJsonStorage(filename)
+    habit = habit_from_dict(storage.load()[0])
+    habit.achievement.append("changed")
+    habit.history.add(date(2024, 1, 1))
+
+    cached = storage.load()[0]
+    assert storage.cache_hits == 1
+    assert cached["achievement"] == []
+    assert not cached["history"]
+
+
+def create_habits(filename, worker, count):
+    service = HabitService(HabitJsonStorage(filename))
+    for n in range(count):
+        service.create_habit(TypeHabit.DAILY, schema(f"worker {worker} habit {n}"))
+
+
+def test_processes_creating_habits_lose_no_writes(filename):
+    context = multiprocessing.get_context("fork")
+    processes = [
+        context.Process(target=create_habits, args=(filename, worker, 10))
+        for worker in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert [process.exitcode for process in processes] == [0, 0, 0, 0]
+    habits = stored(filename)
+    assert len(habits) == 42
+    assert len({habit["habit_id"] for habit in habits.values()}) == 42
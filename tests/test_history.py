@@ -0,0 +1,136 @@
+import random
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from models.history import RATE_WINDOWS, CompletionHistory, history_from_record
+
+START = date(2026, 1, 1)
+
+
+def day(n):
+    return START + timedelta(days=n)
+
+
+def runs(history):
+    return [(date.fromordinal(start), length) for start, length in history.runs()]
+
+
+def test_consecutive_days_extend_one_run():
+    history = CompletionHistory()
+    for n in range(5):
+        assert history.add(day(n))
+    assert runs(history) == [(day(0), 5)]
+    assert len(history) == 5
+    assert history.last() == day(4)
+
+
+def test_repeated_day_is_ignored():
+    history = CompletionHistory()
+    history.add(day(0))
+    history.add(day(1))
+    assert not history.add(day(0))
+    assert not history.add(day(1))
+    assert runs(history) == [(day(0), 2)]
+
+
+def test_backfilled_day_merges_with_both_neighbours():
+    history = CompletionHistory()
+    for n in (0, 1, 3, 4, 7):
+        history.add(day(n))
+    assert runs(history) == [(day(0), 2), (day(3), 2), (day(7), 1)]
+
+    history.add(day(2))
+    assert runs(history) == [(day(0), 5), (day(7), 1)]
+
+
+def test_backfilled_day_merges_with_one_neighbour_or_none():
+    history = CompletionHistory()
+    for n in (5, 10):
+        history.add(day(n))
+    history.add(day(4))
+    history.add(day(6))
+    history.add(day(0))
+    assert runs(history) == [(day(0), 1), (day(4), 3), (day(10), 1)]
+
+
+def test_random_order_matches_the_set_of_days():
+    rng = random.Random(7)
+    days = rng.sample(range(200), 120)
+    history = CompletionHistory()
+    for n in days:
+        history.add(day(n))
+
+    assert len(history) == len(days)
+    assert all(day(n) in history for n in days)
+    assert not any(day(n) in history for n in set(range(200)) - set(days))
+    starts = [start for start, _ in runs(history)]
+    assert starts == sorted(starts)
+    for (start, length), (next_start, _) in zip(runs(history), runs(history)[1:]):
+        assert start + timedelta(days=length) < next_start
+
+
+def test_streaks():
+    history = CompletionHistory()
+    for n in (0, 1, 2, 5, 6):
+        history.add(day(n))
+    assert history.longest_streak() == 3
+    assert history.current_streak(day(7)) == 2
+    assert history.current_streak(day(8)) == 0
+
+
+def test_streaks_bridge_gaps_up_to_the_limit():
+    history = CompletionHistory()
+    for n in (0, 1, 7, 20):
+        history.add(day(n))
+    assert history.streaks(day(21)) == (1, 2)
+    assert history.streaks(day(27), gap=7) == (1, 3)
+    assert history.streaks(day(28), gap=7) == (0, 3)
+    assert history.days_between(day(1), day(7)) == 2
+
+
+def test_single_habit_stats_match_the_population_engine():
+    analytics = pytest.importorskip("habit_service.analytics")
+    rng = random.Random(7)
+    today = day(120)
+    habits = []
+    for habit_id in range(1, 41):
+        history = CompletionHistory()
+        for n in rng.sample(range(121), rng.randrange(60)):
+            history.add(day(n))
+        habits.append(
+            SimpleNamespace(
+                habit_id=habit_id,
+                type_habit=rng.choice(["daily", "weekly"]),
+                category="other",
+                history=history,
+            )
+        )
+
+    population = analytics.HabitAnalytics(habits, today=today)
+    for habit in habits:
+        weekly = habit.type_habit == "weekly"
+        stats = population.habit_stats(habit.habit_id)
+        assert habit.history.streaks(today, gap=7 if weekly else 1) == (
+            stats["current_streak"],
+            stats["longest_streak"],
+        )
+        for window in RATE_WINDOWS:
+            done = habit.history.days_between(today - timedelta(days=window - 1), today)
+            rate = min(done / (window / 7 if weekly else window), 1.0)
+            assert rate == pytest.approx(stats["completion_rate"][window])
+
+
+def test_list_and_bytes_round_trip():
+    history = CompletionHistory()
+    for n in (0, 1, 5):
+        history.add(day(n))
+    assert CompletionHistory.from_list(history.to_list()) == history
+    assert CompletionHistory.from_bytes(history.to_bytes()) == history
+
+
+def test_records_without_history_are_seeded_from_last_completed():
+    history = history_from_record({"last_completed": day(3).isoformat()})
+    assert runs(history) == [(day(3), 1)]
+    assert not history_from_record({"last_completed": None})
@@ -0,0 +1,50 @@
+import pytest
+
+from habit_service.service import HabitService
+from habit_storage.json_storage import HabitJsonStorage
+
+CSV = (
+    "habit_name,habit_description,category,type_habit\n"
+    "Read,20 pages,self development,daily\n"
+    "Run,5 km,sports,weekly\n"
+    ",no name,other,daily\n"
+)
+
+
+@pytest.fixture
+def service(tmp_path):
+    return HabitService(HabitJsonStorage(str(tmp_path / "habits.json")))
+
+
+def names(service):
+    return sorted(habit.habit_name for habit in service.store)
+
+
+def test_import_creates_valid_rows_and_reports_rejects(service, tmp_path):
+    source = tmp_path / "habits.csv"
+    source.write_text(CSV, encoding="utf-8")
+
+    message = service.import_habits(str(source), batch_size=2)
+    assert message.startswith("Imported 2 habits, rejected 1 rows.")
+    assert names(service) == ["Read", "Run"]
+    assert (tmp_path / "habits.csv.rejects.jsonl").read_text().count("\n") == 1
+    assert names(HabitService(service.storage)) == ["Read", "Run"]
+
+
+def test_missing_file_leaves_store_unchanged(service, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        service.import_habits(str(tmp_path / "missing.csv"))
+    assert names(service) == []
+
+
+def test_failed_write_leaves_no_phantom_habits(service, tmp_path, monkeypatch):
+    source = tmp_path / "habits.csv"
+    source.write_text(CSV, encoding="utf-8")
+
+    def disk_full(*args):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(service.storage, "commit_many", disk_full)
+    with pytest.raises(OSError):
+        service.import_habits(str(source))
+    assert names(service) == []
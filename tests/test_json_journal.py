@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from habit_storage.errors import StorageError
+from habit_storage.json_storage import HabitJsonStorage
+
+
+def record(habit_id, name="habit", **fields):
+    return {"habit_id": habit_id, "habit_name": name, "history": [], **fields}
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return HabitJsonStorage(str(tmp_path / "habits.json"), journal=True)
+
+
+def ids(storage):
+    return sorted(habit["habit_id"] for habit in storage.load())
+
+
+def test_replay_applies_logged_mutations_in_order(storage, tmp_path):
+    storage.save([record(1), record(2)])
+    storage.commit("create", record(3), list)
+    storage.commit("update", record(1, "renamed"), list)
+    storage.commit("delete", record(2), list)
+
+    reopened = HabitJsonStorage(storage.filename, journal=True)
+    habits = {habit["habit_id"]: habit for habit in reopened.load()}
+    assert sorted(habits) == [1, 3]
+    assert habits[1]["habit_name"] == "renamed"
+    assert len(storage.journal_file.read_text().splitlines()) == 3
+
+
+def test_clear_record_drops_earlier_habits(storage):
+    storage.save([record(1)])
+    storage.commit("clear", None, list)
+    storage.commit("create", record(2), list)
+    assert ids(HabitJsonStorage(storage.filename, journal=True)) == [2]
+
+
+def test_log_is_compacted_at_threshold(tmp_path):
+    storage = HabitJsonStorage(
+        str(tmp_path / "habits.json"), journal=True, compact_threshold=3
+    )
+    habits = []
+    for habit_id in range(1, 4):
+        habits.append(record(habit_id))
+        storage.commit("create", habits[-1], lambda: list(habits))
+    assert storage.journal_file.read_text() == ""
+    assert [habit["habit_id"] for habit in json.loads(storage.file.read_text())] == [
+        1,
+        2,
+        3,
+    ]
+
+
+def test_torn_last_line_is_ignored(storage):
+    storage.save([])
+    storage.commit("create", record(1), list)
+    with open(storage.journal_file, "a", encoding="utf-8") as f:
+        f.write('{"op":"complete","habit":{"habit_id"')
+    assert ids(HabitJsonStorage(storage.filename, journal=True)) == [1]
+
+
+def test_append_after_torn_tail_keeps_acknowledged_records(storage):
+    storage.save([])
+    storage.commit("create", record(1), list)
+    with open(storage.journal_file, "a", encoding="utf-8") as f:
+        f.write('{"op":"complete","habit":{"habit_id"')
+    storage.commit("create", record(2), list)
+
+    assert ids(HabitJsonStorage(storage.filename, journal=True)) == [1, 2]
+    assert storage.journal_file.read_text().endswith("\n")
+
+
+def test_corrupt_line_before_the_end_raises(storage):
+    storage.save([])
+    storage.commit("create", record(1), list)
+    with open(storage.journal_file, "a", encoding="utf-8") as f:
+        f.write("not json\n")
+    storage.commit("create", record(2), list)
+
+    with pytest.raises(StorageError, match="line 2"):
+        HabitJsonStorage(storage.filename, journal=True).load()
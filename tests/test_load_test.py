@@ -0,0 +1,43 @@
+import socket
+import threading
+
+import pytest
+
+from habit_api.load_test import run_load
+
+
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_unreachable_server_raises_instead_of_hanging():
+    with pytest.raises(ConnectionError):
+        run_load("127.0.0.1", closed_port(), "list", requests=10, connections=4)
+
+
+def test_failed_requests_are_counted_as_errors():
+    listener = socket.create_server(("127.0.0.1", 0))
+    stop = threading.Event()
+
+    def hang_up():
+        # Accept every connection and close it before answering.
+        while not stop.is_set():
+            try:
+                connection, _ = listener.accept()
+            except OSError:
+                return
+            connection.close()
+
+    thread = threading.Thread(target=hang_up, daemon=True)
+    thread.start()
+    try:
+        result = run_load(
+            "127.0.0.1", listener.getsockname()[1], "list", requests=12, connections=3
+        )
+    finally:
+        stop.set()
+        listener.close()
+    assert result["errors"] == 12
+    assert result["requests"] == 0
@@ -0,0 +1,148 @@
+from datetime import date
+
+from habit_service.profiling import ActionProfiler
+from habit_service.service import HabitService
+from habit_storage.json_storage import HabitJsonStorage
+from habit_storage.sqlite_storage import HabitSqliteStorage
+from habit_storage.write_behind import WriteBehindStorage
+from menu import HabitTrackerCLI, main
+from models.base import WeeklyHabit
+from schemas.habit_schema import CategoryHabit
+
+
+def habits(filename):
+    return {habit["habit_id"]: habit for habit in HabitJsonStorage(filename).load()}
+
+
+def test_batch_reports_failing_lines_and_continues(tmp_path, capsys):
+    filename = str(tmp_path / "habits.json")
+    batch = tmp_path / "batch.txt"
+    batch.write_text(
+        'create "Read" "20 pages"\n'
+        f"import {tmp_path / 'missing.csv'}\n"
+        "complete 99\n"
+        'create "Walk" "5 km"\n',
+        encoding="utf-8",
+    )
+
+    assert main(["--storage", filename, "--batch", str(batch)]) == 1
+    assert "line 2:" in capsys.readouterr().err
+    assert sorted(h["habit_name"] for h in habits(filename).values()) == [
+        "Read",
+        "Walk",
+    ]
+
+
+def test_batch_keeps_completions_made_by_another_process(tmp_path):
+    filename = str(tmp_path / "habits.json")
+    main(["--storage", filename, "create", "Read", "20 pages"])
+    main(["--storage", filename, "create", "Walk", "5 km"])
+    ids = {h["habit_name"]: habit_id for habit_id, h in habits(filename).items()}
+
+    def lines():
+        yield f"complete {ids['Read']}"
+        HabitService(HabitJsonStorage(filename)).complete_habit(ids["Walk"])
+        yield 'create "Swim" "1 km"'
+
+    storage = WriteBehindStorage(HabitJsonStorage(filename))
+    cli = HabitTrackerCLI(storage)
+    assert cli.run_batch(lines()) == 0
+    storage.close()
+
+    stored = {h["habit_name"]: h for h in habits(filename).values()}
+    assert sorted(stored) == ["Read", "Swim", "Walk"]
+    assert stored["Read"]["last_completed"] is not None
+    assert stored["Walk"]["last_completed"] is not None
+
+
+def test_menu_survives_import_of_missing_file(tmp_path, monkeypatch, capsys):
+    answers = iter(["6", str(tmp_path / "missing.csv"), "8"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+
+    HabitTrackerCLI(HabitJsonStorage(str(tmp_path / "habits.json"))).main_menu()
+    captured = capsys.readouterr()
+    assert "missing.csv" in captured.err
+    assert "Thank you for using this program!" in captured.out
+
+
+def test_paging_walks_one_iterator(tmp_path, monkeypatch, capsys):
+    filename = str(tmp_path / "habits.json")
+    batch = tmp_path / "batch.txt"
+    batch.write_text(
+        "".join(f'create "habit {n}" "test"\n' for n in range(45)), encoding="utf-8"
+    )
+    main(["--storage", filename, "--batch", str(batch)])
+    cli = HabitTrackerCLI(HabitJsonStorage(filename))
+    calls = []
+    iter_habits = cli.habit_service.iter_habits
+
+    def counted_iter_habits(*args, **kwargs):
+        calls.append(args)
+        return iter_habits(*args, **kwargs)
+
+    monkeypatch.setattr(cli.habit_service, "iter_habits", counted_iter_habits)
+    monkeypatch.setattr("builtins.input", lambda prompt="": "")
+    capsys.readouterr()
+
+    cli._page_habits()
+    out = capsys.readouterr().out
+    assert len(calls) == 1
+    assert out.count("ID: ") == 45
+    assert out.count("Category: Other") == 3
+    assert out.endswith("No more habits.\n")
+
+
+def test_profiler_records_one_action_per_command(tmp_path, capsys):
+    filename = str(tmp_path / "habits.json")
+    batch = tmp_path / "batch.txt"
+    batch.write_text('create "Read" "20 pages"\nshow\n', encoding="utf-8")
+    profiles = tmp_path / "profiles"
+
+    main(["--storage", filename, "--profile", str(profiles), "--batch", str(batch)])
+    assert sorted(path.name for path in profiles.glob("*.prof")) == [
+        "0001-command.create.prof",
+        "0002-command.show.prof",
+    ]
+
+
+def test_profiler_records_one_action_per_screen(tmp_path, monkeypatch, capsys):
+    answers = iter(["4", "4", "8"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    profiler = ActionProfiler(str(tmp_path / "profiles"), echo=False)
+
+    storage = HabitJsonStorage(str(tmp_path / "habits.json"))
+    HabitTrackerCLI(storage, profiler=profiler).main_menu()
+    assert sorted(path.stem for path in profiler.directory.glob("*.prof")) == [
+        "0001-screen.main",
+        "0002-screen.view",
+        "0003-screen.main",
+    ]
+
+
+def test_rollover_command_reports_reset_streaks(tmp_path, capsys):
+    filename = str(tmp_path / "habits.json")
+    assert main(["--storage", filename, "rollover"]) == 0
+    assert capsys.readouterr().out.startswith("Rollover complete: 0 weekly and 0 daily")
+
+
+def test_migrate_copies_json_habits_into_sqlite(tmp_path, capsys):
+    source = str(tmp_path / "habits.json")
+    main(["--storage", source, "create", "Read", "20 pages"])
+    target = str(tmp_path / "habits.db")
+
+    assert main(["--storage", target, "migrate", source]) == 0
+    assert f"Imported 1 habits into {target}" in capsys.readouterr().out
+    assert [h["habit_name"] for h in HabitSqliteStorage(target).load()] == ["Read"]
+
+
+def test_due_lists_overdue_weekly_habits_first(tmp_path):
+    storage = HabitJsonStorage(str(tmp_path / "habits.json"))
+    records = []
+    for habit_id, deadline in ((1, "2026-03-01"), (2, "2026-03-12"), (3, "2026-03-20")):
+        habit = WeeklyHabit(habit_id, f"habit {habit_id}", "test", CategoryHabit.OTHER)
+        habit.deadline = deadline
+        records.append(habit.to_dict())
+    storage.save(records)
+
+    weekly, _ = HabitService(storage).due_habits(3, today=date(2026, 3, 10))
+    assert [habit.habit_id for habit in weekly] == [1, 2]
@@ -0,0 +1,82 @@
+import multiprocessing
+
+from habit_storage.sequence import IdSequence
+
+
+def test_ids_come_from_blocks_reserved_once(tmp_path):
+    sequence = IdSequence(str(tmp_path / "seq"), block_size=4)
+    ids = [habit_id for _ in range(6) for habit_id in sequence.allocate()]
+    assert ids == [1, 2, 3, 4, 5, 6]
+    assert sequence.reservations == 2
+
+
+def test_large_requests_get_one_contiguous_range(tmp_path):
+    sequence = IdSequence(str(tmp_path / "seq"), block_size=4)
+    assert list(sequence.allocate(2)) == [1, 2]
+    assert list(sequence.allocate(10)) == list(range(5, 15))
+
+
+def test_sequences_sharing_a_file_never_overlap(tmp_path):
+    filename = str(tmp_path / "seq")
+    first = IdSequence(filename, block_size=4)
+    second = IdSequence(filename, block_size=4)
+    ids = [*first.allocate(3), *second.allocate(3), *first.allocate(3)]
+    assert len(set(ids)) == len(ids)
+
+
+def test_release_returns_the_unused_tail(tmp_path):
+    filename = str(tmp_path / "seq")
+    sequence = IdSequence(filename, block_size=64)
+    assert list(sequence.allocate(2)) == [1, 2]
+    sequence.release()
+    assert list(IdSequence(filename).allocate()) == [3]
+
+
+def test_release_keeps_the_tail_once_another_process_reserved(tmp_path):
+    filename = str(tmp_path / "seq")
+    sequence = IdSequence(filename, block_size=8)
+    sequence.allocate()
+    other = IdSequence(filename, block_size=8)
+    assert list(other.allocate()) == [9]
+    sequence.release()
+    assert list(IdSequence(filename).allocate()) == [17]
+
+
+def test_floor_skips_ids_already_in_use(tmp_path):
+    sequence = IdSequence(str(tmp_path / "seq"), block_size=4)
+    assert list(sequence.allocate(2, floor=40)) == [41, 42]
+
+
+def test_step_and_offset_partition_the_id_space(tmp_path):
+    sequences = [
+        IdSequence(str(tmp_path / f"seq{index}"), block_size=4, step=3, offset=index)
+        for index in range(3)
+    ]
+    assert [list(sequence.allocate(3)) for sequence in sequences] == [
+        [1, 4, 7],
+        [2, 5, 8],
+        [3, 6, 9],
+    ]
+    # The block has one slot left, so two IDs need a new block above the floor.
+    assert list(sequences[1].allocate(2, floor=20)) == [23, 26]
+
+
+def allocate_in_child(filename, queue):
+    queue.put(list(IdSequence(filename, block_size=4).allocate(10)))
+
+
+def test_processes_get_disjoint_ids(tmp_path):
+    filename = str(tmp_path / "seq")
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    processes = [
+        context.Process(target=allocate_in_child, args=(filename, queue))
+        for _ in range(4)
+    ]
+    for process in processes:
+        process.start()
+    ids = [habit_id for _ in processes for habit_id in queue.get(timeout=30)]
+    for process in processes:
+        process.join()
+    assert len(ids) == 40
+    assert len(set(ids)) == 40
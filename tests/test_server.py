@@ -0,0 +1,107 @@
+import http.client
+import json
+import threading
+from datetime import date
+
+import pytest
+
+from habit_api.server import HabitApiServer, habit_record
+from habit_service.service import HabitService
+from habit_storage.json_storage import HabitJsonStorage
+from schemas.input_schema import DailyHabitSchema
+
+
+@pytest.fixture
+def server(tmp_path):
+    service = HabitService(HabitJsonStorage(str(tmp_path / "habits.json")))
+    server = HabitApiServer(("127.0.0.1", 0), service, workers=2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(server):
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=10)
+    yield connection
+    connection.close()
+
+
+def request(connection, method, path, body=None):
+    data = None if body is None else json.dumps(body)
+    connection.request(method, path, body=data)
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_history_is_listed_as_iso_date_runs(client):
+    status, payload = request(
+        client,
+        "POST",
+        "/habits",
+        {"habit_name": "Read", "habit_description": "20 pages", "category": "other"},
+    )
+    assert status == 201
+    habit_id = payload["habit"]["habit_id"]
+    assert payload["habit"]["history"] == []
+
+    status, payload = request(client, "POST", f"/habits/{habit_id}/complete")
+    assert status == 200
+    today = date.today().isoformat()
+    assert payload["habit"]["history"] == [[today, today]]
+
+    status, payload = request(client, "GET", "/habits")
+    assert "history" not in payload["habits"][0]
+    status, payload = request(client, "GET", "/habits?history=1")
+    assert payload["habits"][0]["history"] == [[today, today]]
+
+
+def test_history_runs_cover_consecutive_days(server):
+    habit = server.service.add_habits(
+        [
+            DailyHabitSchema(
+                habit_name="Read", habit_description="20 pages", category="other"
+            )
+        ]
+    )[0]
+    for day in (1, 2, 3, 5):
+        habit.history.add(date(2026, 3, day))
+    assert habit_record(habit)["history"] == [
+        ["2026-03-01", "2026-03-03"],
+        ["2026-03-05", "2026-03-05"],
+    ]
+    assert "history" not in habit_record(habit, history=False)
+
+
+def test_unexpected_error_answers_500_and_keeps_serving(server, client, monkeypatch):
+    def broken(habit_id):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(server.service, "get_habit", broken)
+    monkeypatch.setattr(server.RequestHandlerClass, "log_error", lambda *args: None)
+    status, payload = request(client, "GET", "/habits/1")
+    assert status == 500
+    assert payload == {"error": "Internal server error"}
+
+    status, payload = request(client, "GET", "/habits")
+    assert status == 200
+    assert payload["count"] == 0
+
+
+@pytest.mark.parametrize("length", ["abc", "-1"])
+def test_invalid_content_length_is_rejected(server, length):
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=10)
+    connection.putrequest("POST", "/habits")
+    connection.putheader("Content-Length", length)
+    connection.endheaders()
+    response = connection.getresponse()
+    assert response.status == 400
+    assert json.loads(response.read()) == {"error": "Invalid Content-Length"}
+    connection.close()
+
+
+def test_boolean_habit_ids_are_rejected(client):
+    status, _ = request(client, "POST", "/habits/complete", {"habit_ids": [True]})
+    assert status == 400
@@ -0,0 +1,33 @@
+from habit_storage.sharded import ShardedStorage
+
+
+def test_distinct_users_never_share_a_file(tmp_path):
+    storage = ShardedStorage(str(tmp_path), shard_count=4)
+    users = ["a/b", "a_b", "a b", "a%2Fb", "ü", "../x"]
+    paths = {storage.path(user) for user in users}
+    assert len(paths) == len(users)
+    for path in paths:
+        assert path.parent.parent == tmp_path
+
+
+def test_safe_user_ids_keep_their_plain_file_name(tmp_path):
+    storage = ShardedStorage(str(tmp_path), shard_count=4)
+    assert storage.path("alice-01_x.y").name == "alice-01_x.y.json"
+
+
+def test_users_are_listed_with_their_original_ids(tmp_path):
+    storage = ShardedStorage(str(tmp_path), shard_count=4)
+    users = ["a/b", "a_b", "bob", "ü"]
+    for user in users:
+        storage.storage(user).save([])
+    assert sorted(storage.users()) == sorted(users)
+
+
+def test_shard_sequences_hand_out_unique_ids(tmp_path):
+    storage = ShardedStorage(str(tmp_path), shard_count=4)
+    ids = [
+        habit_id
+        for user in ["a", "b", "c", "d", "e"]
+        for habit_id in storage.sequence(user).allocate(10)
+    ]
+    assert len(set(ids)) == len(ids)
@@ -0,0 +1,87 @@
+from datetime import date
+
+import pytest
+
+from habit_service.service import HabitService
+from habit_storage.errors import StorageConflictError
+from habit_storage.sqlite_storage import HabitSqliteStorage
+from models.history import CompletionHistory
+
+
+def record(habit_id, name="habit", **fields):
+    return {
+        "habit_id": habit_id,
+        "created_at": "2026-01-01",
+        "habit_name": name,
+        "habit_description": "test",
+        "category": "other",
+        "type_habit": "daily",
+        "completed": False,
+        "streak": 0,
+        "current_goal_days": 1,
+        "last_completed": None,
+        "achievement": [],
+        "history": CompletionHistory(),
+        **fields,
+    }
+
+
+@pytest.fixture
+def filename(tmp_path):
+    return str(tmp_path / "habits.db")
+
+
+def test_every_write_bumps_the_shared_version(filename):
+    storage = HabitSqliteStorage(filename)
+    assert storage.version() == 0
+    assert storage.save([record(1)]) == 1
+    assert storage.commit("create", record(2), list, expected=1) == 2
+    assert HabitSqliteStorage(filename).version() == 2
+
+
+def test_stale_version_is_rejected_without_writing(filename):
+    storage = HabitSqliteStorage(filename)
+    storage.save([record(1)])
+    other = HabitSqliteStorage(filename)
+    other.commit("update", record(1, "other"), list, expected=other.version())
+
+    with pytest.raises(StorageConflictError):
+        storage.commit("update", record(1, "stale"), list, expected=1)
+    assert [habit["habit_name"] for habit in storage.load()] == ["other"]
+    assert storage.version() == 2
+
+
+def test_records_round_trip(filename):
+    storage = HabitSqliteStorage(filename)
+    habit = record(
+        7,
+        last_completed="2026-03-02",
+        achievement=["first", "second"],
+        history=CompletionHistory.from_list([date(2026, 3, 1).toordinal(), 2]),
+    )
+    storage.save([habit])
+
+    loaded = HabitSqliteStorage(filename).get(7)
+    assert loaded["achievement"] == ["first", "second"]
+    assert date(2026, 3, 2) in loaded["history"]
+    assert loaded["history"] == habit["history"]
+
+
+def test_services_on_one_database_keep_each_others_writes(filename):
+    HabitSqliteStorage(filename).save([record(1), record(2)])
+    first = HabitService(HabitSqliteStorage(filename))
+    second = HabitService(HabitSqliteStorage(filename))
+
+    first.complete_habit(1)
+    second.complete_habit(2)
+
+    habits = {habit["habit_id"]: habit for habit in HabitSqliteStorage(filename).load()}
+    assert habits[1]["last_completed"] is not None
+    assert habits[2]["last_completed"] is not None
+
+
+def test_migrating_a_missing_json_file_raises(filename, tmp_path):
+    source = tmp_path / "missing.json"
+    with pytest.raises(FileNotFoundError):
+        HabitSqliteStorage(filename).migrate_json(str(source))
+    assert not source.exists()
@@ -0,0 +1,82 @@
+import pytest
+
+from habit_storage.errors import StorageConflictError
+from habit_storage.json_storage import HabitJsonStorage
+from habit_storage.write_behind import WriteBehindStorage
+
+
+def record(habit_id, name="habit", **fields):
+    return {"habit_id": habit_id, "habit_name": name, "history": [], **fields}
+
+
+@pytest.fixture(params=[False, True], ids=["snapshot", "journal"])
+def storage(request, tmp_path):
+    storage = HabitJsonStorage(str(tmp_path / "habits.json"), journal=request.param)
+    storage.save([record(1), record(2)])
+    return storage
+
+
+@pytest.fixture
+def cache(storage):
+    # A long interval and threshold keep the flusher thread out of the test.
+    cache = WriteBehindStorage(storage, interval=3600, max_dirty=10**6)
+    yield cache
+    cache.close()
+
+
+def names(storage):
+    reopened = HabitJsonStorage(storage.filename, journal=storage.journal)
+    return {habit["habit_id"]: habit["habit_name"] for habit in reopened.load()}
+
+
+def test_mutations_are_coalesced_into_one_flush(storage, cache):
+    for n in range(50):
+        cache.commit("update", record(1, f"name {n}"), list)
+    cache.commit("create", record(3), list)
+    assert names(storage) == {1: "habit", 2: "habit"}
+
+    cache.flush()
+    assert names(storage) == {1: "name 49", 2: "habit", 3: "habit"}
+    metrics = cache.metrics()
+    assert metrics["flushes"] == 1
+    assert metrics["pending"] == 0
+    assert metrics["coalescing_ratio"] == 51
+
+
+def test_flush_keeps_writes_made_by_another_process(storage, cache):
+    cache.commit("update", record(1, "cached"), list)
+    other = HabitJsonStorage(storage.filename, journal=storage.journal)
+    habits = [record(1), record(2, "other"), record(4, "other")]
+    other.commit("update", habits[1], lambda: habits, other.version())
+    other.commit("create", habits[2], lambda: habits, other.version())
+
+    cache.flush()
+    assert names(storage) == {1: "cached", 2: "other", 4: "other"}
+    assert {habit["habit_id"] for habit in cache.load()} == {1, 2, 4}
+
+
+def test_delete_and_clear_are_flushed(storage, cache):
+    cache.commit("delete", record(1), list)
+    cache.flush()
+    assert names(storage) == {2: "habit"}
+
+    cache.clear()
+    cache.commit("create", record(5), list)
+    cache.flush()
+    assert names(storage) == {5: "habit"}
+
+
+def test_failed_flush_keeps_changes_pending(storage, cache, monkeypatch):
+    cache.commit("update", record(1, "cached"), list)
+
+    def conflict(*args):
+        raise StorageConflictError("busy")
+
+    monkeypatch.setattr(storage, "commit_many", conflict)
+    with pytest.raises(StorageConflictError):
+        cache.flush()
+    assert cache.metrics()["pending"] == 1
+
+    monkeypatch.undo()
+    cache.flush()
+    assert names(storage)[1] == "cached"